@@ -0,0 +1,15 @@
+"""
+Benchmarks for the analysis pipeline.
+
+Each module can be run directly, e.g. `python -m benchmarks.batching`, and
+prints its results as JSON.
+"""
+
+import os
+
+
+def setup():
+    """Configure Django so benchmark modules can import the apps."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "fora.settings")
+    import django
+    django.setup()
@@ -0,0 +1,319 @@
+"""
+Local stand-in for the OpenAI and Anthropic batch APIs, answered by results.stub.
+
+Serves the endpoints results.batches uses:
+
+    POST /v1/files                      upload a batch input file (multipart)
+    GET  /v1/files/<id>/content         download an output or error file
+    POST /v1/batches                    OpenAI Batch API
+    GET  /v1/batches/<id>
+    POST /v1/messages/batches           Anthropic Message Batches
+    GET  /v1/messages/batches/<id>
+    GET  /v1/messages/batches/<id>/results
+    POST /v1/chat/completions           interactive calls, for requests re-run at merge
+
+A batch stays in progress for --complete-after seconds, then all of its
+requests are answered at once by results.stub, without its simulated latency.
+The stub shapes its answer by task, which is read from the custom_id
+(results.batches uses "topic<id>-<task>-<n>"). --failure-rate makes that
+share of requests come back as errors, to exercise the interactive re-run
+when results are merged. All state is in memory.
+
+    python -m benchmarks.batch_server --port 8930 --complete-after 30
+
+then point a provider at it, e.g. LLM_BATCH_MODE=1 with
+LLM_PROVIDERS='{"openai": {"base_url": "http://127.0.0.1:8930/v1"}}' (or
+"base_url": "http://127.0.0.1:8930" for "anthropic"), and run
+`manage.py poll_llm_batches`.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from email import policy
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from results import stub
+
+_TASK = re.compile(r"-(" + "|".join(stub._BUILDERS) + r")(?:-|$)")
+
+# Interactive calls carry no custom_id; recognise the batched tasks by their system prompt.
+_PROMPT_TASKS = {
+    "performing thematic coding": "classify",
+    "expert at sentiment analysis": "sentiment",
+}
+
+
+def _prompt_task(system_prompt):
+    return next((task for marker, task in _PROMPT_TASKS.items() if marker in system_prompt), None)
+
+
+class BatchStore:
+    """Uploaded files and batches, answered once they are old enough."""
+
+    def __init__(self, complete_after, failure_rate, seed=0):
+        self.complete_after = complete_after
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.files = {}
+        self.batches = {}
+
+    def add_file(self, content, filename, purpose):
+        file_id = f"file-{uuid.uuid4().hex[:24]}"
+        self.files[file_id] = {
+            "id": file_id, "object": "file", "bytes": len(content), "created_at": int(time.time()),
+            "filename": filename, "purpose": purpose, "status": "processed", "content": content,
+        }
+        return self.files[file_id]
+
+    def add_batch(self, kind, requests, extra):
+        batch_id = f"{'msgbatch' if kind == 'anthropic' else 'batch'}_{uuid.uuid4().hex[:24]}"
+        with self.lock:
+            self.batches[batch_id] = {
+                "id": batch_id, "kind": kind, "requests": requests, "created": time.time(),
+                "results": None, **extra,
+            }
+        return self.batches[batch_id]
+
+    def finish_if_due(self, batch):
+        """Answer the batch's requests if it has been in progress long enough. Returns whether it is done."""
+        with self.lock:
+            if batch["results"] is None and time.time() - batch["created"] >= self.complete_after:
+                batch["results"] = [self._answer(r) for r in batch["requests"]]
+                batch["ended"] = time.time()
+            return batch["results"] is not None
+
+    def _answer(self, request):
+        """(custom_id, text, usage) or (custom_id, None, error message) for one {custom_id, system, messages, model}."""
+        if self.rng.random() < self.failure_rate:
+            return request["custom_id"], None, "simulated batch request failure"
+        match = _TASK.search(request["custom_id"])
+        history = request["messages"][:-1]
+        text, usage = stub.respond(
+            request["system"], request["messages"][-1]["content"], json_mode=True,
+            history=history, task=match.group(1) if match else None, model=request["model"],
+        )
+        return request["custom_id"], text, usage
+
+
+def _openai_batch(store, batch):
+    done = store.finish_if_due(batch)
+    body = {
+        "id": batch["id"], "object": "batch", "endpoint": batch["endpoint"], "errors": None,
+        "input_file_id": batch["input_file_id"], "completion_window": batch["completion_window"],
+        "status": "completed" if done else "in_progress",
+        "output_file_id": batch.get("output_file_id"), "error_file_id": batch.get("error_file_id"),
+        "created_at": int(batch["created"]), "completed_at": int(batch["ended"]) if done else None,
+        "request_counts": {"total": len(batch["requests"]), "completed": 0, "failed": 0},
+        "metadata": None,
+    }
+    if done and not batch.get("output_file_id"):
+        output, errors = [], []
+        for custom_id, text, usage in batch["results"]:
+            line = {"id": f"batch_req_{uuid.uuid4().hex[:24]}", "custom_id": custom_id, "error": None}
+            if text is None:
+                line["response"] = {"status_code": 500, "body": {"error": {"message": usage, "type": "server_error"}}}
+                errors.append(line)
+                continue
+            line["response"] = {"status_code": 200, "body": {
+                "id": f"chatcmpl-{uuid.uuid4().hex[:24]}", "object": "chat.completion", "model": batch["model"],
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": {
+                    "prompt_tokens": usage["input_tokens"], "completion_tokens": usage["output_tokens"],
+                    "total_tokens": usage["input_tokens"] + usage["output_tokens"],
+                },
+            }}
+            output.append(line)
+        for key, lines in (("output_file_id", output), ("error_file_id", errors)):
+            if lines:
+                content = "\n".join(json.dumps(line) for line in lines).encode()
+                batch[key] = store.add_file(content, f"{batch['id']}_{key}.jsonl", "batch_output")["id"]
+        body.update(output_file_id=batch.get("output_file_id"), error_file_id=batch.get("error_file_id"))
+    if done:
+        failed = sum(1 for _, text, _ in batch["results"] if text is None)
+        body["request_counts"].update(completed=len(batch["results"]) - failed, failed=failed)
+    return body
+
+
+def _anthropic_batch(store, batch, base_url):
+    done = store.finish_if_due(batch)
+    counts = {"processing": 0 if done else len(batch["requests"]), "succeeded": 0, "errored": 0, "canceled": 0, "expired": 0}
+    if done:
+        counts["errored"] = sum(1 for _, text, _ in batch["results"] if text is None)
+        counts["succeeded"] = len(batch["results"]) - counts["errored"]
+    created = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(batch["created"]))
+    return {
+        "id": batch["id"], "type": "message_batch", "processing_status": "ended" if done else "in_progress",
+        "request_counts": counts, "created_at": created, "expires_at": created,
+        "ended_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(batch["ended"])) if done else None,
+        "archived_at": None, "cancel_initiated_at": None,
+        "results_url": f"{base_url}/v1/messages/batches/{batch['id']}/results" if done else None,
+    }
+
+
+def _anthropic_results(batch):
+    lines = []
+    tools = {r["custom_id"]: r.get("tool") for r in batch["requests"]}
+    for custom_id, text, usage in batch["results"]:
+        if text is None:
+            result = {"type": "errored", "error": {"type": "error", "error": {"type": "api_error", "message": usage}}}
+        else:
+            result = {"type": "succeeded", "message": {
+                "id": f"msg_{uuid.uuid4().hex[:24]}", "type": "message", "role": "assistant", "model": batch["model"],
+                "content": [
+                    {"type": "tool_use", "id": f"toolu_{uuid.uuid4().hex[:24]}", "name": tools[custom_id], "input": json.loads(text)}
+                    if tools[custom_id] else {"type": "text", "text": text}
+                ],
+                "stop_reason": "tool_use" if tools[custom_id] else "end_turn", "stop_sequence": None,
+                "usage": {"input_tokens": usage["input_tokens"], "output_tokens": usage["output_tokens"]},
+            }}
+        lines.append(json.dumps({"custom_id": custom_id, "result": result}))
+    return "\n".join(lines).encode()
+
+
+def make_handler(store):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, body, content_type="application/json"):
+            data = body if isinstance(body, bytes) else json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _base_url(self):
+            return f"http://{self.headers.get('Host')}"
+
+        def _body(self):
+            return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        def do_POST(self):
+            path = self.path.split("?")[0].rstrip("/")
+            if path == "/v1/files":
+                content_type = self.headers.get("Content-Type", "")
+                message = BytesParser(policy=policy.HTTP).parsebytes(
+                    f"Content-Type: {content_type}\r\n\r\n".encode() + self._body()
+                )
+                fields = {}
+                for part in message.iter_parts():
+                    name = part.get_param("name", header="content-disposition")
+                    fields[name] = (part.get_filename(), part.get_payload(decode=True))
+                filename, content = fields.get("file", (None, b""))
+                purpose = (fields.get("purpose", (None, b"batch"))[1] or b"batch").decode()
+                entry = store.add_file(content, filename or "upload.jsonl", purpose)
+                return self._send(200, {k: v for k, v in entry.items() if k != "content"})
+
+            if path == "/v1/batches":
+                params = json.loads(self._body())
+                upload = store.files.get(params.get("input_file_id"))
+                if upload is None:
+                    return self._send(404, {"error": {"message": "No such file", "type": "invalid_request_error"}})
+                requests, model = [], None
+                for line in upload["content"].decode().splitlines():
+                    if not line.strip():
+                        continue
+                    item = json.loads(line)
+                    messages = item["body"]["messages"]
+                    model = item["body"]["model"]
+                    system = "\n".join(m["content"] for m in messages if m["role"] == "system")
+                    requests.append({
+                        "custom_id": item["custom_id"], "system": system, "model": model,
+                        "messages": [m for m in messages if m["role"] != "system"],
+                    })
+                batch = store.add_batch("openai", requests, {
+                    "endpoint": params["endpoint"], "input_file_id": params["input_file_id"],
+                    "completion_window": params.get("completion_window", "24h"), "model": model,
+                })
+                return self._send(200, _openai_batch(store, batch))
+
+            if path == "/v1/chat/completions":
+                params = json.loads(self._body())
+                messages = params["messages"]
+                system = "\n".join(m["content"] for m in messages if m["role"] == "system")
+                messages = [m for m in messages if m["role"] != "system"]
+                text, usage = stub.respond(
+                    system, messages[-1]["content"], json_mode="response_format" in params,
+                    history=messages[:-1], task=_prompt_task(system), model=params["model"],
+                )
+                return self._send(200, {
+                    "id": f"chatcmpl-{uuid.uuid4().hex[:24]}", "object": "chat.completion",
+                    "created": int(time.time()), "model": params["model"],
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                    "usage": {
+                        "prompt_tokens": usage["input_tokens"], "completion_tokens": usage["output_tokens"],
+                        "total_tokens": usage["input_tokens"] + usage["output_tokens"],
+                    },
+                })
+
+            if path == "/v1/messages/batches":
+                params = json.loads(self._body())
+                requests = [
+                    {
+                        "custom_id": r["custom_id"], "system": r["params"].get("system", ""),
+                        "model": r["params"]["model"], "messages": r["params"]["messages"],
+                        "tool": (r["params"].get("tool_choice") or {}).get("name"),
+                    }
+                    for r in params["requests"]
+                ]
+                model = requests[0]["model"] if requests else ""
+                batch = store.add_batch("anthropic", requests, {"model": model})
+                return self._send(200, _anthropic_batch(store, batch, self._base_url()))
+
+            self._send(404, {"error": {"message": f"Unknown endpoint {path}"}})
+
+        def do_GET(self):
+            path = self.path.split("?")[0].rstrip("/")
+            parts = path.strip("/").split("/")
+            if parts[:2] == ["v1", "files"] and len(parts) == 4 and parts[3] == "content":
+                entry = store.files.get(parts[2])
+                if entry is None:
+                    return self._send(404, {"error": {"message": "No such file"}})
+                return self._send(200, entry["content"], "application/octet-stream")
+            if parts[:2] == ["v1", "batches"] and len(parts) == 3:
+                batch = store.batches.get(parts[2])
+                if batch is None or batch["kind"] != "openai":
+                    return self._send(404, {"error": {"message": "No such batch"}})
+                return self._send(200, _openai_batch(store, batch))
+            if parts[:3] == ["v1", "messages", "batches"] and len(parts) in (4, 5):
+                batch = store.batches.get(parts[3])
+                if batch is None or batch["kind"] != "anthropic":
+                    return self._send(404, {"type": "error", "error": {"type": "not_found_error", "message": "No such batch"}})
+                if len(parts) == 5 and parts[4] == "results":
+                    if not store.finish_if_due(batch):
+                        return self._send(400, {"type": "error", "error": {"type": "invalid_request_error", "message": "Batch is still processing"}})
+                    return self._send(200, _anthropic_results(batch), "application/binary")
+                return self._send(200, _anthropic_batch(store, batch, self._base_url()))
+            self._send(404, {"error": {"message": f"Unknown endpoint {path}"}})
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8930)
+    parser.add_argument("--complete-after", type=float, default=30, help="Seconds a batch stays in progress")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of requests answered with an error")
+    args = parser.parse_args()
+
+    stub.LATENCY_SCALE = 0
+    store = BatchStore(args.complete_after, args.failure_rate)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(store))
+    print(f"Batch stand-in listening on http://{args.host}:{args.port} (batches complete after {args.complete_after}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
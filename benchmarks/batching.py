@@ -0,0 +1,86 @@
+"""
+Compare fixed and adaptive classification batching.
+
+Plans the Pass 2 batches for the seed and CSV datasets with both strategies
+and reports request counts, tokens per batch and how many batches would
+exceed the output budget (and so risk truncated JSON). No LLM calls are made.
+
+    python -m benchmarks.batching [--csv PATH]
+"""
+
+import argparse
+import csv
+import json
+import os
+import statistics
+
+from benchmarks import setup
+
+DEFAULT_CSV = "ZEA25U_RegAnders_geanonimiseerd.csv"
+THEME_COUNT = 12
+
+
+def seed_answers():
+    from interview.synthetic import RESPONSES
+    texts = [text for pair in RESPONSES for text in pair]
+    return [{"id": i, "text": text} for i, text in enumerate(texts, 1)]
+
+
+def csv_answers(path):
+    with open(path, encoding="latin-1") as f:
+        rows = [row["RegAnders"].strip() for row in csv.DictReader(f, delimiter=";") if row["RegAnders"].strip()]
+    return [{"id": i, "text": text} for i, text in enumerate(rows, 1)]
+
+
+def sample_themes():
+    return [
+        {"name": f"Theme {i}", "description": "A recurring factor respondents mention as a cause or driver of their answer."}
+        for i in range(1, THEME_COUNT + 1)
+    ]
+
+
+def summarize(batches, output_budget):
+    sizes = [len(b["items"]) for b in batches]
+    inputs = [b["input_tokens"] for b in batches]
+    outputs = [b["output_tokens"] for b in batches]
+    over_budget = sum(1 for o in outputs if o > output_budget)
+    return {
+        "requests": len(batches),
+        "answers_per_batch": {"min": min(sizes), "mean": round(statistics.mean(sizes), 1), "max": max(sizes)},
+        "input_tokens_per_batch": {"mean": round(statistics.mean(inputs)), "max": max(inputs)},
+        "output_tokens_per_batch": {"mean": round(statistics.mean(outputs)), "max": max(outputs)},
+        "total_input_tokens": sum(inputs),
+        "predicted_truncation_rate": round(over_budget / len(batches), 3),
+    }
+
+
+def run(datasets):
+    from results.llm import current_provider, provider_model, token_budget
+    from results.services import classify_system_prompt, plan_classify_batches
+
+    budget = token_budget()
+    system_prompt = classify_system_prompt(sample_themes())
+    report = {"provider": current_provider(), "model": provider_model(), "budget": budget, "datasets": {}}
+    for name, answers in datasets.items():
+        entry = {"answers": len(answers)}
+        for strategy in ("fixed", "adaptive"):
+            batches = plan_classify_batches(answers, system_prompt, strategy=strategy)
+            entry[strategy] = summarize(batches, budget["output"])
+        report["datasets"][name] = entry
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--csv", default=DEFAULT_CSV, help=f"Path to the CSV export (default: {DEFAULT_CSV})")
+    args = parser.parse_args()
+
+    setup()
+    datasets = {"seed": seed_answers()}
+    if os.path.exists(args.csv):
+        datasets["csv"] = csv_answers(args.csv)
+    print(json.dumps(run(datasets), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Compare the LLM and embedding theme classifiers on a topic.
+
+Classifies the topic's answers with the LLM path (taken as the reference),
+with embeddings alone and with the hybrid path (embeddings, LLM for uncertain
+answers). Reports wall time, LLM calls and pairwise precision/recall/F1 of
+(answer, theme) assignments against the reference, plus a threshold sweep to
+calibrate EMBEDDING_ACCEPT / EMBEDDING_REJECT for the embedding model.
+Nothing is written to the database.
+
+    python -m benchmarks.classifier TOPIC_ID [--limit N] [--min-f1 0.8]
+"""
+
+import argparse
+import json
+import time
+
+from benchmarks import setup
+
+ACCEPT_GRID = [0.35, 0.4, 0.45, 0.5, 0.55, 0.6, 0.65, 0.7]
+REJECT_GRID = [0.1, 0.15, 0.2, 0.25, 0.3, 0.35]
+
+
+def pairs(themes):
+    return {(aid, t["name"]) for t in themes for aid in t["answer_ids"]}
+
+
+def score(predicted, reference, answer_ids=None):
+    if answer_ids is not None:
+        predicted = {p for p in predicted if p[0] in answer_ids}
+        reference = {p for p in reference if p[0] in answer_ids}
+    hits = len(predicted & reference)
+    precision = hits / len(predicted) if predicted else 1.0
+    recall = hits / len(reference) if reference else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"precision": round(precision, 3), "recall": round(recall, 3), "f1": round(f1, 3)}
+
+
+def timed(fn, counter):
+    counter["calls"] = 0
+    start = time.perf_counter()
+    value = fn()
+    return value, {"seconds": round(time.perf_counter() - start, 2), "llm_calls": counter["calls"]}
+
+
+def sweep(sims, answers, themes, reference, min_f1):
+    import numpy as np
+
+    best = sims.max(axis=1)
+    rows = []
+    for accept in ACCEPT_GRID:
+        for reject in REJECT_GRID:
+            if reject >= accept:
+                continue
+            decided = {}
+            for i in np.flatnonzero(best < reject):
+                decided[answers[i]["id"]] = set()
+            for i in np.flatnonzero(best >= accept):
+                decided[answers[i]["id"]] = {themes[j]["name"] for j in np.flatnonzero(sims[i] >= accept)}
+            predicted = {(aid, name) for aid, names in decided.items() for name in names}
+            rows.append({
+                "accept": accept,
+                "reject": reject,
+                "coverage": round(len(decided) / len(answers), 3),
+                **score(predicted, reference, set(decided)),
+            })
+    eligible = [r for r in rows if r["f1"] >= min_f1 and r["coverage"] > 0]
+    recommended = max(eligible, key=lambda r: (r["coverage"], r["f1"])) if eligible else None
+    return rows, recommended
+
+
+def run(topic_id, limit=None, min_f1=0.8):
+    import results.llm as llm
+    from interview.models import Answer, Topic
+    from results import services
+    from results.embeddings import EMBEDDING_BACKEND, cosine_similarity, embed_texts, embedding_model
+
+    topic = Topic.objects.select_related("result").get(pk=topic_id)
+    answers = list(Answer.objects.filter(topic=topic).order_by("id").values("id", "text"))[:limit]
+    result = getattr(topic, "result", None)
+    themes = [{"name": t["name"], "description": t["description"]} for t in (result.proposed_themes if result else [])]
+    if not themes:
+        themes = services._discover_themes(answers, topic.name)
+
+    counter = {"calls": 0}
+    call_provider = llm._call_provider
+
+    def counting(*args, **kwargs):
+        counter["calls"] += 1
+        return call_provider(*args, **kwargs)
+
+    llm._call_provider = counting
+    try:
+        def classify(fn):
+            full = [{**t, "answer_ids": [], "excerpts": {}} for t in themes]
+            fn(answers, full)
+            return full
+
+        reference, llm_stats = timed(lambda: classify(services._classify_answers), counter)
+        embedded, embed_stats = timed(lambda: services._embedding_assignments(answers, themes), counter)
+        hybrid, hybrid_stats = timed(lambda: classify(services._classify_answers_embedding), counter)
+    finally:
+        llm._call_provider = call_provider
+
+    reference_pairs = pairs(reference)
+    embedded_pairs = {
+        (int(aid), themes[num - 1]["name"]) for aid, matches in embedded.items() for num, _ in matches
+    }
+    decided_ids = {int(aid) for aid in embedded}
+
+    sims = cosine_similarity(
+        embed_texts([a["text"] for a in answers]),
+        embed_texts([f"{t['name']}: {t['description']}" for t in themes]),
+    )
+    rows, recommended = sweep(sims, answers, themes, reference_pairs, min_f1)
+
+    return {
+        "topic_id": topic.id,
+        "answers": len(answers),
+        "themes": len(themes),
+        "embedding_backend": EMBEDDING_BACKEND,
+        "embedding_model": embedding_model(),
+        "thresholds": {"accept": services.EMBEDDING_ACCEPT, "reject": services.EMBEDDING_REJECT},
+        "llm": llm_stats,
+        "embedding_only": {
+            **embed_stats,
+            "coverage": round(len(decided_ids) / len(answers), 3) if answers else 0,
+            **score(embedded_pairs, reference_pairs, decided_ids),
+        },
+        "hybrid": {**hybrid_stats, **score(pairs(hybrid), reference_pairs)},
+        "sweep": rows,
+        "recommended_thresholds": recommended,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("topic_id", type=int)
+    parser.add_argument("--limit", type=int, default=None, help="Only use the first N answers")
+    parser.add_argument("--min-f1", type=float, default=0.8, help="Minimum F1 for recommended thresholds")
+    args = parser.parse_args()
+
+    setup()
+    print(json.dumps(run(args.topic_id, limit=args.limit, min_f1=args.min_f1), indent=2))
+
+
+if __name__ == "__main__":
+    main()
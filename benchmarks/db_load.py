@@ -0,0 +1,199 @@
+"""
+Database latency under concurrent dashboard reads and interview completions.
+
+Seeds a throwaway interview (sessions x topics answers), then runs a mix of
+the app's hot queries from several threads: a topic's answers by date, the
+interview's recent sessions, the active-analysis lookup by Result status, and
+interview completions (one session plus an answer per topic, in a
+transaction). Reports p50/p95/p99 per operation and overall.
+
+With --compare the workload runs twice, first with the composite indexes from
+interview 0019 / results 0012 dropped and then with them restored, to show
+what they buy. That alters the schema while it runs, so only point it at a
+development or staging database. The seeded interview is deleted afterwards.
+
+    python -m benchmarks.db_load [--sessions 5000] [--topics 5] [--threads 8] [--ops 4000] [--compare]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from benchmarks import setup
+
+WRITE_SHARE = 0.1
+SEED_CHUNK = 2000
+
+
+def seed(sessions, topics):
+    from interview.synthetic import generate_interview
+    from results.models import Result
+
+    # Spread created_at over the last 30 days so date filters are selective.
+    interview = generate_interview("db_load benchmark", topics, sessions, days=30, chunk=SEED_CHUNK)
+    topic_ids = list(interview.topics.values_list('id', flat=True))
+    Result.objects.bulk_create([Result(topic_id=tid, status='completed') for tid in topic_ids])
+    interview.is_open = False
+    interview.save(update_fields=['is_open'])
+    return interview, topic_ids
+
+
+def new_indexes():
+    from interview.models import Answer, InterviewSession
+    from results.models import Result
+
+    return [(model, index) for model in (Answer, InterviewSession, Result) for index in model._meta.indexes]
+
+
+def set_indexes(enabled):
+    from django.db import connection
+
+    with connection.schema_editor() as editor:
+        for model, index in new_indexes():
+            if enabled:
+                editor.add_index(model, index)
+            else:
+                editor.remove_index(model, index)
+
+
+def operations(interview, topic_ids):
+    from django.db import transaction
+    from django.utils import timezone
+
+    from interview.models import Answer, InterviewSession
+    from results.models import Result
+
+    def answers_by_date():
+        since = timezone.now() - timedelta(days=random.randint(1, 7))
+        list(Answer.objects.filter(topic_id=random.choice(topic_ids), created_at__gte=since)
+             .order_by('created_at').values_list('id', 'text')[:200])
+
+    def recent_sessions():
+        since = timezone.now() - timedelta(days=1)
+        InterviewSession.objects.filter(interview=interview, created_at__gte=since).count()
+        list(InterviewSession.objects.filter(interview=interview).order_by('-created_at')[:50])
+
+    def active_analyses():
+        list(Result.objects.filter(status__in=['running', 'discovering', 'classifying']).values_list('id', flat=True))
+
+    def complete_interview():
+        with transaction.atomic():
+            session = InterviewSession.objects.create(interview=interview)
+            Answer.objects.bulk_create(
+                [Answer(topic_id=tid, session=session, text="Load test answer") for tid in topic_ids]
+            )
+
+    reads = [answers_by_date, recent_sessions, active_analyses]
+    return reads, complete_interview
+
+
+def run_workload(interview, topic_ids, threads, ops):
+    from django.db import connection
+
+    reads, write = operations(interview, topic_ids)
+    timings = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+    per_thread = ops // threads
+
+    def worker():
+        try:
+            for _ in range(per_thread):
+                op = write if random.random() < WRITE_SHARE else random.choice(reads)
+                start = time.perf_counter()
+                try:
+                    op()
+                except Exception:
+                    with lock:
+                        errors[op.__name__] += 1
+                    continue
+                elapsed = (time.perf_counter() - start) * 1000
+                with lock:
+                    timings[op.__name__].append(elapsed)
+        finally:
+            connection.close()
+
+    start = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    seconds = time.perf_counter() - start
+
+    everything = [ms for values in timings.values() for ms in values]
+    return {
+        "seconds": round(seconds, 2),
+        "ops_per_second": round(len(everything) / seconds, 1) if seconds else 0,
+        "overall": percentiles(everything),
+        "operations": {name: percentiles(values) for name, values in sorted(timings.items())},
+        "errors": dict(errors),
+    }
+
+
+def percentiles(values):
+    if not values:
+        return {"count": 0}
+    values = sorted(values)
+
+    def pct(p):
+        return round(values[min(len(values) - 1, int(len(values) * p))], 2)
+
+    return {
+        "count": len(values),
+        "p50_ms": round(statistics.median(values), 2),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+    }
+
+
+def run(sessions, topics, threads, ops, compare):
+    from django.db import connection
+
+    start = time.perf_counter()
+    interview, topic_ids = seed(sessions, topics)
+    report = {
+        "database": connection.vendor,
+        "sessions": sessions,
+        "topics": topics,
+        "threads": threads,
+        "seed_seconds": round(time.perf_counter() - start, 2),
+    }
+    try:
+        if compare:
+            set_indexes(False)
+            try:
+                report["without_indexes"] = run_workload(interview, topic_ids, threads, ops)
+            finally:
+                set_indexes(True)
+        report["with_indexes"] = run_workload(interview, topic_ids, threads, ops)
+        if compare:
+            before = report["without_indexes"]["overall"].get("p95_ms")
+            after = report["with_indexes"]["overall"].get("p95_ms")
+            if before and after:
+                report["p95_speedup"] = round(before / after, 2)
+    finally:
+        interview.delete()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=5000, help="Sessions to seed (one answer per topic each)")
+    parser.add_argument("--topics", type=int, default=5)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=4000, help="Total operations across all threads")
+    parser.add_argument("--compare", action="store_true", help="Also run with the composite indexes dropped")
+    args = parser.parse_args()
+
+    setup()
+    print(json.dumps(run(args.sessions, args.topics, args.threads, args.ops, args.compare), indent=2))
+
+
+if __name__ == "__main__":
+    main()
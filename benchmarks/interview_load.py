@@ -0,0 +1,284 @@
+"""
+How many concurrent interview conversations a deployment sustains.
+
+Simulated respondents each run whole conversations the way the browser does.
+They log in through SharedPasswordMiddleware when SITE_PASSWORD is set, load
+the interview page for its CSRF cookie, fetch interview_topics_api and
+interview_opening_api, then POST interview_chat_api turns with the growing
+history until the interview completes or --max-turns is reached. Every
+conversation starts with a fresh cookie jar, like a new respondent.
+
+For each worker configuration (gunicorn WORKERSxTHREADS), a local gunicorn
+serving benchmarks.stub_wsgi is started, so LLM calls go to results.stub.
+Each configuration is driven by --respondents concurrent respondents for
+--duration seconds, and the report gives turns/sec, p50/p95/p99 turn latency
+and error rates per endpoint. With --url an already running server is
+driven instead, and whatever provider it is configured with is used. The
+throwaway interview is deleted afterwards.
+
+    python -m benchmarks.interview_load [--configs 1x1 2x4 4x4] [--respondents 50] [--duration 60]
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from http.cookiejar import CookieJar
+from pathlib import Path
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import HTTPCookieProcessor, Request, build_opener
+
+from benchmarks import setup
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+CONFIGS = ["1x1", "2x4", "4x4"]
+REQUEST_TIMEOUT = 120
+SERVER_START_TIMEOUT = 30
+
+_REPLIES = [
+    "Honestly it's been a busy month, the workload is heavy but manageable.",
+    "I'm feeling fairly positive, the team has been supportive.",
+    "Meetings take up too much of my week and it's hard to focus.",
+    "Priorities keep changing, which makes planning difficult.",
+    "The new tools have helped a lot with handovers.",
+    "Not much to add, things are about the same as last month.",
+]
+
+
+class Respondent:
+    """One simulated respondent: a cookie jar and timed requests against the server."""
+
+    def __init__(self, base_url, stats):
+        self.base_url = base_url.rstrip("/")
+        self.stats = stats
+        self.jar = CookieJar()
+        self.opener = build_opener(HTTPCookieProcessor(self.jar))
+
+    def request(self, name, path, data=None, headers=None):
+        """Timed request; returns the parsed JSON body (or text), or None if it failed."""
+        request = Request(self.base_url + path, data=data, headers=headers or {})
+        start = time.perf_counter()
+        try:
+            with self.opener.open(request, timeout=REQUEST_TIMEOUT) as response:
+                body = response.read()
+                ok = True
+        except (HTTPError, URLError, OSError) as e:
+            body = getattr(e, "read", lambda: b"")()
+            ok = False
+        self.stats.record(name, (time.perf_counter() - start) * 1000, ok)
+        if not ok:
+            return None
+        if "json" in (response.headers.get("Content-Type") or ""):
+            return json.loads(body)
+        return body.decode(errors="replace")
+
+    def csrf_token(self):
+        return next((c.value for c in self.jar if c.name == "csrftoken"), "")
+
+    def converse(self, interview_uuid, password, max_turns, rng):
+        """Run one conversation. Returns True if the interview was completed."""
+        if password:
+            page = self.request("login", "/login/", data=urlencode({"password": password}).encode())
+            if page is None:
+                return False
+            if 'name="password"' in page:  # login page again: wrong password
+                self.stats.record_error("login")
+                return False
+        if self.request("page", f"/{interview_uuid}/") is None:
+            return False
+        if self.request("topics", f"/api/interview/{interview_uuid}/topics/") is None:
+            return False
+        opening = self.request("opening", f"/api/interview/{interview_uuid}/opening/")
+        if opening is None:
+            return False
+
+        history = [{"role": "assistant", "content": opening["question"]}]
+        covered = []
+        headers = {"Content-Type": "application/json", "X-CSRFToken": self.csrf_token()}
+        for _ in range(max_turns):
+            message = rng.choice(_REPLIES)
+            body = json.dumps({"message": message, "history": history, "covered_topics": covered}).encode()
+            reply = self.request("turn", f"/api/interview/{interview_uuid}/chat/", data=body, headers=headers)
+            if reply is None:
+                return False
+            history += [{"role": "user", "content": message}, {"role": "assistant", "content": reply["response"]}]
+            covered = reply["covered_topics"]
+            if reply["interview_complete"]:
+                return True
+        return False
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timings = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.conversations = 0
+        self.completed = 0
+
+    def record(self, name, ms, ok):
+        with self.lock:
+            if ok:
+                self.timings[name].append(ms)
+            else:
+                self.errors[name] += 1
+
+    def record_error(self, name):
+        with self.lock:
+            self.errors[name] += 1
+
+
+def percentiles(values):
+    if not values:
+        return {"count": 0}
+    values = sorted(values)
+
+    def pct(p):
+        return round(values[min(len(values) - 1, int(len(values) * p))], 1)
+
+    return {
+        "count": len(values),
+        "p50_ms": round(statistics.median(values), 1),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+    }
+
+
+def drive(base_url, interview_uuid, password, respondents, duration, max_turns):
+    """Run respondents concurrently for duration seconds; returns the load report."""
+    stats = Stats()
+    deadline = time.monotonic() + duration
+
+    def worker(n):
+        rng = random.Random(n)
+        while time.monotonic() < deadline:
+            done = Respondent(base_url, stats).converse(interview_uuid, password, max_turns, rng)
+            with stats.lock:
+                stats.conversations += 1
+                stats.completed += done
+
+    start = time.monotonic()
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(respondents)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    seconds = time.monotonic() - start
+
+    requests = sum(len(v) for v in stats.timings.values()) + sum(stats.errors.values())
+    turns = len(stats.timings["turn"])
+    return {
+        "respondents": respondents,
+        "seconds": round(seconds, 1),
+        "conversations": stats.conversations,
+        "completed_conversations": stats.completed,
+        "turns": turns,
+        "turns_per_second": round(turns / seconds, 2) if seconds else 0,
+        "turn_latency": percentiles(stats.timings["turn"]),
+        "error_rate": round(sum(stats.errors.values()) / requests, 4) if requests else 0,
+        "endpoints": {
+            name: {**percentiles(stats.timings[name]), "errors": stats.errors[name]}
+            for name in sorted(set(stats.timings) | set(stats.errors))
+        },
+    }
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(config, latency_scale):
+    """Start gunicorn with benchmarks.stub_wsgi for a WORKERSxTHREADS config; returns (process, base_url)."""
+    workers, threads = (int(n) for n in config.split("x"))
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "gunicorn", "benchmarks.stub_wsgi",
+            "--bind", f"127.0.0.1:{port}", "--workers", str(workers), "--threads", str(threads),
+            "--timeout", str(REQUEST_TIMEOUT), "--log-level", "warning",
+        ],
+        cwd=BASE_DIR,
+        env={**os.environ, "STUB_LATENCY_SCALE": str(latency_scale)},
+    )
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {process.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"gunicorn did not start listening within {SERVER_START_TIMEOUT}s")
+
+
+def seed(topics):
+    from interview.models import Interview, Topic
+
+    interview = Interview.objects.create(name="interview_load benchmark")
+    Topic.objects.bulk_create([
+        Topic(interview=interview, name=name, order=i)
+        for i, name in enumerate(["Workload", "Team", "Tools", "Priorities", "Wellbeing", "Growth"][:topics])
+    ])
+    return interview
+
+
+def run(configs, respondents, duration, max_turns, topics, latency_scale, url=None, password=None):
+    from django.conf import settings
+    from django.db import connections
+
+    password = getattr(settings, "SITE_PASSWORD", "") if password is None else password
+    interview = seed(topics)
+    connections.close_all()
+    report = {"topics": topics, "max_turns": max_turns, "latency_scale": None if url else latency_scale, "runs": []}
+    try:
+        for config in ([None] if url else configs):
+            print(f"[benchmark] {respondents} respondents against {url or 'gunicorn ' + config}...", file=sys.stderr)
+            process = None
+            base_url = url
+            if url is None:
+                process, base_url = start_server(config, latency_scale)
+            try:
+                entry = drive(base_url, interview.uuid, password, respondents, duration, max_turns)
+            finally:
+                if process is not None:
+                    process.terminate()
+                    process.wait()
+            report["runs"].append({"config": config or url, **entry})
+    finally:
+        interview.delete()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--configs", nargs="+", default=CONFIGS, help="gunicorn WORKERSxTHREADS to compare")
+    parser.add_argument("--respondents", type=int, default=50, help="Concurrent simulated respondents")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds to drive each configuration")
+    parser.add_argument("--max-turns", type=int, default=8, help="Give up on a conversation after this many turns")
+    parser.add_argument("--topics", type=int, default=3, help="Topics in the throwaway interview (max 6)")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiplier on the stub's simulated latency")
+    parser.add_argument("--url", help="Drive this running server instead of starting gunicorn")
+    parser.add_argument("--password", help="Site password (default: settings.SITE_PASSWORD)")
+    args = parser.parse_args()
+
+    setup()
+    print(json.dumps(run(
+        args.configs, args.respondents, args.duration, args.max_turns, args.topics,
+        args.latency_scale, url=args.url, password=args.password,
+    ), indent=2))
+
+
+if __name__ == "__main__":
+    main()
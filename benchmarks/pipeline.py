@@ -0,0 +1,219 @@
+"""
+End-to-end timing of the analysis pipeline against the stub LLM provider.
+
+For each size, seeds a throwaway interview with one topic of that many
+answers (interview.synthetic) and runs the close-analysis stages in order: discover_themes_only,
+run_classification_with_themes (with checkpointing on a Result, as the views
+do), run_sentiment_analysis, generate_summary, then the dashboard's
+get_all_results_api. Each stage reports wall time, DB queries, LLM calls and
+tokens, and the process's peak RSS so far.
+
+Every size runs in its own spawned process so its peak RSS is not inflated
+by the previous one. results.stub makes LLM latency token-proportional and
+deterministic; --latency-scale shrinks it for quick CI runs. With --baseline,
+the report is compared against an earlier one and regressions are listed.
+The seeded interview is deleted afterwards.
+
+    python -m benchmarks.pipeline [--sizes 1000 10000 100000] [--latency-scale 0.01] [--baseline report.json]
+
+Also available as `python manage.py benchmark_pipeline`.
+"""
+
+import argparse
+import json
+import random
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from benchmarks import setup
+
+SIZES = [1000, 10000, 100000]
+
+# Regressions beyond these fractions fail the --baseline comparison. Query and
+# call counts are deterministic with the stub, so any increase is reported.
+WALL_TOLERANCE = 0.25
+RSS_TOLERANCE = 0.25
+
+
+def seed(size):
+    from interview.synthetic import generate_interview
+    from results.models import Result
+
+    interview = generate_interview(f"pipeline benchmark ({size} answers)", 1, size, rng=random.Random(size))
+    topic = interview.topics.get()
+    return interview, topic, Result.objects.create(topic=topic)
+
+
+def peak_rss_mb():
+    # ru_maxrss is in KiB on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def measure(fn):
+    """Run fn() and return (its value, {wall_seconds, queries, llm_calls, ...})."""
+    from django.db import connection
+
+    from results import llm
+
+    queries = 0
+    calls = []
+
+    def count_query(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    llm.add_call_listener(calls.append)
+    start = time.perf_counter()
+    try:
+        with connection.execute_wrapper(count_query):
+            value = fn()
+    finally:
+        llm.remove_call_listener(calls.append)
+    wall = time.perf_counter() - start
+    return value, {
+        "wall_seconds": round(wall, 3),
+        "queries": queries,
+        "llm_calls": len(calls),
+        "llm_seconds": round(sum(c["latency_ms"] for c in calls) / 1000, 3),
+        "input_tokens": sum(c["input_tokens"] for c in calls),
+        "output_tokens": sum(c["output_tokens"] for c in calls),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def bench_size(size, latency_scale):
+    """Seed, run and time every stage for one topic of size answers. Runs in a child process."""
+    setup()
+    from django.conf import settings
+    from django.test import RequestFactory
+    from django.utils import timezone
+
+    from results import llm, stub, views
+    from results.models import LLMCall
+    from results.services import (
+        discover_themes_only, generate_summary, run_classification_with_themes, run_sentiment_analysis,
+    )
+
+    # With DEBUG on, Django keeps every executed query's SQL (checkpoint JSON
+    # included) in memory, which would dominate peak RSS.
+    settings.DEBUG = False
+    llm.PROVIDER = "stub"
+    stub.LATENCY_SCALE = latency_scale
+    started_at = timezone.now()
+
+    start = time.perf_counter()
+    interview, topic, result = seed(size)
+    report = {"answers": size, "seed_seconds": round(time.perf_counter() - start, 2), "stages": {}}
+    stages = report["stages"]
+    try:
+        themes, stages["discover"] = measure(lambda: discover_themes_only(topic))
+        result.proposed_themes = themes
+        result.save()
+        themes, stages["classify"] = measure(lambda: run_classification_with_themes(topic, themes, result=result))
+        sentiment, stages["sentiment"] = measure(lambda: run_sentiment_analysis(topic))
+        summary, stages["summary"] = measure(lambda: generate_summary(topic))
+
+        result.themes = themes
+        result.sentiment = sentiment
+        result.summary = summary
+        result.answer_count = size
+        result.analyzed_at = timezone.now()
+        result.checkpoint = {}
+        result.status = 'completed'
+        result.save()
+
+        request = RequestFactory().get(f"/results/{interview.uuid}/api/results/")
+        response, stages["results_api"] = measure(lambda: views.get_all_results_api(request, interview.uuid))
+        stages["results_api"]["response_kb"] = round(len(response.content) / 1024, 1)
+
+        report["total"] = {
+            key: round(sum(s[key] for s in stages.values()), 3)
+            for key in ("wall_seconds", "queries", "llm_calls", "llm_seconds", "input_tokens", "output_tokens")
+        }
+        report["total"]["peak_rss_mb"] = peak_rss_mb()
+    finally:
+        interview.delete()
+        LLMCall.objects.filter(provider="stub", created_at__gte=started_at).delete()
+    return report
+
+
+def run(sizes=SIZES, latency_scale=1.0):
+    from django.db import connections
+
+    # Children open their own connections; don't hand them ours.
+    connections.close_all()
+    report = {"provider": "stub", "latency_scale": latency_scale, "sizes": []}
+    for size in sizes:
+        print(f"[benchmark] pipeline with {size} answers...", file=sys.stderr)
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            report["sizes"].append(pool.submit(bench_size, size, latency_scale).result())
+    return report
+
+
+def regressions(report, baseline):
+    """List the stages that got slower, chattier or bigger than in baseline, for sizes both reports cover."""
+    found = []
+    previous = {entry["answers"]: entry for entry in baseline.get("sizes", [])}
+    for entry in report["sizes"]:
+        before = previous.get(entry["answers"])
+        if before is None:
+            continue
+        for stage, now in entry["stages"].items():
+            then = before["stages"].get(stage)
+            if then is None:
+                continue
+            label = f"{entry['answers']} answers / {stage}"
+            for key in ("queries", "llm_calls"):
+                if now[key] > then[key]:
+                    found.append(f"{label}: {key} {then[key]} -> {now[key]}")
+            if now["wall_seconds"] > then["wall_seconds"] * (1 + WALL_TOLERANCE) and now["wall_seconds"] - then["wall_seconds"] > 0.05:
+                found.append(f"{label}: wall {then['wall_seconds']}s -> {now['wall_seconds']}s")
+        rss_then, rss_now = before["total"]["peak_rss_mb"], entry["total"]["peak_rss_mb"]
+        if rss_now > rss_then * (1 + RSS_TOLERANCE):
+            found.append(f"{entry['answers']} answers: peak RSS {rss_then}MB -> {rss_now}MB")
+    return found
+
+
+def add_arguments(parser):
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="Answers per run")
+    parser.add_argument(
+        "--latency-scale", type=float, default=1.0,
+        help="Multiplier on the stub's simulated LLM latency (0 for none)",
+    )
+    parser.add_argument("--baseline", help="Earlier JSON report; exit non-zero if this run regresses against it")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+
+
+def report_and_check(options, write):
+    """Run the benchmark from parsed options, write the report, return the regressions found."""
+    report = run(options["sizes"], options["latency_scale"])
+    found = []
+    if options.get("baseline"):
+        with open(options["baseline"]) as f:
+            found = regressions(report, json.load(f))
+        report["regressions"] = found
+    text = json.dumps(report, indent=2)
+    if options.get("output"):
+        with open(options["output"], "w") as f:
+            f.write(text + "\n")
+    write(text)
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    setup()
+    if report_and_check(vars(args), print):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Full-text search latency over a large interview.
+
+Seeds a throwaway interview (sessions x topics answers) through
+interview.synthetic, the same generator as `manage.py seed_synthetic`, then
+times results.search.search_answers for the query shapes the app sends: a
+common term, a rare term, every-term and any-term (chat retrieval) phrases,
+a search scoped to one topic, one scoped to a theme's answer ids, and a deep
+page. Terms are drawn from the seeded answers by document frequency. Reports
+p50/p95/max per query kind and overall. The seeded interview is deleted
+afterwards.
+
+    python -m benchmarks.search [--sessions 200000] [--topics 5] [--queries 50]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from collections import Counter
+
+from benchmarks import setup
+
+SEED_CHUNK = 5000
+SAMPLE_ANSWERS = 5000   # answers read back to pick query terms by frequency
+THEME_SIZE = 2000       # answer ids in the simulated theme filter
+DEEP_PAGE = 10
+
+
+def seed(sessions, topics):
+    from interview.synthetic import generate_interview
+
+    interview = generate_interview("search benchmark", topics, sessions, rng=random.Random(0), chunk=SEED_CHUNK)
+    return interview, list(interview.topics.values_list('id', flat=True))
+
+
+def query_terms(interview):
+    """Terms of the seeded answers from most to least frequent, by the number of answers containing them."""
+    from interview.models import Answer
+    from results.search import _TERM
+
+    texts = Answer.objects.filter(topic__interview=interview).order_by('?').values_list('text', flat=True)
+    frequency = Counter()
+    for text in texts[:SAMPLE_ANSWERS]:
+        frequency.update({term.lower() for term in _TERM.findall(text) if len(term) > 3})
+    return [term for term, _ in frequency.most_common()]
+
+
+def query_kinds(interview, topic_ids, terms):
+    from interview.models import Answer
+    from results.search import search_answers
+
+    common, rare = terms[:20], terms[-20:]
+    theme_ids = list(
+        Answer.objects.filter(topic_id=topic_ids[0]).order_by('?').values_list('id', flat=True)[:THEME_SIZE]
+    )
+
+    def common_term(rng):
+        return search_answers(rng.choice(common), interview_id=interview.id)
+
+    def rare_term(rng):
+        return search_answers(rng.choice(rare), interview_id=interview.id)
+
+    def all_terms(rng):
+        return search_answers(" ".join(rng.sample(terms[:200], 2)), interview_id=interview.id)
+
+    def any_term(rng):
+        return search_answers(" ".join(rng.sample(terms[:200], 5)), interview_id=interview.id, page_size=200, match_any=True)
+
+    def topic_scoped(rng):
+        return search_answers(rng.choice(common), topic_id=rng.choice(topic_ids))
+
+    def theme_scoped(rng):
+        return search_answers(rng.choice(common), topic_id=topic_ids[0], answer_ids=theme_ids)
+
+    def deep_page(rng):
+        return search_answers(rng.choice(common), interview_id=interview.id, page=DEEP_PAGE)
+
+    return [common_term, rare_term, all_terms, any_term, topic_scoped, theme_scoped, deep_page]
+
+
+def percentiles(values):
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "p50_ms": round(statistics.median(values), 2),
+        "p95_ms": round(values[min(len(values) - 1, int(len(values) * 0.95))], 2),
+        "max_ms": round(values[-1], 2),
+    }
+
+
+def run(sessions, topics, queries):
+    from django.db import connection
+
+    from interview.models import Answer
+
+    start = time.perf_counter()
+    interview, topic_ids = seed(sessions, topics)
+    report = {
+        "database": connection.vendor,
+        "answers": Answer.objects.filter(topic__interview=interview).count(),
+        "seed_seconds": round(time.perf_counter() - start, 2),
+    }
+    try:
+        rng = random.Random(0)
+        kinds = query_kinds(interview, topic_ids, query_terms(interview))
+        timings = {kind.__name__: [] for kind in kinds}
+        matches = {kind.__name__: 0 for kind in kinds}
+        for _ in range(queries):
+            for kind in kinds:
+                start = time.perf_counter()
+                result = kind(rng)
+                timings[kind.__name__].append((time.perf_counter() - start) * 1000)
+                matches[kind.__name__] += len(result["results"])
+        report["overall"] = percentiles([ms for values in timings.values() for ms in values])
+        report["queries"] = {
+            name: {**percentiles(values), "avg_results": round(matches[name] / queries, 1)}
+            for name, values in timings.items()
+        }
+    finally:
+        interview.delete()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200000, help="Sessions to seed (one answer per topic each)")
+    parser.add_argument("--topics", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=50, help="Queries of each kind")
+    args = parser.parse_args()
+
+    setup()
+    print(json.dumps(run(args.sessions, args.topics, args.queries), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Interview completions racing an analysis on SQLite, with and without tuning.
+
+Runs the same workload against two copies of the SQLite database: once with
+SQLite's defaults (SQLITE_TUNING=0: rollback journal, deferred transactions)
+and once with the pragmas from settings.SQLITE_PRAGMAS (WAL etc.). In each,
+several respondent processes complete interviews (a session plus one answer per
+topic, in a transaction) while an analysis process repeatedly scans a topic's
+answers and writes Result themes and checkpoints. Reports completion latency
+percentiles, throughput and "database is locked" failures for both runs.
+
+Each run happens in a subprocess on a temporary copy of --database (default:
+the project's db.sqlite3), which is migrated first; the original is not touched.
+
+    python -m benchmarks.sqlite_concurrency [--respondents 8] [--seconds 10] [--answers 20000]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks import setup
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+CHECKPOINT_EVERY = 200
+
+
+def seed(answers, topics):
+    from interview.models import Answer, Interview, InterviewSession, Topic
+    from results.models import Result
+
+    interview = Interview.objects.create(name="sqlite_concurrency benchmark", is_open=False)
+    topic_objs = Topic.objects.bulk_create(
+        [Topic(interview=interview, name=f"Topic {i + 1}", order=i) for i in range(topics)]
+    )
+    analysed = topic_objs[0]
+    sessions = InterviewSession.objects.bulk_create([InterviewSession(interview=interview) for _ in range(answers)])
+    Answer.objects.bulk_create(
+        [Answer(topic=analysed, session=s, text=f"Synthetic answer number {s.id} " * 8) for s in sessions],
+        batch_size=2000,
+    )
+    result = Result.objects.create(topic=analysed, status='classifying')
+    return interview, [t.id for t in topic_objs], result
+
+
+def analysis_loop(topic_id, result, stop, out):
+    """Scan the topic's answers and write results the way a classification run does."""
+    from django.db import connection
+
+    from interview.models import Answer
+    from results.models import Result
+
+    stats = {"scans": 0, "writes": 0, "errors": []}
+    try:
+        while not stop.is_set():
+            # Load first, then write per batch, as services._classify_answers does.
+            answers = list(Answer.objects.filter(topic_id=topic_id).values_list('id', 'text'))
+            assignments = {}
+            for i, (aid, text) in enumerate(answers, 1):
+                assignments[str(aid)] = [[1, text[:40]]]
+                if i % CHECKPOINT_EVERY == 0:
+                    Result.objects.filter(pk=result.pk).update(checkpoint={"assignments": assignments})
+                    stats["writes"] += 1
+                if stop.is_set():
+                    break
+            themes = [{"name": "Theme", "description": "", "answer_ids": [int(a) for a in assignments]}]
+            Result.objects.filter(pk=result.pk).update(themes=themes, checkpoint={})
+            stats["writes"] += 1
+            stats["scans"] += 1
+    except Exception as e:
+        stats["errors"].append(str(e))
+    finally:
+        connection.close()
+        out.put(("analysis", stats))
+
+
+def respondent_loop(interview, topic_ids, stop, out):
+    """Complete interviews back to back, like interview.views does on submit."""
+    from django.db import connection, transaction
+
+    from interview.models import Answer, InterviewSession, Topic
+
+    timings, errors = [], {}
+    try:
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                list(Topic.objects.filter(interview=interview).values_list('id', 'name'))
+                with transaction.atomic():
+                    session = InterviewSession.objects.create(interview=interview)
+                    for tid in topic_ids:
+                        Answer.objects.create(topic_id=tid, session=session, text="Load test answer")
+            except Exception as e:
+                key = f"{type(e).__name__}: {e}"[:80]
+                errors[key] = errors.get(key, 0) + 1
+                continue
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        connection.close()
+        out.put(("respondent", (timings, errors)))
+
+
+def worker(respondents, seconds, answers, topics):
+    """Run one configuration in this process and return its measurements."""
+    from django.core.management import call_command
+    from django.db import connection
+
+    call_command('migrate', verbosity=0)
+    interview, topic_ids, result = seed(answers, topics)
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA journal_mode")
+        journal_mode = cursor.fetchone()[0]
+    connection.close()
+
+    # Separate processes, like separate gunicorn workers, so the GIL doesn't skew the timings.
+    ctx = multiprocessing.get_context("fork")
+    stop, out = ctx.Event(), ctx.Queue()
+    procs = [ctx.Process(target=analysis_loop, args=(topic_ids[0], result, stop, out))]
+    procs += [ctx.Process(target=respondent_loop, args=(interview, topic_ids, stop, out)) for _ in range(respondents)]
+    for p in procs:
+        p.start()
+    time.sleep(seconds)
+    stop.set()
+
+    timings, errors, analysis = [], {}, {}
+    for _ in procs:
+        role, data = out.get()
+        if role == "analysis":
+            analysis = data
+        else:
+            timings += data[0]
+            for key, count in data[1].items():
+                errors[key] = errors.get(key, 0) + count
+    for p in procs:
+        p.join()
+
+    timings.sort()
+
+    def pct(p):
+        return round(timings[min(len(timings) - 1, int(len(timings) * p))], 2) if timings else None
+
+    return {
+        "journal_mode": journal_mode,
+        "completions": len(timings),
+        "completions_per_second": round(len(timings) / seconds, 1),
+        "p50_ms": pct(0.5),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "max_ms": round(timings[-1], 2) if timings else None,
+        "failed_completions": errors,
+        "analysis_scans": analysis["scans"],
+        "analysis_writes": analysis["writes"],
+        "analysis_errors": analysis["errors"][:3],
+    }
+
+
+def run(database, respondents, seconds, answers, topics):
+    report = {"respondents": respondents, "seconds": seconds, "answers": answers}
+    for label, tuning in (("default", "0"), ("tuned", "1")):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "db.sqlite3")
+            shutil.copy(database, path)
+            env = {**os.environ, "SQLITE_PATH": path, "SQLITE_TUNING": tuning}
+            env.pop("DATABASE_URL", None)
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.sqlite_concurrency", "--worker",
+                 "--respondents", str(respondents), "--seconds", str(seconds),
+                 "--answers", str(answers), "--topics", str(topics)],
+                env=env, cwd=BASE_DIR, capture_output=True, text=True, check=True,
+            )
+            report[label] = json.loads(out.stdout)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database", default=str(BASE_DIR / "db.sqlite3"), help="SQLite file to copy")
+    parser.add_argument("--respondents", type=int, default=8, help="Concurrent respondent processes")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--answers", type=int, default=20000, help="Answers in the topic being analysed")
+    parser.add_argument("--topics", type=int, default=5)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        setup()
+        print(json.dumps(worker(args.respondents, args.seconds, args.answers, args.topics)))
+        return
+    print(json.dumps(run(args.database, args.respondents, args.seconds, args.answers, args.topics), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+"""
+WSGI application that answers every LLM call with results.stub, for load
+tests against a real server without provider costs or rate limits:
+
+    STUB_LATENCY_SCALE=1 gunicorn benchmarks.stub_wsgi --workers 2 --threads 4
+"""
+
+import os
+
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "fora.settings")
+
+application = get_wsgi_application()
+
+from results import llm, stub  # noqa: E402  (needs the app registry)
+
+llm.PROVIDER = "stub"
+stub.LATENCY_SCALE = float(os.environ.get("STUB_LATENCY_SCALE", "1"))
@@ -0,0 +1,78 @@
+"""
+Query latency of brute-force top-k search over a memory-mapped topic matrix.
+
+Writes a synthetic (answers x dim) float32 matrix of unit vectors in the same
+.npy layout results.vectors uses, memory-maps it and times top-k queries
+through results.vectors.matrix_top_k. The first query is reported separately
+because it pages the matrix in from disk.
+
+    python -m benchmarks.vector_search [--answers 100000] [--dim 384] [--k 10] [--queries 200]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks import setup
+
+
+def run(answers, dim, k, queries):
+    from results.vectors import matrix_top_k
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "matrix.npy")
+        start = time.perf_counter()
+        matrix = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(answers, dim))
+        for lo in range(0, answers, 10000):
+            block = rng.standard_normal((min(10000, answers - lo), dim), dtype=np.float32)
+            matrix[lo:lo + len(block)] = block / np.linalg.norm(block, axis=1, keepdims=True)
+        matrix.flush()
+        del matrix
+        build_seconds = time.perf_counter() - start
+
+        ids = np.arange(answers, dtype=np.int64)
+        matrix = np.load(path, mmap_mode="r")
+        query_vectors = rng.standard_normal((queries + 1, dim), dtype=np.float32)
+        query_vectors /= np.linalg.norm(query_vectors, axis=1, keepdims=True)
+
+        timings = []
+        for q in query_vectors:
+            start = time.perf_counter()
+            matrix_top_k(ids, matrix, q, k)
+            timings.append((time.perf_counter() - start) * 1000)
+        del matrix
+
+    warm = sorted(timings[1:])
+    return {
+        "answers": answers,
+        "dim": dim,
+        "k": k,
+        "matrix_mb": round(answers * dim * 4 / 1e6, 1),
+        "build_seconds": round(build_seconds, 2),
+        "first_query_ms": round(timings[0], 2),
+        "p50_ms": round(statistics.median(warm), 2),
+        "p95_ms": round(warm[int(len(warm) * 0.95) - 1], 2),
+        "max_ms": round(warm[-1], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--answers", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    setup()
+    print(json.dumps(run(args.answers, args.dim, args.k, args.queries), indent=2))
+
+
+if __name__ == "__main__":
+    main()
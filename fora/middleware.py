@@ -1,4 +1,12 @@
+import json
+import os
+import tempfile
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
 from django.conf import settings
+from django.db import connections
 from django.http import HttpResponse, HttpResponseRedirect
 
 
@@ -41,3 +49,119 @@ button {{ padding: 0.5rem 1.5rem; background: #333; color: white; border: none;
         response = HttpResponse(html)
         response["Content-Type"] = "text/html"
         return response
+
+
+_request_stats = ContextVar("perf_request_stats", default=None)
+
+
+def perf_log_path():
+    return getattr(settings, "PERF_LOG_PATH", "") or os.path.join(tempfile.gettempdir(), "fora-perf.jsonl")
+
+
+def _count_llm_call(call):
+    stats = _request_stats.get()
+    if stats is not None:
+        stats["llm_calls"] += 1
+        stats["llm_ms"] += call["latency_ms"]
+
+
+class PerformanceMiddleware:
+    """
+    Per-request timings: wall time, DB queries (count and time), LLM time
+    (from results.llm) and response size. Adds a Server-Timing header and
+    appends one JSON line per request to perf_log_path() for
+    `manage.py perf_report`.
+
+    Opt-in: enabled by PERF_MONITORING=1 (see settings). Put it first in
+    MIDDLEWARE so the timings cover the other middleware too.
+
+    Streaming responses are measured until their body has been sent (or the
+    client went away), since that is where their queries run; their
+    Server-Timing header can only cover the time to the first byte.
+    """
+
+    def __init__(self, get_response):
+        from results import llm
+
+        self.get_response = get_response
+        self.max_bytes = getattr(settings, "PERF_LOG_MAX_BYTES", 50 * 1024 * 1024)
+        llm.add_call_listener(_count_llm_call)
+
+    def __call__(self, request):
+        stats = {"queries": 0, "db_ms": 0.0, "llm_calls": 0, "llm_ms": 0}
+
+        def count_query(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                stats["queries"] += 1
+                stats["db_ms"] += (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        with self._measuring(stats, count_query):
+            response = self.get_response(request)
+        wall_ms = (time.perf_counter() - start) * 1000
+
+        response["Server-Timing"] = ", ".join([
+            f'app;dur={wall_ms:.1f}',
+            f'db;dur={stats["db_ms"]:.1f};desc="{stats["queries"]} queries"',
+            f'llm;dur={stats["llm_ms"]:.1f};desc="{stats["llm_calls"]} calls"',
+        ])
+        if response.streaming and not response.is_async:
+            response.streaming_content = self._measured_stream(
+                response.streaming_content, request, response, stats, count_query, start,
+            )
+        else:
+            self._record(request, response, stats, start, None if response.streaming else len(response.content))
+        return response
+
+    @contextmanager
+    def _measuring(self, stats, count_query):
+        """Count the block's queries and LLM calls into stats."""
+        token = _request_stats.set(stats)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(count_query))
+                yield
+        finally:
+            _request_stats.reset(token)
+
+    def _measured_stream(self, content, request, response, stats, count_query, start):
+        """Pass the body through, still measuring, and record the request once it is exhausted or closed."""
+        size = 0
+        try:
+            with self._measuring(stats, count_query):
+                for chunk in content:
+                    size += len(chunk)
+                    yield chunk
+        finally:
+            self._record(request, response, stats, start, size)
+
+    def _record(self, request, response, stats, start, size):
+        match = request.resolver_match
+        self._log({
+            "ts": round(time.time(), 3),
+            "method": request.method,
+            "endpoint": match.view_name if match else request.path,
+            "route": match.route if match else request.path,
+            "status": response.status_code,
+            "wall_ms": round((time.perf_counter() - start) * 1000, 1),
+            "queries": stats["queries"],
+            "db_ms": round(stats["db_ms"], 1),
+            "llm_calls": stats["llm_calls"],
+            "llm_ms": stats["llm_ms"],
+            "bytes": size,
+        })
+
+    def _log(self, entry):
+        path = perf_log_path()
+        try:
+            if os.path.exists(path) and os.path.getsize(path) > self.max_bytes:
+                os.replace(path, path + ".1")
+            # One short O_APPEND write per line, so lines from several workers don't interleave.
+            with open(path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print(f"[perf] could not write {path}: {e}")
@@ -14,7 +14,7 @@ class AnswerInline(admin.TabularInline):
 class TopicInline(admin.StackedInline):
     model = Topic
     extra = 0
-    fields = ['name', 'goal', 'order', 'analyze_sentiment']
+    fields = ['name', 'goal', 'order', 'analyze_sentiment', 'classifier']
     ordering = ['order']
     show_change_link = True
 
@@ -22,7 +22,7 @@ class TopicInline(admin.StackedInline):
 @admin.register(Interview)
 class InterviewAdmin(admin.ModelAdmin):
     list_display = ['name', 'is_open', 'created_at']
-    fields = ['name', 'intro_message', 'is_open']
+    fields = ['name', 'intro_message', 'is_open', 'llm_routes']
     inlines = [TopicInline]
 
 
@@ -31,7 +31,7 @@ class TopicAdmin(admin.ModelAdmin):
     list_display = ['name', 'interview', 'order', 'analyze_sentiment']
     list_editable = ['order', 'analyze_sentiment']
     list_filter = ['interview']
-    fields = ['interview', 'name', 'goal', 'order', 'analyze_sentiment']
+    fields = ['interview', 'name', 'goal', 'order', 'analyze_sentiment', 'classifier']
     inlines = [AnswerInline]
 
 
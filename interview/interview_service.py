@@ -1,6 +1,4 @@
-import json
-
-from results.llm import generate
+from results.llm import LLMResponseError, generate, parse_json
 
 
 def analyze_message(user_message, chat_history, topics):
@@ -40,10 +38,10 @@ Respond with ONLY valid JSON:
         schema="\n".join(schema_parts),
     )
 
-    raw = generate(system_prompt, f"Analyze this conversation:\n\n{conversation_context}", json_mode=True)
+    raw = generate(system_prompt, f"Analyze this conversation:\n\n{conversation_context}", json_mode=True, task="analyzer")
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
+        return parse_json(raw)
+    except LLMResponseError:
         return {str(t.pk): {"covered": False, "text": None} for t in topics}
 
 
@@ -82,7 +80,7 @@ INSTRUCTIONS:
 
 Just respond naturally as the interviewer. No JSON, no special formatting."""
 
-    return generate(system_prompt, user_message, history=chat_history)
+    return generate(system_prompt, user_message, history=chat_history, task="interviewer")
 
 
 def generate_opening_question(topics):
@@ -94,7 +92,7 @@ def generate_opening_question(topics):
 Ask a simple, conversational opening question about {first_topic}.
 One sentence only. Ask just how they're feeling — do NOT ask why or for reasons yet."""
 
-    return generate(system_prompt, "Begin the interview.")
+    return generate(system_prompt, "Begin the interview.", task="opening")
 
 
 def conduct_interview(user_message, chat_history, previously_covered_topic_ids, interview=None):
@@ -1,5 +1,6 @@
 import csv
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
 
 from interview.models import Answer, Topic, InterviewSession
@@ -24,6 +25,11 @@ class Command(BaseCommand):
             action="store_true",
             help="Print what would be imported without writing to the database",
         )
+        parser.add_argument(
+            "--embed",
+            action="store_true",
+            help="Compute answer embeddings after importing (default: only when EMBED_NEW_ANSWERS=1)",
+        )
 
     def handle(self, *args, **options):
         csv_path = options["csv"]
@@ -57,3 +63,14 @@ class Command(BaseCommand):
             imported += 1
 
         self.stdout.write(self.style.SUCCESS(f"Imported {imported} answers."))
+
+        if not (options["embed"] or settings.EMBED_NEW_ANSWERS):
+            return
+
+        from results.vectors import embed_answers
+
+        try:
+            embedded = embed_answers(Answer.objects.filter(topic=topic))
+            self.stdout.write(f"Embedded {embedded} answers.")
+        except Exception as e:
+            self.stderr.write(f"Skipped embeddings ({e}); run backfill_embeddings later.")
@@ -0,0 +1,65 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from interview.synthetic import CHUNK, TOPIC_NAMES, generate_interview
+
+
+class Command(BaseCommand):
+    help = "Generate synthetic interviews, sessions and answers (optionally with completed results) for testing"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interviews", type=int, default=1, help="Number of interviews to create")
+        parser.add_argument("--topics", type=int, default=2, help=f"Topics per interview (max {len(TOPIC_NAMES)} distinct names)")
+        parser.add_argument("--sessions", type=int, default=50, help="Completed sessions per interview")
+        parser.add_argument(
+            "--answer-rate",
+            type=float,
+            default=1.0,
+            help="Probability that a session answered a given topic",
+        )
+        parser.add_argument("--days", type=int, default=0, help="Spread timestamps over the last N days")
+        parser.add_argument("--with-results", action="store_true", help="Also store completed results with themes and sentiment")
+        parser.add_argument("--chunk", type=int, default=CHUNK, help="Rows per bulk INSERT")
+        parser.add_argument("--seed", type=int, default=None, help="Random seed, for reproducible data")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Print what would be created without writing to the database",
+        )
+
+    def handle(self, *args, **options):
+        if options["topics"] < 1 or options["sessions"] < 0 or not 0 < options["answer_rate"] <= 1:
+            raise CommandError("--topics must be >= 1, --sessions >= 0 and --answer-rate in (0, 1]")
+
+        n, topics, sessions = options["interviews"], options["topics"], options["sessions"]
+        expected = round(n * topics * sessions * options["answer_rate"])
+        self.stdout.write(
+            f"{'Would create' if options['dry_run'] else 'Creating'} {n} interview(s) x {topics} topics x "
+            f"{sessions} sessions (~{expected} answers){' with results' if options['with_results'] else ''}."
+        )
+        if options["dry_run"]:
+            return
+
+        rng = random.Random(options["seed"])
+        start = time.monotonic()
+        for i in range(n):
+            interview = generate_interview(
+                f"Synthetic interview {i + 1}",
+                topics,
+                sessions,
+                rng=rng,
+                answer_rate=options["answer_rate"],
+                days=options["days"],
+                with_results=options["with_results"],
+                chunk=options["chunk"],
+                log=self.stdout.write,
+            )
+            self.stdout.write(f"Created interview {interview.uuid} ({i + 1}/{n})")
+
+        seconds = time.monotonic() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {n} interview(s) with ~{expected} answers in {seconds:.1f}s "
+            f"({expected / seconds if seconds else 0:.0f} answers/s)."
+        ))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.11 on 2026-10-19 10:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview', '0016_rename_respondent_to_interviewsession'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='topic',
+            name='classifier',
+            field=models.CharField(choices=[('llm', 'LLM'), ('embedding', 'Embeddings, LLM for uncertain answers')], default='llm', help_text='How answers are assigned to themes. Embeddings are much faster and cheaper; only answers they are unsure about are sent to the LLM.', max_length=20),
+        ),
+    ]
@@ -0,0 +1,66 @@
+"""
+Full-text index over Answer.text.
+
+SQLite: an external-content FTS5 table kept in sync by triggers, so rows
+created through the ORM, bulk_create or raw SQL are all indexed.
+PostgreSQL: a GIN index on to_tsvector('simple', text).
+
+Note: on SQLite, a migration that rebuilds interview_answer (e.g. altering
+one of its columns) drops these triggers; run `manage.py rebuild_search_index`
+afterwards.
+"""
+
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS interview_answer_fts USING fts5(
+        text, content='interview_answer', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS interview_answer_fts_ai AFTER INSERT ON interview_answer BEGIN
+        INSERT INTO interview_answer_fts(rowid, text) VALUES (new.id, new.text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS interview_answer_fts_ad AFTER DELETE ON interview_answer BEGIN
+        INSERT INTO interview_answer_fts(interview_answer_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS interview_answer_fts_au AFTER UPDATE OF text ON interview_answer BEGIN
+        INSERT INTO interview_answer_fts(interview_answer_fts, rowid, text) VALUES ('delete', old.id, old.text);
+        INSERT INTO interview_answer_fts(rowid, text) VALUES (new.id, new.text);
+    END""",
+    "INSERT INTO interview_answer_fts(interview_answer_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS interview_answer_fts_ai",
+    "DROP TRIGGER IF EXISTS interview_answer_fts_ad",
+    "DROP TRIGGER IF EXISTS interview_answer_fts_au",
+    "DROP TABLE IF EXISTS interview_answer_fts",
+]
+
+POSTGRES_FORWARD = [
+    "CREATE INDEX IF NOT EXISTS interview_answer_text_fts ON interview_answer USING gin (to_tsvector('simple', text))",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS interview_answer_text_fts",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for sql in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview', '0017_topic_classifier'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            _run({'sqlite': SQLITE_REVERSE, 'postgresql': POSTGRES_REVERSE}),
+        ),
+    ]
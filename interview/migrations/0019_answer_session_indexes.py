@@ -0,0 +1,21 @@
+# Generated by Django 5.2.11 on 2026-10-19 10:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview', '0018_answer_fulltext_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='answer',
+            index=models.Index(fields=['topic', 'created_at'], name='interview_a_topic_i_29f074_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interviewsession',
+            index=models.Index(fields=['interview', 'created_at'], name='interview_i_intervi_a92fe5_idx'),
+        ),
+    ]
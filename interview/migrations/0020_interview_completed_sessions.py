@@ -0,0 +1,25 @@
+# Generated by Django 5.2.11 on 2026-10-19 10:54
+
+from django.db import migrations, models
+
+
+def count_sessions(apps, schema_editor):
+    Interview = apps.get_model('interview', 'Interview')
+    for interview in Interview.objects.annotate(n=models.Count('sessions')):
+        Interview.objects.filter(pk=interview.pk).update(completed_sessions=interview.n)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview', '0019_answer_session_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interview',
+            name='completed_sessions',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_sessions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.11 on 2026-10-19 11:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview', '0020_interview_completed_sessions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interview',
+            name='llm_routes',
+            field=models.JSONField(blank=True, default=dict, help_text='Provider and model per LLM task for this interview, overriding settings.LLM_ROUTES, e.g. {"analyzer": {"provider": "local"}, "summary": {"provider": "anthropic"}}. An entry may add a "fallback" entry for failover and hedging. Tasks: analyzer, interviewer, opening, discover, classify, sentiment, summary, chat, or "default".'),
+        ),
+    ]
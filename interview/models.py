@@ -1,6 +1,9 @@
 import uuid
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+
+from results import events
 
 
 class Interview(models.Model):
@@ -13,10 +16,41 @@ class Interview(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     is_open = models.BooleanField(default=True)
+    # Denormalized count of sessions, kept up to date by InterviewSession.save()
+    # so the tracking page never has to COUNT(*) the sessions table.
+    completed_sessions = models.PositiveIntegerField(default=0, editable=False)
+    llm_routes = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text=(
+            'Provider and model per LLM task for this interview, overriding settings.LLM_ROUTES, e.g. '
+            '{"analyzer": {"provider": "local"}, "summary": {"provider": "anthropic"}}. '
+            'An entry may add a "fallback" entry for failover and hedging. '
+            'Tasks: analyzer, interviewer, opening, discover, classify, sentiment, summary, chat, or "default".'
+        ),
+    )
 
     def __str__(self):
         return self.name
 
+    def clean(self):
+        from django.core.exceptions import ValidationError
+
+        from results.llm import TASKS
+        from results.providers import provider_names
+
+        if not isinstance(self.llm_routes, dict):
+            raise ValidationError({'llm_routes': 'Must be an object keyed by task.'})
+        known = provider_names()
+        for task, entry in self.llm_routes.items():
+            if task not in TASKS and task != 'default':
+                raise ValidationError({'llm_routes': f'Unknown task "{task}".'})
+            if not isinstance(entry, dict) or entry.get('provider') not in known:
+                raise ValidationError({'llm_routes': f'"{task}" needs a provider, one of: {", ".join(known)}.'})
+            fallback = entry.get('fallback')
+            if fallback is not None and (not isinstance(fallback, dict) or fallback.get('provider') not in known):
+                raise ValidationError({'llm_routes': f'"{task}" fallback needs a provider, one of: {", ".join(known)}.'})
+
 
 class InterviewSession(models.Model):
     interview = models.ForeignKey(
@@ -24,9 +58,22 @@ class InterviewSession(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['interview', 'created_at'])]
+
     def __str__(self):
         return f"Session {self.id}"
 
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding and self.interview_id:
+                Interview.objects.filter(pk=self.interview_id).update(
+                    completed_sessions=F('completed_sessions') + 1
+                )
+                events.publish(f"interview-{self.interview_id}")
+
 
 class Topic(models.Model):
     interview = models.ForeignKey(Interview, on_delete=models.CASCADE, related_name='topics')
@@ -41,6 +88,18 @@ class Topic(models.Model):
     )
     order = models.PositiveIntegerField(default=0)
     analyze_sentiment = models.BooleanField(default=True)
+    classifier = models.CharField(
+        max_length=20,
+        choices=[
+            ('llm', 'LLM'),
+            ('embedding', 'Embeddings, LLM for uncertain answers'),
+        ],
+        default='llm',
+        help_text=(
+            "How answers are assigned to themes. Embeddings are much faster and cheaper; "
+            "only answers they are unsure about are sent to the LLM."
+        ),
+    )
 
     class Meta:
         ordering = ['order']
@@ -57,6 +116,8 @@ class Answer(models.Model):
 
     class Meta:
         unique_together = [('topic', 'session')]
+        # Lookups by session alone use the session FK's own index.
+        indexes = [models.Index(fields=['topic', 'created_at'])]
 
     def __str__(self):
         return f"Answer to: {self.topic}"
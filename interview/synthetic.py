@@ -1,9 +1,58 @@
-from django.core.management.base import BaseCommand
+"""
+Synthetic interview data for development and performance testing.
 
-from interview.models import Answer, Topic, InterviewSession
+generate_interview() creates one interview with its topics, sessions and
+answers using bulk_create in chunks, so multi-million-row databases can be
+filled quickly; see `manage.py seed_synthetic`. Answer texts are assembled
+from the sentences of a hand-written productivity check-in (RESPONSES), with
+lengths drawn from a log-normal distribution plus a share of one-word
+replies, which is roughly what real free-text answers look like.
+Optionally each topic gets a pre-baked completed Result with themes,
+excerpts, sentiment and a summary, without any LLM calls.
+"""
 
-MAIN_QUESTION = "How productive were you feeling at work this week?"
-FOLLOWUP_QUESTION = "What was making you feel productive (or not productive) this week?"
+import math
+import random
+import re
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case, F, OuterRef, Subquery, Value, When
+from django.utils import timezone
+
+from interview.models import Answer, Interview, InterviewSession, Topic
+
+CHUNK = 5000
+
+# Answer length in characters ~ LogNormal(log(MEDIAN_CHARS), LENGTH_SIGMA),
+# clipped to MAX_CHARS; SHORT_SHARE of answers are a few words instead.
+MEDIAN_CHARS = 140
+LENGTH_SIGMA = 0.9
+MAX_CHARS = 3000
+SHORT_SHARE = 0.08
+
+TOPIC_NAMES = [
+    "How productive were you feeling at work this week?",
+    "What was making you feel productive (or not productive) this week?",
+    "How is your workload at the moment?",
+    "How well is your team working together?",
+    "Which tools or processes slow you down?",
+    "How are you feeling about your growth here?",
+    "What would you change about how meetings are run?",
+    "How supported do you feel by your manager?",
+]
+
+SHORT_ANSWERS = ["Fine.", "Not really.", "Good.", "Same as last week.", "No comment.", "Pretty busy.", "Okay I guess."]
+
+THEMES = [
+    ("Meetings", "Too many or too long meetings taking time from focused work."),
+    ("Focus time", "Having (or lacking) uninterrupted time for deep work."),
+    ("Workload", "The amount of work and pressure from deadlines or overtime."),
+    ("Tools", "Internal tools and systems helping or slowing people down."),
+    ("Team dynamics", "Collaboration, communication and atmosphere in the team."),
+    ("Wellbeing", "Energy, sleep, exercise and personal circumstances."),
+    ("Priorities", "Clarity of goals and shifting priorities."),
+]
 
 # 50 pairs of (main answer, follow-up answer)
 RESPONSES = [
@@ -210,49 +259,112 @@ RESPONSES = [
 ]
 
 
-class Command(BaseCommand):
-    help = "Seed 50 fake productivity responses for two interview questions"
+_SENTENCES = [s for pair in RESPONSES for text in pair for s in re.split(r"(?<=[.!?])\s+", text) if s]
 
-    def add_arguments(self, parser):
-        parser.add_argument(
-            "--dry-run",
-            action="store_true",
-            help="Print what would be created without writing to the database",
-        )
 
-    def handle(self, *args, **options):
-        dry_run = options["dry_run"]
+def synthetic_answer(rng):
+    """A free-text answer with a realistic length."""
+    if rng.random() < SHORT_SHARE:
+        return rng.choice(SHORT_ANSWERS)
+    target = min(MAX_CHARS, int(rng.lognormvariate(math.log(MEDIAN_CHARS), LENGTH_SIGMA)))
+    parts = [rng.choice(_SENTENCES)]
+    length = len(parts[0])
+    while length < target:
+        parts.append(rng.choice(_SENTENCES))
+        length += len(parts[-1]) + 1
+    return " ".join(parts)
 
-        if dry_run:
-            self.stdout.write(f"Would create Topic: '{MAIN_QUESTION}'")
-            self.stdout.write(f"Would create Topic: '{FOLLOWUP_QUESTION}'")
-            self.stdout.write(f"Would create {len(RESPONSES)} respondents with answers for each question.")
-            for i, (main, followup) in enumerate(RESPONSES[:3], 1):
-                self.stdout.write(f"\n  Respondent {i}:")
-                self.stdout.write(f"    Q1: {main[:80]}")
-                self.stdout.write(f"    Q2: {followup[:80]}")
-            self.stdout.write("  ...")
-            return
 
-        main_topic, created = Topic.objects.get_or_create(text=MAIN_QUESTION)
-        self.stdout.write(
-            f"{'Created' if created else 'Using existing'} Topic (id={main_topic.pk}): {MAIN_QUESTION}"
-        )
+def generate_interview(name, topics, sessions, rng=None, answer_rate=1.0, days=0, with_results=False,
+                       chunk=CHUNK, log=None):
+    """
+    Create an interview with `topics` topics and `sessions` completed sessions.
 
-        followup_topic, created = Topic.objects.get_or_create(text=FOLLOWUP_QUESTION)
-        self.stdout.write(
-            f"{'Created' if created else 'Using existing'} Topic (id={followup_topic.pk}): {FOLLOWUP_QUESTION}"
-        )
+    Each session answers each topic with probability answer_rate. With days,
+    session and answer timestamps are spread over the last `days` days. With with_results, every topic gets a
+    completed Result (see bake_result). log(message) is called after each
+    chunk. Returns the Interview.
+    """
+    rng = rng or random.Random()
+    log = log or (lambda message: None)
+    interview = Interview.objects.create(name=name, is_open=not with_results)
+    topic_objs = Topic.objects.bulk_create([
+        Topic(interview=interview, name=TOPIC_NAMES[i % len(TOPIC_NAMES)], order=i) for i in range(topics)
+    ])
+    now = timezone.now()
 
-        for main_text, followup_text in RESPONSES:
-            session = InterviewSession.objects.create()
-            Answer.objects.create(topic=main_topic, session=session, text=main_text)
-            Answer.objects.create(topic=followup_topic, session=session, text=followup_text)
-
-        self.stdout.write(
-            self.style.SUCCESS(
-                f"Created {len(RESPONSES)} respondents, "
-                f"{len(RESPONSES)} answers for '{MAIN_QUESTION}', "
-                f"{len(RESPONSES)} answers for '{FOLLOWUP_QUESTION}'."
+    for lo in range(0, sessions, chunk):
+        size = min(chunk, sessions - lo)
+        stamps = [now - timedelta(seconds=rng.randrange(days * 86400)) if days else now for _ in range(size)]
+        with transaction.atomic():
+            batch = InterviewSession.objects.bulk_create([InterviewSession(interview=interview) for _ in stamps])
+            # bulk_create bypasses InterviewSession.save(), which maintains this counter.
+            Interview.objects.filter(pk=interview.pk).update(
+                completed_sessions=F('completed_sessions') + len(batch)
             )
-        )
+            Answer.objects.bulk_create([
+                Answer(topic=t, session=s, text=synthetic_answer(rng))
+                for s in batch for t in topic_objs
+                if answer_rate >= 1 or rng.random() < answer_rate
+            ], batch_size=chunk)
+            if days:
+                _backdate(batch, stamps)
+        log(f"  {min(lo + chunk, sessions)}/{sessions} sessions")
+
+    if with_results:
+        for topic in topic_objs:
+            bake_result(topic, rng)
+    return interview
+
+
+def _backdate(sessions, stamps):
+    """
+    Set the sessions' created_at to stamps, and their answers' to match.
+    created_at is auto_now_add, so bulk_create always stores now().
+    """
+    InterviewSession.objects.filter(pk__in=[s.pk for s in sessions]).update(
+        created_at=Case(*[When(pk=s.pk, then=Value(stamp)) for s, stamp in zip(sessions, stamps)])
+    )
+    Answer.objects.filter(session__in=sessions).update(
+        created_at=Subquery(InterviewSession.objects.filter(pk=OuterRef('session_id')).values('created_at')[:1])
+    )
+
+
+def bake_result(topic, rng):
+    """Store a completed Result for topic with random themes, excerpts and sentiment over its answers."""
+    from results.models import Result
+
+    themes = [
+        {"name": name, "description": description, "answer_ids": [], "excerpts": {}}
+        for name, description in rng.sample(THEMES, k=min(len(THEMES), rng.randint(4, 6)))
+    ]
+    other = {
+        "name": "Other",
+        "description": "Answers that did not clearly fit into any of the identified themes.",
+        "answer_ids": [],
+        "excerpts": {},
+    }
+    scores = []
+    answers = Answer.objects.filter(topic=topic).order_by('id').values_list('id', 'text')
+    for aid, text in answers.iterator(chunk_size=CHUNK):
+        picked = rng.sample(themes, k=rng.choice([0, 1, 1, 1, 2]))
+        for theme in picked:
+            theme["answer_ids"].append(aid)
+            theme["excerpts"][str(aid)] = " ".join(text.split()[:8])
+        if not picked:
+            other["answer_ids"].append(aid)
+        scores.append({"id": aid, "score": rng.randint(1, 10)})
+    themes = [t for t in themes if t["answer_ids"]] + ([other] if other["answer_ids"] else [])
+
+    Result.objects.update_or_create(topic=topic, defaults={
+        "themes": themes,
+        "proposed_themes": [{"name": t["name"], "description": t["description"]} for t in themes if t is not other],
+        "sentiment": {
+            "average": round(sum(s["score"] for s in scores) / len(scores), 1) if scores else None,
+            "answers": scores,
+        },
+        "summary": "Synthetic results: respondents mention " + ", ".join(t["name"].lower() for t in themes[:3]) + ".",
+        "answer_count": len(scores),
+        "analyzed_at": timezone.now(),
+        "status": "completed",
+    })
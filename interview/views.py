@@ -1,9 +1,11 @@
 import json
 
+from django.conf import settings
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views.decorators.http import require_http_methods
 
+from results import llm
 from .models import Topic, Answer, InterviewSession, Interview
 from .interview_service import conduct_interview, generate_opening_question
 
@@ -38,7 +40,8 @@ def interview_topics_api(request, interview_id):
 def interview_opening_api(request, interview_id):
     interview = get_object_or_404(Interview, uuid=interview_id)
     topics = list(Topic.objects.filter(interview=interview))
-    question = generate_opening_question(topics)
+    with llm.attribute(interview.id, interview.llm_routes):
+        question = generate_opening_question(topics)
     return JsonResponse({'question': question})
 
 
@@ -54,7 +57,8 @@ def interview_chat_api(request, interview_id):
             return JsonResponse({'error': 'Message is required'}, status=400)
 
         interview = get_object_or_404(Interview, uuid=interview_id)
-        result = conduct_interview(user_message, chat_history, covered_topics, interview=interview)
+        with llm.attribute(interview.id, interview.llm_routes):
+            result = conduct_interview(user_message, chat_history, covered_topics, interview=interview)
 
         newly_covered = [t for t in result['covered_topics'] if t not in covered_topics]
         topic_responses = result.get('topic_responses', {})
@@ -69,9 +73,13 @@ def interview_chat_api(request, interview_id):
 
         if result['interview_complete']:
             session = InterviewSession.objects.create(interview=interview)
+            answer_ids = []
             for topic_id_str, answer_text in buffered.items():
                 topic_obj = Topic.objects.get(pk=int(topic_id_str))
-                Answer.objects.create(topic=topic_obj, session=session, text=answer_text)
+                answer_ids.append(Answer.objects.create(topic=topic_obj, session=session, text=answer_text).id)
+            if settings.EMBED_NEW_ANSWERS:
+                from results.vectors import embed_answers_in_background
+                embed_answers_in_background(answer_ids)
             del request.session[buffer_key]
             request.session.modified = True
 
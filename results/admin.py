@@ -1,10 +1,103 @@
+from collections import defaultdict
+from datetime import timedelta
+
 from django.contrib import admin
+from django.template.response import TemplateResponse
+from django.urls import path
+from django.utils import timezone
+
+from interview.models import Interview
 
-from .models import Result
+from . import circuit
+from .models import LLMBatch, LLMCall, Result
 
 
 @admin.register(Result)
 class ResultAdmin(admin.ModelAdmin):
-    list_display = ['topic', 'status', 'answer_count', 'analyzed_at']
+    list_display = ['topic', 'status', 'answer_count', 'analyzed_at', 'owner', 'heartbeat_at']
     list_filter = ['status']
-    readonly_fields = ['analyzed_at']
+    readonly_fields = ['analyzed_at', 'owner', 'heartbeat_at']
+
+
+@admin.register(LLMBatch)
+class LLMBatchAdmin(admin.ModelAdmin):
+    list_display = ['created_at', 'interview', 'provider', 'model', 'external_id', 'status', 'completed_at']
+    list_filter = ['status', 'provider']
+    list_select_related = ['interview']
+    readonly_fields = ['completed_at']
+    exclude = ['outputs']
+
+
+def _percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else None
+
+
+def _summarize(calls):
+    latencies = [c['latency_ms'] for c in calls]
+    return {
+        'calls': len(calls),
+        'errors': sum(1 for c in calls if c['error']),
+        'p50_ms': _percentile(latencies, 0.5),
+        'p95_ms': _percentile(latencies, 0.95),
+        'input_tokens': sum(c['input_tokens'] for c in calls),
+        'cached_tokens': sum(c['cached_tokens'] for c in calls),
+        'output_tokens': sum(c['output_tokens'] for c in calls),
+        'cost_usd': sum(c['cost_usd'] for c in calls),
+        'hedged': sum(1 for c in calls if c['role'] == 'primary'),
+        'hedge_wins': sum(1 for c in calls if c['role'] == 'hedge' and not c['discarded'] and not c['error']),
+        'failovers': sum(1 for c in calls if c['role'] == 'failover'),
+    }
+
+
+@admin.register(LLMCall)
+class LLMCallAdmin(admin.ModelAdmin):
+    list_display = ['created_at', 'interview', 'task', 'provider', 'model', 'role', 'latency_ms', 'input_tokens', 'output_tokens', 'cost_usd', 'retries', 'error']
+    list_filter = ['provider', 'model', 'task', 'role']
+    date_hierarchy = 'created_at'
+    list_select_related = ['interview']
+    change_list_template = 'admin/results/llmcall/change_list.html'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path('report/', self.admin_site.admin_view(self.report_view), name='results_llmcall_report'),
+        ] + super().get_urls()
+
+    def report_view(self, request):
+        """p50/p95 latency, tokens, cost and hedging per interview and per task over the last ?days= days."""
+        try:
+            days = max(int(request.GET.get('days', 30)), 1)
+        except ValueError:
+            days = 30
+        calls = LLMCall.objects.filter(created_at__gte=timezone.now() - timedelta(days=days)).values(
+            'interview_id', 'task', 'latency_ms', 'input_tokens', 'cached_tokens', 'output_tokens', 'cost_usd', 'error',
+            'role', 'discarded',
+        )
+        by_interview, by_task = defaultdict(list), defaultdict(list)
+        for call in calls.iterator():
+            by_interview[call['interview_id']].append(call)
+            by_task[call['task'] or '—'].append(call)
+
+        names = dict(Interview.objects.filter(id__in=[i for i in by_interview if i]).values_list('id', 'name'))
+        interviews = sorted(
+            ({'name': names.get(i, 'Unattributed'), **_summarize(rows)} for i, rows in by_interview.items()),
+            key=lambda row: -row['cost_usd'],
+        )
+        tasks = sorted(({'name': t, **_summarize(rows)} for t, rows in by_task.items()), key=lambda row: -row['calls'])
+
+        return TemplateResponse(request, 'admin/results/llmcall/report.html', {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': f'LLM calls — last {days} days',
+            'days': days,
+            'interviews': interviews,
+            'tasks': tasks,
+            'total': _summarize([row for rows in by_task.values() for row in rows]),
+            'circuits': circuit.states(),
+        })
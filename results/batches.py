@@ -0,0 +1,433 @@
+"""
+Provider batch APIs for post-close analysis.
+
+With settings.LLM_BATCH_MODE on, closing an interview still discovers each
+topic's themes and writes its summary straight away, but every classification
+and sentiment request is submitted through the provider's batch API (OpenAI
+Batch, Anthropic Message Batches) instead: billed at llm.BATCH_DISCOUNT of
+the interactive price and outside the interactive rate limits, in exchange
+for results within the provider's completion window rather than seconds.
+Requests become one or more LLMBatch rows per provider and model the two
+tasks are routed to.
+
+The topics wait in status "batched". `manage.py poll_llm_batches` polls the
+providers, stores each finished batch's outputs, and once all of an
+interview's batches are done merges them into each Result through the
+classification checkpoint, so any request that failed or came back
+unparseable is simply re-run interactively before the topic completes. A
+batch the provider failed, expired or cancelled, or that could not be
+submitted or polled at all, is marked "failed" and merged the same way, with
+all of its missing requests re-run interactively. Pollers claim batches with
+conditional updates, so overlapping runs store and merge each batch once.
+
+Batch backends are classes registered with @batch_backend under a provider
+backend name, like results.providers' interactive backends. "stub" answers
+with results.stub when polled; "openai" works against any server with the
+Files and Batches endpoints, such as benchmarks.batch_server.
+"""
+
+import json
+import os
+import tempfile
+import time
+import traceback
+import uuid
+from collections import defaultdict
+
+from django.utils import timezone
+
+from interview.models import Answer, Interview, Topic
+from results import llm, providers
+from results.jobs import keep_alive, start_job
+from results.models import LLMBatch, Result
+from results.services import (
+    CLASSIFY_SCHEMA, classify_system_prompt, classify_user_prompt, discover_themes_only, generate_summary, parse_assignments,
+    plan_classify_batches, record_progress, resumable_themes, run_classification_with_themes,
+    run_sentiment_analysis, sentiment_prompts, sentiment_result, themes_key,
+)
+
+POLL_INTERVAL = 60          # seconds between polls in `manage.py poll_llm_batches`
+COMPLETION_WINDOW = "24h"
+MAX_BATCH_REQUESTS = 10000  # requests per provider batch, well under the OpenAI and Anthropic limits
+FINISHED = ('completed', 'failed')  # LLMBatch statuses waiting to be merged
+GIVE_UP_AFTER = 26 * 3600   # seconds after submission to stop polling a batch that keeps erroring, and fail it
+
+_batch_backends = {}
+
+
+class BatchRequestError(RuntimeError):
+    """A request the provider's batch answered with an error, as recorded on LLMCall."""
+
+
+def batch_backend(name):
+    """Register the decorated class as the batch backend for provider backend name."""
+    def register(cls):
+        _batch_backends[name] = cls
+        return cls
+    return register
+
+
+def _backend(provider, model):
+    config = providers.provider_config(provider)
+    config["model"] = model
+    name = "stub" if providers.SIMULATE else config["backend"]
+    return _batch_backends[name](config)
+
+
+def supported(provider):
+    """Whether provider has a batch API here."""
+    return providers.SIMULATE or providers.provider_config(provider)["backend"] in _batch_backends
+
+
+def submit_interview(interview):
+    """
+    Discover themes and write the summary for each topic of a closed
+    interview, then submit its classification and sentiment requests as
+    provider batches and leave the topics "batched". Returns the LLMBatch
+    rows, or None, having done nothing, if the classify or sentiment route
+    has no batch API. Call inside llm.attribute() for the interview.
+    """
+    targets = {task: llm.route(task) for task in ("classify", "sentiment")}
+    unsupported = sorted({provider for provider, _ in targets.values() if not supported(provider)})
+    if unsupported:
+        print(f"[batch] no batch API for {', '.join(unsupported)} — analysing interactively")
+        return None
+
+    requests = defaultdict(list)
+    prepared = []
+    for topic in Topic.objects.filter(interview=interview).order_by('order'):
+        answers = list(Answer.objects.filter(topic=topic).values('id', 'text'))
+        if not answers:
+            continue
+        result, _ = Result.objects.get_or_create(topic=topic)
+        start_job(result, 'running')
+        try:
+            with keep_alive(result):
+                for request in _prepare_topic(topic, result, answers):
+                    requests[targets[request["task"]]].append(request)
+        except Exception as e:
+            print(f"[error] batch preparation for topic {topic.id}: {e}")
+            traceback.print_exc()
+            result.status = 'failed'
+            result.save()
+            continue
+        prepared.append((result, len(answers)))
+
+    created = []
+    for (provider, model), items in requests.items():
+        for start in range(0, len(items), MAX_BATCH_REQUESTS):
+            chunk = items[start:start + MAX_BATCH_REQUESTS]
+            batch = LLMBatch(
+                interview=interview, provider=provider, model=model,
+                requests={r["custom_id"]: r["meta"] for r in chunk},
+            )
+            try:
+                batch.external_id = _backend(provider, model).submit(chunk)
+                print(f"[batch] submitted {len(chunk)} requests to {provider}/{model} as {batch.external_id}")
+            except Exception as e:
+                # Nothing comes back from this batch, so merging re-runs its requests interactively.
+                print(f"[error] submitting batch to {provider}/{model}: {e}")
+                batch.status = 'failed'
+                batch.completed_at = timezone.now()
+                batch.error = f"{type(e).__name__}: {e}"[:2000]
+            batch.save()
+            created.append(batch)
+
+    for result, answer_count in prepared:
+        result.status = 'batched'
+        result.save()
+        record_progress(result, 'batched', answers_total=answer_count)
+    merge_ready(interview.id)
+    return created
+
+
+def _prepare_topic(topic, result, answers):
+    """Discovery and summary for one topic; returns its batch requests."""
+    proposed = resumable_themes(result)
+    if proposed is None:
+        record_progress(result, 'discovering')
+        proposed = discover_themes_only(topic)
+        result.proposed_themes = proposed
+        result.checkpoint = {"themes_key": themes_key(proposed), "assignments": {}}
+    record_progress(result, 'summary')
+    result.summary = generate_summary(topic)
+    result.save()
+
+    requests = []
+    if proposed:
+        done = result.checkpoint["assignments"]
+        system_prompt = classify_system_prompt(proposed)
+        pending = [a for a in answers if str(a["id"]) not in done]
+        for n, planned in enumerate(plan_classify_batches(pending, system_prompt), 1):
+            requests.append({
+                "custom_id": f"topic{topic.id}-classify-{n}",
+                "task": "classify",
+                "json_mode": CLASSIFY_SCHEMA,
+                "system_prompt": system_prompt,
+                "user_prompt": classify_user_prompt(planned["items"]),
+                "meta": {"topic_id": topic.id, "kind": "classify", "answer_ids": [a["id"] for a in planned["items"]]},
+            })
+    if topic.analyze_sentiment:
+        system_prompt, user_prompt = sentiment_prompts(answers)
+        requests.append({
+            "custom_id": f"topic{topic.id}-sentiment",
+            "task": "sentiment",
+            "json_mode": True,
+            "system_prompt": system_prompt,
+            "user_prompt": user_prompt,
+            "meta": {"topic_id": topic.id, "kind": "sentiment"},
+        })
+    return requests
+
+
+def poll():
+    """
+    Check every submitted batch once, store the outputs of finished ones and
+    merge the interviews that have no batches left running. Returns the
+    number of batches that finished.
+    """
+    finished = 0
+    for batch in LLMBatch.objects.filter(status='submitted').order_by('created_at'):
+        try:
+            done = _backend(batch.provider, batch.model).results(batch.external_id)
+        except Exception as e:
+            print(f"[batch] polling {batch}: {type(e).__name__}: {e}")
+            if (timezone.now() - batch.created_at).total_seconds() < GIVE_UP_AFTER:
+                continue
+            done = {}, f"gave up polling: {type(e).__name__}: {e}"[:2000]
+        if done is None:
+            continue
+        outputs, error = done
+        status = 'failed' if error else 'completed'
+        now = timezone.now()
+        # Only the poller that moves the batch out of "submitted" records it.
+        if not LLMBatch.objects.filter(pk=batch.pk, status='submitted').update(
+            outputs=outputs, error=error, status=status, completed_at=now,
+        ):
+            continue
+        batch.outputs, batch.error, batch.status, batch.completed_at = outputs, error, status, now
+        _record_calls(batch)
+        failed = sum(1 for output in outputs.values() if "error" in output)
+        missing = len(batch.requests) - len(outputs)
+        print(f"[batch] {batch} finished: {len(outputs) - failed} answered, {failed} failed, {missing} missing {error}".rstrip())
+        finished += 1
+
+    interview_ids = LLMBatch.objects.filter(status__in=FINISHED).values_list('interview_id', flat=True).distinct()
+    for interview_id in list(interview_ids):
+        merge_ready(interview_id)
+    return finished
+
+
+def _record_calls(batch):
+    """Record each request of a finished batch as an LLMCall, timed from submission."""
+    elapsed = (batch.completed_at - batch.created_at).total_seconds()
+    with llm.attribute(batch.interview_id, routes={}):
+        for custom_id, output in batch.outputs.items():
+            task = batch.requests.get(custom_id, {}).get("kind", "")
+            error = BatchRequestError(output["error"]) if "error" in output else None
+            llm._record_call(
+                batch.provider, batch.model, task, time.monotonic() - elapsed, 0, 0,
+                usage=output.get("usage"), error=error, role="batch",
+            )
+
+
+def merge_ready(interview_id):
+    """
+    Complete the interview's "batched" topics from its finished batches,
+    unless some are still running or another poller is merging them.
+    """
+    if LLMBatch.objects.filter(interview_id=interview_id, status__in=('submitted', 'merging')).exists():
+        return
+    batches = list(LLMBatch.objects.filter(interview_id=interview_id, status__in=FINISHED))
+    claimed = []
+    for batch in batches:
+        if not LLMBatch.objects.filter(pk=batch.pk, status=batch.status).update(status='merging'):
+            # Another poller is merging this interview; hand back what we took and leave it to them.
+            for taken in claimed:
+                LLMBatch.objects.filter(pk=taken.pk).update(status=taken.status)
+            return
+        claimed.append(batch)
+    outputs, requests = {}, {}
+    for batch in batches:
+        outputs.update(batch.outputs)
+        requests.update(batch.requests)
+
+    interview = Interview.objects.get(pk=interview_id)
+    with llm.attribute(interview.id, interview.llm_routes):
+        for result in Result.objects.filter(topic__interview=interview, status='batched').select_related('topic'):
+            start_job(result, 'classifying')
+            try:
+                with keep_alive(result):
+                    _finish_topic(result.topic, result, outputs, requests)
+            except Exception as e:
+                print(f"[error] merging batch results for topic {result.topic_id}: {e}")
+                traceback.print_exc()
+                result.status = 'failed'
+                result.save()
+    LLMBatch.objects.filter(pk__in=[b.pk for b in batches]).update(status='merged')
+
+
+def _finish_topic(topic, result, outputs, requests):
+    """Merge a topic's batch outputs into result and complete it, re-running anything missing interactively."""
+    assignments = result.checkpoint.setdefault("assignments", {})
+    texts = {str(a["id"]): a["text"] for a in Answer.objects.filter(topic=topic).values('id', 'text')}
+    sentiment = None
+    for custom_id, meta in requests.items():
+        if meta["topic_id"] != topic.id or "text" not in outputs.get(custom_id, {}):
+            continue
+        try:
+            parsed = llm.parse_json(outputs[custom_id]["text"])
+            if meta["kind"] == "sentiment":
+                sentiment = sentiment_result(parsed)
+                continue
+            returned = parse_assignments(parsed, texts)
+        except (llm.LLMResponseError, KeyError, TypeError, AttributeError) as e:
+            print(f"  [batch] unusable {meta['kind']} output {custom_id} ({e}), re-running interactively")
+            continue
+        for answer_id in meta["answer_ids"]:
+            assignments[str(answer_id)] = returned.get(str(answer_id), [])
+
+    themes = run_classification_with_themes(topic, result.proposed_themes, result=result)
+    if topic.analyze_sentiment and sentiment is None:
+        record_progress(result, 'sentiment')
+        sentiment = run_sentiment_analysis(topic)
+
+    result.themes = themes
+    result.sentiment = sentiment or {}
+    result.answer_count = Answer.objects.filter(topic=topic).count()
+    result.analyzed_at = timezone.now()
+    result.checkpoint = {}
+    result.progress = {}
+    result.status = 'completed'
+    result.save()
+
+
+@batch_backend("openai")
+class OpenAIBatches:
+    """OpenAI Batch API: a JSONL file of Chat Completions requests."""
+
+    def __init__(self, config):
+        self.config = config
+
+    def submit(self, requests):
+        client = providers.openai_client(self.config)
+        lines = [
+            json.dumps({
+                "custom_id": r["custom_id"],
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": providers.openai_request(self.config, r["system_prompt"], r["user_prompt"], r["json_mode"], []),
+            })
+            for r in requests
+        ]
+        upload = client.files.create(file=("batch.jsonl", "\n".join(lines).encode()), purpose="batch")
+        batch = client.batches.create(
+            input_file_id=upload.id, endpoint="/v1/chat/completions", completion_window=COMPLETION_WINDOW,
+        )
+        return batch.id
+
+    def results(self, batch_id):
+        """None while the batch runs, then ({custom_id: {text, usage} | {error}}, batch-level error)."""
+        client = providers.openai_client(self.config)
+        batch = client.batches.retrieve(batch_id)
+        if batch.status in ("validating", "in_progress", "finalizing", "cancelling"):
+            return None
+        outputs = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                response = item.get("response") or {}
+                if item.get("error") or response.get("status_code") != 200:
+                    outputs[item["custom_id"]] = {"error": json.dumps(item.get("error") or response.get("body"))[:2000]}
+                    continue
+                body = response["body"]
+                usage = body.get("usage") or {}
+                outputs[item["custom_id"]] = {
+                    "text": body["choices"][0]["message"]["content"],
+                    "usage": {
+                        "input_tokens": usage.get("prompt_tokens", 0),
+                        "output_tokens": usage.get("completion_tokens", 0),
+                        "cached_tokens": (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0) or 0,
+                    },
+                }
+        error = "" if batch.status == "completed" else f"batch {batch.status}"
+        return outputs, error
+
+
+@batch_backend("anthropic")
+class AnthropicBatches:
+    """Anthropic Message Batches: Messages params per request."""
+
+    def __init__(self, config):
+        self.config = config
+
+    def submit(self, requests):
+        client = providers.anthropic_client(self.config)
+        batch = client.messages.batches.create(requests=[
+            {
+                "custom_id": r["custom_id"],
+                "params": providers.anthropic_request(self.config, r["system_prompt"], r["user_prompt"], r["json_mode"], []),
+            }
+            for r in requests
+        ])
+        return batch.id
+
+    def results(self, batch_id):
+        """None while the batch runs, then ({custom_id: {text, usage} | {error}}, batch-level error)."""
+        client = providers.anthropic_client(self.config)
+        batch = client.messages.batches.retrieve(batch_id)
+        if batch.processing_status != "ended":
+            return None
+        outputs = {}
+        for item in client.messages.batches.results(batch_id):
+            if item.result.type != "succeeded":
+                detail = getattr(item.result, "error", None)
+                outputs[item.custom_id] = {"error": f"{item.result.type}: {detail}"[:2000]}
+                continue
+            message = item.result.message
+            outputs[item.custom_id] = {
+                "text": providers.anthropic_text(message),
+                "usage": providers.anthropic_usage(message.usage),
+            }
+        counts = batch.request_counts
+        error = f"batch ended with {counts.expired} expired, {counts.canceled} canceled" if counts.expired or counts.canceled else ""
+        return outputs, error
+
+
+@batch_backend("stub")
+class StubBatches:
+    """Offline batches: requests wait in a file under the temp dir and are answered by results.stub when polled."""
+
+    def __init__(self, config):
+        self.config = config
+
+    def _path(self, batch_id):
+        directory = os.path.join(tempfile.gettempdir(), "fora-llm-batches")
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, f"{batch_id}.jsonl")
+
+    def submit(self, requests):
+        batch_id = f"stub-{uuid.uuid4().hex}"
+        with open(self._path(batch_id), "w") as f:
+            for r in requests:
+                f.write(json.dumps({k: r[k] for k in ("custom_id", "task", "json_mode", "system_prompt", "user_prompt")}) + "\n")
+        return batch_id
+
+    def results(self, batch_id):
+        from results import stub
+
+        path = self._path(batch_id)
+        outputs = {}
+        with open(path) as f:
+            for line in f:
+                r = json.loads(line)
+                text, usage = stub.respond(
+                    r["system_prompt"], r["user_prompt"], json_mode=r["json_mode"], task=r["task"], model=self.config["model"],
+                )
+                outputs[r["custom_id"]] = {"text": text, "usage": usage}
+        os.remove(path)
+        return outputs, ""
@@ -0,0 +1,62 @@
+"""
+Record and replay LLM responses.
+
+With settings.LLM_CASSETTE_MODE = "record", every successful provider call is
+also written to LLM_CASSETTE_DIR as one JSON file, keyed by a hash of the
+provider, model and full request, including any JSON schema. With "replay",
+calls are answered from those files only; a request that was never recorded
+raises CassetteMissing instead of reaching the network. Replay sleeps for the recorded latency
+unless LLM_CASSETTE_REPLAY_LATENCY is off, so timings stay realistic.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+
+class CassetteMissing(LookupError):
+    """Replay mode was asked for a request that has not been recorded."""
+
+
+def mode():
+    from django.conf import settings
+    return getattr(settings, "LLM_CASSETTE_MODE", "") or ""
+
+
+def _dir():
+    from django.conf import settings
+    path = getattr(settings, "LLM_CASSETTE_DIR", "") or os.path.join(tempfile.gettempdir(), "fora-cassettes")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def request_key(provider, model, system_prompt, user_prompt, json_mode, history):
+    # A schema is part of the request: changing it must not replay responses recorded against the old one.
+    schema = json_mode if isinstance(json_mode, dict) else bool(json_mode)
+    canonical = json.dumps([provider, model, system_prompt, user_prompt, schema, history or []], ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def record(key, text, usage, latency, task=None):
+    path = os.path.join(_dir(), f"{key}.json")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"task": task, "text": text, "usage": usage, "latency": round(latency, 3)}, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def replay(key):
+    """Return (text, usage) recorded for key, after its recorded latency. Raises CassetteMissing."""
+    from django.conf import settings
+
+    path = os.path.join(_dir(), f"{key}.json")
+    try:
+        with open(path) as f:
+            entry = json.load(f)
+    except FileNotFoundError:
+        raise CassetteMissing(f"no recorded response for request {key[:12]} in {_dir()}") from None
+    if getattr(settings, "LLM_CASSETTE_REPLAY_LATENCY", True):
+        time.sleep(entry.get("latency", 0))
+    return entry["text"], entry.get("usage") or {}
@@ -0,0 +1,87 @@
+"""
+Cross-process circuit breakers for LLM providers.
+
+Each provider's breaker counts consecutive calls that failed because the
+provider was unavailable: timeouts, connection errors, 5xx and rate limits,
+not bad requests (see results.llm._is_outage). After FAILURE_THRESHOLD of
+them the circuit opens: results.llm sends the provider's calls to their
+fallback route for OPEN_SECONDS, then lets a single trial call through
+(half-open). A success closes the circuit again; a failure re-opens it.
+
+State lives in one small JSON file per provider next to the rate-limit
+buckets (settings.LLM_RATE_LIMIT_DIR), so every worker on the host sees an
+outage as soon as one of them has.
+"""
+
+import os
+import re
+import time
+
+from results.ratelimit import _locked_file, _state_dir
+
+FAILURE_THRESHOLD = 5  # consecutive failures that open a provider's circuit
+OPEN_SECONDS = 30.0    # how long an open circuit diverts calls before a trial call
+
+
+def _path(provider):
+    directory = os.path.join(_state_dir(), "circuits")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, re.sub(r"[^A-Za-z0-9_.-]", "_", provider) + ".json")
+
+
+def available(provider):
+    """
+    Whether a call to provider should be attempted: the circuit is closed, or
+    it has been open for OPEN_SECONDS and this caller gets the trial call.
+    """
+    with _locked_file(_path(provider)) as state:
+        opened_at = state.get("opened_at")
+        if opened_at is None:
+            return True
+        now = time.time()
+        if now - opened_at < OPEN_SECONDS:
+            return False
+        # Half-open: push the window forward so concurrent callers keep diverting
+        # while this one probes the provider.
+        state["opened_at"] = now
+        return True
+
+
+def record_success(provider):
+    with _locked_file(_path(provider)) as state:
+        if state.get("failures") or state.get("opened_at"):
+            print(f"  [circuit] {provider} closed")
+        state["failures"] = 0
+        state["opened_at"] = None
+
+
+def record_failure(provider):
+    with _locked_file(_path(provider)) as state:
+        state["failures"] = state.get("failures", 0) + 1
+        state["total_failures"] = state.get("total_failures", 0) + 1
+        if state["failures"] >= FAILURE_THRESHOLD:
+            if not state.get("opened_at"):
+                print(f"  [circuit] {provider} open after {state['failures']} consecutive failures")
+                state["times_opened"] = state.get("times_opened", 0) + 1
+            state["opened_at"] = time.time()
+
+
+def states():
+    """{provider: {"state": "closed"|"open"|"half-open", "failures", "total_failures", "times_opened"}}."""
+    directory = os.path.join(_state_dir(), "circuits")
+    if not os.path.isdir(directory):
+        return {}
+    now = time.time()
+    result = {}
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".json"):
+            continue
+        with _locked_file(os.path.join(directory, name)) as state:
+            opened_at = state.get("opened_at")
+            result[name[:-len(".json")]] = {
+                "state": "closed" if opened_at is None else "open" if now - opened_at < OPEN_SECONDS else "half-open",
+                "failures": state.get("failures", 0),
+                "total_failures": state.get("total_failures", 0),
+                "times_opened": state.get("times_opened", 0),
+            }
+    return result
@@ -0,0 +1,99 @@
+"""
+Text embeddings for similarity-based classification.
+
+To switch backend, change EMBEDDING_BACKEND to "local" (sentence-transformers
+on CPU), "openai" or "gemini". Vectors are L2-normalised float32, so cosine
+similarity is a plain dot product. API results are cached in Django's cache,
+keyed by model and text, so re-running an analysis does not pay for the same
+answers twice.
+"""
+
+import hashlib
+
+import numpy as np
+
+EMBEDDING_BACKEND = "local"
+
+EMBEDDING_MODELS = {
+    "local": "paraphrase-multilingual-MiniLM-L12-v2",
+    "openai": "text-embedding-3-small",
+    "gemini": "gemini-embedding-001",
+}
+
+API_BATCH_SIZE = 100
+CACHE_TIMEOUT = 60 * 60 * 24 * 30
+
+_local_models = {}
+
+
+def embedding_model():
+    return EMBEDDING_MODELS[EMBEDDING_BACKEND]
+
+
+def embed_texts(texts):
+    """Embed texts with the configured backend. Returns an (n, d) float32 array of unit vectors."""
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    if EMBEDDING_BACKEND == "local":
+        vectors = _local_model().encode(list(texts), batch_size=64, convert_to_numpy=True)
+        return _normalize(vectors)
+
+    from django.core.cache import cache
+
+    model = embedding_model()
+    keys = [f"emb:{model}:{hashlib.sha1(t.encode()).hexdigest()}" for t in texts]
+    cached = cache.get_many(keys)
+    missing = [i for i, k in enumerate(keys) if k not in cached]
+    for start in range(0, len(missing), API_BATCH_SIZE):
+        chunk = missing[start:start + API_BATCH_SIZE]
+        vectors = _normalize(_embed_api([texts[i] for i in chunk]))
+        fresh = {keys[i]: vec.tobytes() for i, vec in zip(chunk, vectors)}
+        cache.set_many(fresh, CACHE_TIMEOUT)
+        cached.update(fresh)
+    return np.stack([np.frombuffer(cached[k], dtype=np.float32) for k in keys])
+
+
+def cosine_similarity(a, b):
+    """Pairwise cosine similarity between rows of two unit-vector matrices: (n, d) x (k, d) -> (n, k)."""
+    return a @ b.T
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _local_model():
+    model = embedding_model()
+    if model not in _local_models:
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "The local embedding backend needs sentence-transformers: pip install 'fora[embeddings]'"
+            ) from e
+        _local_models[model] = SentenceTransformer(model, device="cpu")
+    return _local_models[model]
+
+
+def _embed_api(texts):
+    from django.conf import settings
+
+    model = embedding_model()
+
+    if EMBEDDING_BACKEND == "openai":
+        from openai import OpenAI
+        client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        response = client.embeddings.create(model=model, input=texts)
+        return [item.embedding for item in response.data]
+
+    if EMBEDDING_BACKEND == "gemini":
+        from google import genai
+        client = genai.Client(api_key=settings.GEMINI_API_KEY)
+        response = client.models.embed_content(model=model, contents=texts)
+        return [e.values for e in response.embeddings]
+
+    raise ValueError(f"Unknown embedding backend: {EMBEDDING_BACKEND!r}")
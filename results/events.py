@@ -0,0 +1,46 @@
+"""
+Cross-process change notifications for the Server-Sent Events streams.
+
+Code that changes something a stream shows calls publish(channel) once the
+change is committed: "interview-<id>" for an interview's session count,
+"topic-<id>" for a topic's Result. Each channel is an empty file whose
+modification time is its version, next to the rate-limit buckets
+(settings.LLM_RATE_LIMIT_DIR), so a stream notices a change in any worker on
+the host with a stat() instead of a database query.
+"""
+
+import os
+import re
+import time
+
+from django.db import transaction
+
+from results.ratelimit import _state_dir
+
+
+def _path(channel):
+    directory = os.path.join(_state_dir(), "events")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, re.sub(r"[^A-Za-z0-9_.-]", "_", channel))
+
+
+def publish(channel):
+    """Bump channel's version once the current transaction (if any) commits."""
+    def bump():
+        path = _path(channel)
+        with open(path, "a"):
+            pass
+        now = time.time_ns()
+        os.utime(path, ns=(now, now))
+    transaction.on_commit(bump)
+
+
+def version(*channels):
+    """A value that changes whenever any of channels is published to."""
+    versions = []
+    for channel in channels:
+        try:
+            versions.append(os.stat(_path(channel)).st_mtime_ns)
+        except FileNotFoundError:
+            versions.append(0)
+    return tuple(versions)
@@ -0,0 +1,89 @@
+"""
+Liveness of running analysis jobs.
+
+A worker that starts an analysis marks its Result with an owner
+(host:pid) and keeps Result.heartbeat_at fresh from a background thread while
+the job runs. A job whose heartbeat is older than HEARTBEAT_TTL belonged to a
+worker that died or was restarted; reap_stale_jobs() marks those failed so
+they can be re-run. Jobs with a live heartbeat are never touched.
+"""
+
+import os
+import socket
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from results import events
+from results.models import Result
+
+ACTIVE_STATUSES = ['running', 'discovering', 'classifying']
+
+HEARTBEAT_INTERVAL = 15  # seconds between heartbeats while a job runs
+HEARTBEAT_TTL = 90       # a job is presumed dead after this long without one
+
+
+def job_owner():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def start_job(result, status):
+    """Mark result as running under this worker, with a fresh heartbeat."""
+    result.status = status
+    result.owner = job_owner()
+    result.heartbeat_at = timezone.now()
+    result.save()
+
+
+@contextmanager
+def keep_alive(result):
+    """Refresh result's heartbeat every HEARTBEAT_INTERVAL seconds until the block exits."""
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(HEARTBEAT_INTERVAL):
+                Result.objects.filter(pk=result.pk).update(heartbeat_at=timezone.now())
+        except Exception as e:
+            print(f"[jobs] heartbeat for result {result.pk} stopped: {e}")
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=beat, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def stale_filter(now=None):
+    """Q matching active jobs whose heartbeat has expired (or was never recorded)."""
+    cutoff = (now or timezone.now()) - timedelta(seconds=HEARTBEAT_TTL)
+    return Q(status__in=ACTIVE_STATUSES) & (Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True))
+
+
+def is_stale(result, now=None):
+    if result.status not in ACTIVE_STATUSES:
+        return False
+    cutoff = (now or timezone.now()) - timedelta(seconds=HEARTBEAT_TTL)
+    return result.heartbeat_at is None or result.heartbeat_at < cutoff
+
+
+def reap_stale_jobs():
+    """Mark active jobs with an expired heartbeat as failed. Returns how many were reaped."""
+    stale = Result.objects.filter(stale_filter())
+    topic_ids = []
+    for pk, owner, topic_id in stale.values_list('id', 'owner', 'topic_id'):
+        print(f"[jobs] reaping result {pk} (owner {owner or 'unknown'}): heartbeat expired")
+        topic_ids.append(topic_id)
+    # The UPDATE re-applies the filter, so a job that beat in the meantime is left alone.
+    reaped = stale.update(status='failed')
+    for topic_id in topic_ids:
+        events.publish(f"topic-{topic_id}")
+    return reaped
@@ -1,11 +1,41 @@
 """
 LLM provider abstraction.
 
-To switch provider, change PROVIDER to "openai", "gemini", or "anthropic".
-To switch model, change the corresponding entry in MODELS.
+The provider is settings.LLM_PROVIDER: "openai", "gemini", "anthropic", "stub"
+(synthetic responses offline; see results.stub) or any provider added in
+settings.LLM_PROVIDERS, such as an OpenAI-compatible local server. Providers,
+their models and backends live in results.providers. Individual call types
+(TASKS) can be routed to other providers or models, globally with
+settings.LLM_ROUTES and per interview with Interview.llm_routes; see route(). Responses can be
+recorded to disk and replayed without a network; see results.cassettes.
+Per-request token budgets used for batching live in TOKEN_BUDGETS.
+
+Transient failures (rate limits, timeouts, 5xx) are retried with exponential
+backoff and full jitter; see MAX_RETRIES and _retry_delay. Routes may name a
+fallback that takes over when the primary fails or its circuit breaker is
+open, and that slow interactive calls can be hedged to; see generate().
+
+Every call waits for capacity in the shared RPM/TPM buckets in RATE_LIMITS
+(see results.ratelimit); calls tagged with one of INTERACTIVE_TASKS go first.
+
+Each call is recorded as an LLMCall row (latency, tokens, estimated cost from
+PRICES, retries, error), attributed to the interview set with attribute().
+Set LLM_CALL_LOGGING = False in settings to turn this off.
 """
 
+import json
+import queue
+import random
 import re
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+
+from results import cassettes, circuit, providers, ratelimit
+from results.tokens import estimate_tokens
 
 
 def _strip_fences(text):
@@ -16,89 +46,606 @@ def _strip_fences(text):
         text = re.sub(r'\n?```\s*$', '', text)
     return text.strip()
 
-PROVIDER = "gemini"
 
-MODELS = {
-    "openai": "gpt-4o",
-    "gemini": "gemini-3-flash-preview",
-    "anthropic": "claude-sonnet-4-6",
+class LLMResponseError(ValueError):
+    """The model's response could not be parsed, even after repair and a re-ask."""
+
+
+# Overrides settings.LLM_PROVIDER for this process when set, e.g. "stub" in benchmarks.
+PROVIDER = None
+
+# Token budgets per request, per provider and model. "output" stays well under
+# the model's output limit so a full batch never gets truncated mid-JSON, and
+# input + output stays within the (1 - ratelimit.BACKGROUND_RESERVE) share of
+# the model's RATE_LIMITS tpm a background call may use.
+TOKEN_BUDGETS = {
+    "openai": {
+        "gpt-4o": {"input": 20000, "output": 4000},
+    },
+    "gemini": {
+        "gemini-3-flash-preview": {"input": 100000, "output": 16000},
+    },
+    "anthropic": {
+        "claude-sonnet-4-6": {"input": 20000, "output": 4000},
+    },
+    "stub": {
+        "stub": {"input": 60000, "output": 12000},
+    },
+}
+
+DEFAULT_TOKEN_BUDGET = {"input": 30000, "output": 4000}
+
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0  # seconds
+BACKOFF_MAX = 60.0
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# Retries on the primary route before failing over, when the route has a fallback.
+FAILOVER_RETRIES = 1
+
+# Hedging (settings.LLM_HEDGE_PERCENTILE): tasks that may be hedged, the
+# latency samples per provider/model/task the threshold is taken from, and the
+# delay used until HEDGE_MIN_SAMPLES have been seen. HEDGE_THREADS bounds the
+# calls in flight on the hedge pool per process.
+HEDGE_TASKS = {"analyzer", "interviewer", "opening", "chat"}
+HEDGE_WINDOW = 200
+HEDGE_MIN_SAMPLES = 20
+HEDGE_DEFAULT_DELAY = 5.0  # seconds
+HEDGE_MIN_DELAY = 0.2
+HEDGE_THREADS = 32
+
+# Requests and tokens per minute per provider and model, shared by all
+# processes on the host. Match these to the account's quota tier; a missing
+# entry means no client-side limiting.
+RATE_LIMITS = {
+    "openai": {
+        "gpt-4o": {"rpm": 500, "tpm": 30000},
+    },
+    "gemini": {
+        "gemini-3-flash-preview": {"rpm": 1000, "tpm": 1000000},
+    },
+    "anthropic": {
+        "claude-sonnet-4-6": {"rpm": 50, "tpm": 30000},
+    },
+}
+
+# USD per million tokens, for the cost estimates on LLMCall. "cached_input"
+# is the rate for input tokens served from the provider's prompt cache.
+# Check these against the provider's current price list.
+PRICES = {
+    "openai": {
+        "gpt-4o": {"input": 2.50, "cached_input": 1.25, "output": 10.00},
+        "gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "output": 0.60},
+    },
+    "gemini": {
+        "gemini-3-flash-preview": {"input": 0.50, "cached_input": 0.05, "output": 3.00},
+    },
+    "anthropic": {
+        "claude-sonnet-4-6": {"input": 3.00, "cached_input": 0.30, "output": 15.00},
+        "claude-haiku-4-5": {"input": 1.00, "cached_input": 0.10, "output": 5.00},
+    },
 }
 
+# Provider batch APIs (results.batches) bill at this fraction of PRICES.
+BATCH_DISCOUNT = 0.5
+
+# Tasks a respondent or researcher is actively waiting on. They may use the
+# whole rate limit; everything else keeps ratelimit.BACKGROUND_RESERVE free.
+INTERACTIVE_TASKS = {"analyzer", "interviewer", "opening", "chat"}
+
+
+# Call types, as passed in generate()'s task argument. Each can be routed to
+# its own provider and model; see route().
+TASKS = ["analyzer", "interviewer", "opening", "discover", "classify", "sentiment", "summary", "chat"]
+
+
+_interview_id = ContextVar("llm_interview_id", default=None)
+_interview_routes = ContextVar("llm_interview_routes", default=None)
+
+
+@contextmanager
+def attribute(interview_id, routes=None):
+    """
+    Attribute LLM calls made inside the block to an interview (for LLMCall)
+    and route them with its Interview.llm_routes. Pass routes if the caller
+    already has them; otherwise they are loaded on the first call.
+    """
+    token = _interview_id.set(interview_id)
+    routes_token = _interview_routes.set(routes)
+    try:
+        yield
+    finally:
+        _interview_routes.reset(routes_token)
+        _interview_id.reset(token)
+
+
+def current_provider():
+    """Name of the default provider: PROVIDER if set, else settings.LLM_PROVIDER."""
+    from django.conf import settings
+    return PROVIDER or getattr(settings, "LLM_PROVIDER", "gemini")
+
+
+def _interview_route_table():
+    routes = _interview_routes.get()
+    interview_id = _interview_id.get()
+    if routes is None and interview_id is not None:
+        from interview.models import Interview
+        routes = Interview.objects.filter(pk=interview_id).values_list('llm_routes', flat=True).first() or {}
+        _interview_routes.set(routes)
+    return routes or {}
+
 
-def generate(system_prompt, user_prompt, json_mode=False, history=None):
+def route(task=None):
     """
-    Generate a response from the configured LLM provider.
+    (provider, model) for a call tagged task.
+
+    The first entry found wins: the current interview's llm_routes for the
+    task, then its "default", then settings.LLM_ROUTES for the task, then its
+    "default", then the default provider and its model. Entries are
+    {"provider": name, "model": optional override, "fallback": optional entry};
+    see fallback_route(). Setting PROVIDER bypasses routing altogether.
+    """
+    if PROVIDER:
+        return PROVIDER, provider_model(PROVIDER)
+    entry = _route_entry(task)
+    provider = entry.get("provider") or current_provider()
+    return provider, entry.get("model") or provider_model(provider)
+
+
+def fallback_route(task=None):
+    """
+    (provider, model) to fail over or hedge to for a call tagged task, or None.
+
+    Taken from the "fallback" of the route entry route() used, e.g.
+    {"provider": "gemini", "fallback": {"provider": "openai", "model": "gpt-4o-mini"}}.
+    """
+    if PROVIDER:
+        return None
+    fallback = _route_entry(task).get("fallback")
+    if not fallback or not fallback.get("provider"):
+        return None
+    return fallback["provider"], fallback.get("model") or provider_model(fallback["provider"])
+
+
+def _route_entry(task):
+    from django.conf import settings
+
+    interview_routes = _interview_route_table()
+    global_routes = getattr(settings, "LLM_ROUTES", {}) or {}
+    return (
+        interview_routes.get(task) or interview_routes.get("default")
+        or global_routes.get(task) or global_routes.get("default") or {}
+    )
+
+
+def provider_model(provider=None):
+    """The model configured for provider (default: the current one)."""
+    return providers.provider_config(provider or current_provider())["model"]
+
+
+def _lookup(table, key, provider, model):
+    """table[provider][model], falling back to the provider config's own entry."""
+    entry = table.get(provider, {}).get(model)
+    if entry is None:
+        entry = providers.provider_config(provider).get(key)
+    return entry
+
+
+def token_budget(provider=None, model=None, task=None):
+    """Return {"input": int, "output": int} for the given provider/model, or the one task is routed to."""
+    if provider is None:
+        provider, routed_model = route(task)
+        model = model or routed_model
+    model = model or provider_model(provider)
+    return _lookup(TOKEN_BUDGETS, "token_budget", provider, model) or DEFAULT_TOKEN_BUDGET
+
+
+def generate(system_prompt, user_prompt, json_mode=False, history=None, task=None):
+    """
+    Generate a response from the provider and model the task is routed to.
 
     Args:
         system_prompt: The system/instruction prompt.
         user_prompt: The user message / content to analyze.
-        json_mode: If True, instructs the model to return valid JSON.
+        json_mode: If True, instructs the model to return valid JSON. A
+                   {"name", "schema"} dict instead constrains the response to
+                   that JSON schema through the provider's structured-output
+                   mode.
         history: Optional list of prior messages [{"role": "user"|"assistant", "content": str}]
                  for multi-turn conversations.
+        task: Caller tag, one of TASKS. Selects the provider and model
+              (see route()); tasks in INTERACTIVE_TASKS get priority in the
+              rate limiter.
 
     Returns:
         The model's response as a string.
+
+    Rate limits, timeouts and server errors are retried up to MAX_RETRIES
+    times before the last error is raised. If the route has a fallback (see
+    fallback_route()), the primary only gets FAILOVER_RETRIES retries and a
+    call that still fails, or whose provider's circuit is open (see
+    results.circuit), goes to the fallback instead. With
+    settings.LLM_HEDGE_PERCENTILE set, HEDGE_TASKS calls still running after
+    that percentile of their recent latency are also sent to the fallback,
+    and whichever answers first is used.
     """
+    history = history or []
+    request = (system_prompt, user_prompt, json_mode, history, task)
+    primary = route(task)
+    fallback = fallback_route(task)
+    if fallback is None:
+        return _attempt(primary, request, MAX_RETRIES)
+
+    if not circuit.available(primary[0]):
+        print(f"  [llm] {primary[0]} circuit open, sending {task or 'call'} to {fallback[0]}")
+        return _attempt(fallback, request, MAX_RETRIES, role="failover")
+    if task in HEDGE_TASKS and _hedge_percentile() and circuit.available(fallback[0]):
+        return _hedged(primary, fallback, request)
+    try:
+        return _attempt(primary, request, FAILOVER_RETRIES)
+    except Exception as e:
+        print(f"  [llm] {primary[0]} failed ({type(e).__name__}), failing over to {fallback[0]}")
+        return _attempt(fallback, request, MAX_RETRIES, role="failover")
+
+
+def _attempt(target, request, max_retries, role="", race=None):
+    """Call one (provider, model) with retries, recording the call and its circuit breaker outcome."""
+    provider, model = target
+    system_prompt, user_prompt, json_mode, history, task = request
+    limits = _lookup(RATE_LIMITS, "rate_limit", provider, model)
+    tokens = 0
+    if limits:
+        tokens = estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+        tokens += sum(estimate_tokens(msg["content"]) for msg in history)
+
+    attempt = 0
+    queued = 0.0
+    started = time.monotonic()
+    while True:
+        waited = ratelimit.acquire(provider, model, tokens, limits, interactive=task in INTERACTIVE_TASKS)
+        queued += waited
+        if waited >= 1:
+            print(f"  [llm] {task or 'call'} waited {waited:.1f}s for {provider} rate limit")
+        try:
+            text, usage = _call(provider, model, system_prompt, user_prompt, json_mode, history, task)
+        except Exception as e:
+            if attempt >= max_retries or not _is_retryable(e):
+                if _is_outage(e):
+                    circuit.record_failure(provider)
+                if race:
+                    role, _ = race.finish(role, ok=False)
+                _record_call(provider, model, task, started, queued, attempt, error=e, role=role)
+                raise
+            if _status_code(e) == 429:
+                ratelimit.throttle(provider, model, limits)
+            attempt += 1
+            delay = _retry_delay(e, attempt)
+            print(f"  [llm] {provider} {type(e).__name__} ({_status_code(e) or 'no status'}), retry {attempt}/{max_retries} in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+
+        circuit.record_success(provider)
+        _observe_latency(provider, model, task, time.monotonic() - started - queued)
+        discarded = False
+        if race:
+            role, discarded = race.finish(role, ok=True)
+        _record_call(provider, model, task, started, queued, attempt, usage=usage, role=role, discarded=discarded)
+        return text
+
+
+def _hedge_percentile():
     from django.conf import settings
+    return getattr(settings, "LLM_HEDGE_PERCENTILE", 0) or 0
 
-    model = MODELS[PROVIDER]
-    history = history or []
 
-    if PROVIDER == "openai":
-        from openai import OpenAI
-        client = OpenAI(api_key=settings.OPENAI_API_KEY)
-        messages = [{"role": "system", "content": system_prompt}]
-        for msg in history:
-            messages.append({"role": msg["role"], "content": msg["content"]})
-        messages.append({"role": "user", "content": user_prompt})
-        kwargs = {}
-        if json_mode:
-            kwargs["response_format"] = {"type": "json_object"}
-        response = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            **kwargs,
-        )
-        return response.choices[0].message.content
-
-    if PROVIDER == "gemini":
-        from google import genai
-        from google.genai import types
-        client = genai.Client(api_key=settings.GEMINI_API_KEY)
-        if history:
-            contents = []
-            for msg in history:
-                role = "user" if msg["role"] == "user" else "model"
-                contents.append(types.Content(role=role, parts=[types.Part(text=msg["content"])]))
-            contents.append(types.Content(role="user", parts=[types.Part(text=user_prompt)]))
-        else:
-            contents = user_prompt
-        response = client.models.generate_content(
-            model=model,
-            contents=contents,
-            config=types.GenerateContentConfig(
-                system_instruction=system_prompt,
-                response_mime_type="application/json" if json_mode else "text/plain",
-            ),
-        )
-        return response.text
-
-    if PROVIDER == "anthropic":
-        import anthropic
-        sys = system_prompt
-        if json_mode:
-            sys += "\n\nRespond only with valid JSON. No other text."
-        messages = []
-        for msg in history:
-            messages.append({"role": msg["role"], "content": msg["content"]})
-        messages.append({"role": "user", "content": user_prompt})
-        client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
-        response = client.messages.create(
-            model=model,
-            max_tokens=8192,
-            system=sys,
-            messages=messages,
+_latencies = defaultdict(lambda: deque(maxlen=HEDGE_WINDOW))
+_latencies_lock = threading.Lock()
+
+
+def _observe_latency(provider, model, task, seconds):
+    with _latencies_lock:
+        _latencies[(provider, model, task)].append(seconds)
+
+
+def hedge_delay(provider, model, task):
+    """
+    Seconds to wait on provider/model before hedging a call tagged task:
+    settings.LLM_HEDGE_PERCENTILE of its last HEDGE_WINDOW latencies in this
+    process, or HEDGE_DEFAULT_DELAY until HEDGE_MIN_SAMPLES have been seen.
+    """
+    with _latencies_lock:
+        recent = sorted(_latencies[(provider, model, task)])
+    if len(recent) < HEDGE_MIN_SAMPLES:
+        return HEDGE_DEFAULT_DELAY
+    index = min(len(recent) - 1, int(len(recent) * _hedge_percentile() / 100))
+    return max(HEDGE_MIN_DELAY, recent[index])
+
+
+class _Race:
+    """A hedged request: whether the hedge was sent, which call won, and the calls' outcomes."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.outcomes = queue.Queue()
+        self.hedged = False
+        self.winner = None
+
+    def hedge(self):
+        """Mark the hedge as sent, unless a call has already won."""
+        with self.lock:
+            if self.winner is not None:
+                return False
+            self.hedged = True
+            return True
+
+    def finish(self, role, ok):
+        """Record a finished call; returns (role to record, whether its answer was discarded)."""
+        with self.lock:
+            if ok and self.winner is None:
+                self.winner = role
+            return (role if self.hedged else ""), ok and self.winner != role
+
+
+# Threads are only started as calls are submitted.
+_hedge_pool = ThreadPoolExecutor(max_workers=HEDGE_THREADS, thread_name_prefix="llm-hedge")
+
+
+def _submit(target, request, role, race):
+    """Run _attempt on the hedge pool in a copy of the caller's context; its outcome goes to race.outcomes."""
+    def run():
+        from django.db import connection
+
+        try:
+            race.outcomes.put((role, _attempt(target, request, FAILOVER_RETRIES, role=role, race=race), None))
+        except Exception as e:
+            race.outcomes.put((role, None, e))
+        finally:
+            connection.close()
+
+    _hedge_pool.submit(copy_context().run, run)
+
+
+def _hedged(primary, fallback, request):
+    """Call primary; if it is slower than hedge_delay(), also call fallback and return the first answer."""
+    task = request[-1]
+    race = _Race()
+    _submit(primary, request, "primary", race)
+    delay = hedge_delay(*primary, task)
+    try:
+        role, text, error = race.outcomes.get(timeout=delay)
+    except queue.Empty:
+        pass
+    else:
+        if error is None:
+            return text
+        print(f"  [llm] {primary[0]} failed ({type(error).__name__}), failing over to {fallback[0]}")
+        return _attempt(fallback, request, MAX_RETRIES, role="failover")
+
+    if not race.hedge():  # the primary answered just as the delay ran out
+        role, text, error = race.outcomes.get()
+        if error is None:
+            return text
+        raise error
+    print(f"  [llm] {task or 'call'} still running on {primary[0]} after {delay:.1f}s, hedging to {fallback[0]}")
+    _submit(fallback, request, "hedge", race)
+    errors = []
+    for _ in range(2):
+        role, text, error = race.outcomes.get()
+        if error is None:
+            return text
+        errors.append(error)
+    raise errors[0]
+
+
+_call_listeners = []
+
+
+def add_call_listener(listener):
+    """Call listener(call) after every generate() call; call is the LLMCall field dict."""
+    if listener not in _call_listeners:
+        _call_listeners.append(listener)
+
+
+def remove_call_listener(listener):
+    if listener in _call_listeners:
+        _call_listeners.remove(listener)
+
+
+def _record_call(provider, model, task, started, queued, retries, usage=None, error=None, role="", discarded=False):
+    """Persist one generate() call as an LLMCall. Never lets a logging failure break the call."""
+    from django.conf import settings
+
+    usage = usage or {}
+    call = {
+        "interview_id": _interview_id.get(),
+        "provider": provider,
+        "model": model,
+        "task": task or "",
+        "latency_ms": round((time.monotonic() - started) * 1000),
+        "queue_ms": round(queued * 1000),
+        "input_tokens": usage.get("input_tokens", 0),
+        "output_tokens": usage.get("output_tokens", 0),
+        "cached_tokens": usage.get("cached_tokens", 0),
+        "cost_usd": call_cost(provider, model, usage, batch=role == "batch"),
+        "retries": retries,
+        "error": f"{type(error).__name__}: {error}"[:2000] if error else "",
+        "role": role,
+        "discarded": discarded,
+    }
+    try:
+        for listener in _call_listeners:
+            listener(call)
+        if getattr(settings, "LLM_CALL_LOGGING", True):
+            from results.models import LLMCall
+            LLMCall.objects.create(**call)
+    except Exception as e:
+        print(f"  [llm] could not record call: {e}")
+
+
+def call_cost(provider, model, usage, batch=False):
+    """Estimated USD cost of a call from its usage dict, using PRICES (0 if unpriced) and BATCH_DISCOUNT for batch requests."""
+    price = _lookup(PRICES, "price", provider, model)
+    if not price:
+        return 0.0
+    cached = usage.get("cached_tokens", 0)
+    uncached = max(usage.get("input_tokens", 0) - cached, 0)
+    cost = (
+        uncached * price["input"]
+        + cached * price.get("cached_input", price["input"])
+        + usage.get("output_tokens", 0) * price["output"]
+    ) / 1_000_000
+    return cost * BATCH_DISCOUNT if batch else cost
+
+
+def generate_json(system_prompt, user_prompt, history=None, task=None, schema=None):
+    """
+    Generate a JSON response and return it parsed. schema, a {"name", "schema"}
+    dict, constrains the response to that JSON schema (see generate()).
+
+    Malformed output is first repaired locally (code fences, surrounding prose,
+    trailing commas, unclosed brackets from a truncated response). If that
+    fails the model is asked once more, with its broken answer and the parse
+    error in the conversation. Raises LLMResponseError if both attempts fail.
+    """
+    history = list(history or [])
+    json_mode = schema or True
+    raw = generate(system_prompt, user_prompt, json_mode=json_mode, history=history, task=task)
+    try:
+        return parse_json(raw)
+    except LLMResponseError as e:
+        print(f"  [llm] malformed JSON ({e}), re-asking")
+        history += [
+            {"role": "user", "content": user_prompt},
+            {"role": "assistant", "content": raw},
+        ]
+        retry_prompt = (
+            f"Your previous response was not valid JSON ({e}). "
+            "Respond again with the complete answer as valid JSON only."
         )
-        return _strip_fences(response.content[0].text)
+        return parse_json(generate(system_prompt, retry_prompt, json_mode=json_mode, history=history, task=task))
+
+
+def parse_json(raw):
+    """Parse a model's JSON response, repairing common defects. Raises LLMResponseError."""
+    text = _strip_fences(raw or "")
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as e:
+        error = e
+
+    start = min((i for i in (text.find("{"), text.find("[")) if i != -1), default=-1)
+    if start == -1:
+        raise LLMResponseError(f"no JSON object in response: {error}")
+    text = re.sub(r",\s*([}\]])", r"\1", text[start:])
+    for candidate in (text, text[:text.rfind("}") + 1] if "}" in text else text, _close_brackets(text)):
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+    raise LLMResponseError(str(error))
+
+
+def _close_brackets(text):
+    """Close any brackets and strings left open by a truncated response."""
+    stack = []
+    in_string = escaped = False
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]" and stack:
+            stack.pop()
+    text = text + '"' if in_string else text
+    text = re.sub(r",\s*$", "", text.rstrip())
+    return text + "".join(reversed(stack))
+
+
+def _status_code(exc):
+    """HTTP status of a provider SDK error (openai/anthropic: status_code, google-genai: code)."""
+    for attr in ("status_code", "code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def _is_retryable(exc):
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    name = type(exc).__name__
+    if "Timeout" in name or "Connection" in name or name == "OverloadedError":
+        return True
+    return _status_code(exc) in RETRYABLE_STATUS
+
+
+def _is_outage(exc):
+    """Whether exc says the provider is unavailable (timeout, connection error, 5xx, rate limit), not that the request was bad."""
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    name = type(exc).__name__
+    if "Timeout" in name or "Connection" in name or name == "OverloadedError":
+        return True
+    status = _status_code(exc)
+    return status is not None and (status == 429 or status >= 500)
+
+
+def _retry_delay(exc, attempt):
+    """
+    Seconds to wait before the next attempt.
+
+    Honours the provider's hint on a 429 — the Retry-After header for OpenAI
+    and Anthropic, the RetryInfo retryDelay detail for Gemini — and otherwise
+    uses exponential backoff with full jitter.
+    """
+    backoff = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+    if _status_code(exc) != 429:
+        return backoff
+
+    hint = None
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    for header in ("retry-after-ms", "retry-after"):
+        value = headers.get(header)
+        if value:
+            try:
+                hint = float(value) / (1000 if header.endswith("-ms") else 1)
+            except ValueError:
+                pass
+            break
+    if hint is None:
+        details = getattr(exc, "details", None) or {}
+        match = re.search(r'"?retryDelay"?\s*:\s*"(\d+(?:\.\d+)?)s"', json.dumps(details, default=str))
+        if match:
+            hint = float(match.group(1))
+    if hint is None:
+        return backoff
+    return min(BACKOFF_MAX, hint) + random.uniform(0, BACKOFF_BASE)
+
+
+def _call(provider, model, system_prompt, user_prompt, json_mode, history, task):
+    """One provider request, served from or recorded to cassettes when LLM_CASSETTE_MODE is set."""
+    mode = cassettes.mode()
+    if not mode:
+        return _call_provider(provider, system_prompt, user_prompt, json_mode, history, task=task, model=model)
+
+    key = cassettes.request_key(provider, model, system_prompt, user_prompt, json_mode, history)
+    if mode == "replay":
+        return cassettes.replay(key)
+    started = time.monotonic()
+    text, usage = _call_provider(provider, system_prompt, user_prompt, json_mode, history, task=task, model=model)
+    cassettes.record(key, text, usage, time.monotonic() - started, task=task)
+    return text, usage
+
 
-    raise ValueError(f"Unknown LLM provider: {PROVIDER!r}")
+def _call_provider(provider, system_prompt, user_prompt, json_mode, history, task=None, model=None):
+    """Make a single request to provider (see results.providers). Retries are handled by generate()."""
+    return providers.call(provider, model, system_prompt, user_prompt, json_mode, history, task=task)
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from interview.models import Answer, Topic
+from results.embeddings import embedding_model
+from results.vectors import embed_answers, topic_matrix
+
+
+class Command(BaseCommand):
+    help = "Compute missing answer embeddings for the current embedding model and rebuild search matrices"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--topic",
+            type=int,
+            action="append",
+            help="Only backfill this topic id (can be repeated)",
+        )
+
+    def handle(self, *args, **options):
+        topics = Topic.objects.order_by("id")
+        if options["topic"]:
+            topics = topics.filter(id__in=options["topic"])
+
+        self.stdout.write(f"Embedding model: {embedding_model()}")
+        total = 0
+        for topic in topics:
+            embedded = embed_answers(Answer.objects.filter(topic=topic))
+            ids, _ = topic_matrix(topic.id)
+            total += embedded
+            self.stdout.write(f"  topic {topic.id}: {embedded} new, {len(ids)} in index")
+
+        self.stdout.write(self.style.SUCCESS(f"Embedded {total} answers."))
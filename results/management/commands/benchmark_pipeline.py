@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks import pipeline
+
+
+class Command(BaseCommand):
+    help = "Time the analysis pipeline on synthetic topics against the stub LLM provider (see benchmarks.pipeline)"
+
+    def add_arguments(self, parser):
+        pipeline.add_arguments(parser)
+
+    def handle(self, *args, **options):
+        found = pipeline.report_and_check(options, self.stdout.write)
+        if found:
+            raise CommandError("Regressions against baseline:\n  " + "\n  ".join(found))
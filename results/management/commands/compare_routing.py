@@ -0,0 +1,184 @@
+import json
+import random
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from interview.interview_service import conduct_interview, generate_opening_question
+from interview.synthetic import generate_interview
+from results import llm, providers, services, stub
+
+FAST = {"provider": "openai", "model": "gpt-4o-mini"}
+STRONG = {"provider": "anthropic", "model": "claude-sonnet-4-6"}
+
+# Routing profiles to compare, as Interview.llm_routes tables. Add more with --profiles-file.
+PROFILES = {
+    "default": {},
+    "fast-turns": {"analyzer": FAST, "interviewer": FAST, "opening": FAST},
+    "fast-turns-strong-synthesis": {
+        "analyzer": FAST, "interviewer": FAST, "opening": FAST,
+        "discover": STRONG, "summary": STRONG, "chat": STRONG,
+    },
+    "all-strong": {"default": STRONG},
+    "with-fallback": {"default": {"provider": "gemini", "fallback": FAST}},
+}
+
+_REPLIES = [
+    "Honestly it's been a busy month, the workload is heavy but manageable.",
+    "I'm feeling fairly positive, the team has been supportive.",
+    "Meetings take up too much of my week and it's hard to focus.",
+    "Priorities keep changing, which makes planning difficult.",
+]
+
+
+def _percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0
+
+
+class Command(BaseCommand):
+    help = "Compare latency and cost of LLM routing profiles on simulated interviews and analyses"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--profile", action="append", help="Profile(s) to run (default: all)")
+        parser.add_argument("--profiles-file", help="JSON file of extra {name: llm_routes} profiles")
+        parser.add_argument("--conversations", type=int, default=10, help="Simulated interviews per profile")
+        parser.add_argument("--answers", type=int, default=500, help="Synthetic answers per topic for the analysis")
+        parser.add_argument("--topics", type=int, default=3)
+        parser.add_argument(
+            "--replay",
+            action="store_true",
+            help="Answer from recorded cassettes (LLM_CASSETTE_DIR) instead of simulating each model with the stub",
+        )
+        parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiplier on the stub's simulated latency and on retry backoff")
+        parser.add_argument("--tail-rate", type=float, default=0.0, help="Share of simulated calls with a latency spike")
+        parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of simulated calls that fail")
+        parser.add_argument(
+            "--hedge-percentile", type=float, default=None,
+            help="Override settings.LLM_HEDGE_PERCENTILE for routes with a fallback (0 disables hedging)",
+        )
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    def handle(self, *args, **options):
+        profiles = dict(PROFILES)
+        if options["profiles_file"]:
+            with open(options["profiles_file"]) as f:
+                profiles.update(json.load(f))
+        names = options["profile"] or list(profiles)
+        unknown = [n for n in names if n not in profiles]
+        if unknown:
+            raise CommandError(f"Unknown profile(s): {', '.join(unknown)}. Known: {', '.join(profiles)}")
+
+        if options["replay"]:
+            settings.LLM_CASSETTE_MODE = "replay"
+        else:
+            providers.SIMULATE = True
+            stub.LATENCY_SCALE = options["latency_scale"]
+            stub.TAIL_RATE = options["tail_rate"]
+            stub.FAILURE_RATE = options["failure_rate"]
+            retry_delay = llm._retry_delay
+            llm._retry_delay = lambda exc, attempt: retry_delay(exc, attempt) * options["latency_scale"]
+        if options["hedge_percentile"] is not None:
+            settings.LLM_HEDGE_PERCENTILE = options["hedge_percentile"]
+        llm.PROVIDER = None
+        settings.LLM_CALL_LOGGING = False
+
+        # Simulated failures and token usage must not open the host's real
+        # circuit breakers or drain its shared rate-limit buckets.
+        with tempfile.TemporaryDirectory(prefix="compare-routing-") as state_dir:
+            settings.LLM_RATE_LIMIT_DIR = state_dir
+            rng = random.Random(0)
+            interview = generate_interview("compare_routing", options["topics"], options["answers"], rng=rng)
+            try:
+                report = {
+                    name: self._run_profile(interview, profiles[name], options["conversations"])
+                    for name in names
+                }
+            finally:
+                interview.delete()
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        self._print(report)
+
+    def _run_profile(self, interview, routes, conversations):
+        calls = []
+        llm.add_call_listener(calls.append)
+        topics = list(interview.topics.all())
+        turn_ms = []
+        analysis = {}
+        try:
+            with llm.attribute(interview.id, routes):
+                for n in range(conversations):
+                    rng = random.Random(n)
+                    history = [{"role": "assistant", "content": generate_opening_question(topics)}]
+                    covered = []
+                    for _ in range(8):
+                        message = rng.choice(_REPLIES)
+                        start = time.perf_counter()
+                        result = conduct_interview(message, history, covered, interview=interview)
+                        turn_ms.append((time.perf_counter() - start) * 1000)
+                        history += [{"role": "user", "content": message}, {"role": "assistant", "content": result["response"]}]
+                        covered = result["covered_topics"]
+                        if result["interview_complete"]:
+                            break
+
+                start = time.perf_counter()
+                for topic in topics:
+                    themes = services.discover_themes_only(topic)
+                    services.run_classification_with_themes(topic, themes)
+                    services.run_sentiment_analysis(topic)
+                    services.generate_summary(topic)
+                analysis["seconds"] = round(time.perf_counter() - start, 2)
+        finally:
+            llm.remove_call_listener(calls.append)
+
+        per_task = defaultdict(list)
+        for call in calls:
+            per_task[call["task"]].append(call)
+        return {
+            "routes": routes,
+            "turns": len(turn_ms),
+            "turn_p50_ms": round(statistics.median(turn_ms), 1) if turn_ms else 0,
+            "turn_p95_ms": round(_percentile(turn_ms, 0.95), 1),
+            "analysis_seconds": analysis["seconds"],
+            "cost_usd": round(sum(c["cost_usd"] for c in calls), 4),
+            "errors": sum(1 for c in calls if c["error"]),
+            "hedged": sum(1 for c in calls if c["role"] == "primary"),
+            "hedge_wins": sum(1 for c in calls if c["role"] == "hedge" and not c["discarded"] and not c["error"]),
+            "failovers": sum(1 for c in calls if c["role"] == "failover"),
+            "tasks": {
+                task: {
+                    "route": ", ".join(sorted({f"{c['provider']}/{c['model']}" for c in items})),
+                    "calls": len(items),
+                    "p50_ms": statistics.median(c["latency_ms"] for c in items),
+                    "p95_ms": _percentile([c["latency_ms"] for c in items], 0.95),
+                    "cost_usd": round(sum(c["cost_usd"] for c in items), 4),
+                }
+                for task, items in sorted(per_task.items())
+            },
+        }
+
+    def _print(self, report):
+        self.stdout.write(
+            f"{'profile':<30} {'turns':>6} {'turn p50':>9} {'turn p95':>9} {'analysis s':>11} {'cost $':>9} "
+            f"{'errors':>7} {'hedged':>7} {'hedge won':>10} {'failovers':>10}"
+        )
+        for name, r in report.items():
+            self.stdout.write(
+                f"{name:<30} {r['turns']:>6} {r['turn_p50_ms']:>9.0f} {r['turn_p95_ms']:>9.0f} "
+                f"{r['analysis_seconds']:>11.1f} {r['cost_usd']:>9.4f} "
+                f"{r['errors']:>7} {r['hedged']:>7} {r['hedge_wins']:>10} {r['failovers']:>10}"
+            )
+        for name, r in report.items():
+            self.stdout.write(f"\n{name}")
+            for task, t in r["tasks"].items():
+                self.stdout.write(
+                    f"  {task:<12} {t['route']:<36} {t['calls']:>5} calls  p50 {t['p50_ms']:>6.0f}ms  "
+                    f"p95 {t['p95_ms']:>6.0f}ms  ${t['cost_usd']:.4f}"
+                )
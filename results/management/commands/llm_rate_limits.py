@@ -0,0 +1,40 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from results.ratelimit import wait_metrics
+
+
+class Command(BaseCommand):
+    help = "Show shared LLM rate-limit buckets and queue wait metrics for this host"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Print the raw metrics as JSON",
+        )
+
+    def handle(self, *args, **options):
+        metrics = wait_metrics()
+
+        if options["json"]:
+            self.stdout.write(json.dumps(metrics, indent=2))
+            return
+
+        if not metrics:
+            self.stdout.write("No rate-limited LLM calls recorded yet.")
+            return
+
+        for key, entry in metrics.items():
+            self.stdout.write(
+                f"{key}: {entry['requests_available']} requests / {entry['tokens_available']} tokens available"
+            )
+            for priority in ("interactive", "background"):
+                stats = entry.get(priority)
+                if not stats:
+                    continue
+                self.stdout.write(
+                    f"  {priority:<11} {stats['count']:>6} calls  "
+                    f"mean wait {stats['mean_seconds']:.2f}s  max wait {stats['max_seconds']:.2f}s"
+                )
@@ -0,0 +1,106 @@
+import json
+import os
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+from fora.middleware import perf_log_path
+
+BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+def _percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def summarize(entries):
+    """Aggregate request log entries per endpoint: latency percentiles, histogram and means."""
+    grouped = defaultdict(list)
+    for entry in entries:
+        grouped[f"{entry['method']} {entry['endpoint']}"].append(entry)
+
+    rows = []
+    for endpoint, items in grouped.items():
+        walls = sorted(e["wall_ms"] for e in items)
+        histogram = [0] * (len(BUCKETS_MS) + 1)
+        for ms in walls:
+            histogram[next((i for i, b in enumerate(BUCKETS_MS) if ms <= b), len(BUCKETS_MS))] += 1
+        sizes = [e["bytes"] for e in items if e.get("bytes") is not None]
+        n = len(items)
+        rows.append({
+            "endpoint": endpoint,
+            "count": n,
+            "p50_ms": _percentile(walls, 0.5),
+            "p95_ms": _percentile(walls, 0.95),
+            "p99_ms": _percentile(walls, 0.99),
+            "max_ms": walls[-1],
+            "total_ms": round(sum(walls), 1),
+            "avg_queries": round(sum(e["queries"] for e in items) / n, 1),
+            "avg_db_ms": round(sum(e["db_ms"] for e in items) / n, 1),
+            "avg_llm_ms": round(sum(e["llm_ms"] for e in items) / n, 1),
+            "avg_kb": round(sum(sizes) / len(sizes) / 1024, 1) if sizes else None,
+            "errors": sum(1 for e in items if e["status"] >= 500),
+            "histogram": dict(zip([f"<={b}ms" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"], histogram)),
+        })
+    return rows
+
+
+class Command(BaseCommand):
+    help = "Show the slowest endpoints recorded by fora.middleware.PerformanceMiddleware"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=15, help="Number of endpoints to show")
+        parser.add_argument(
+            "--sort",
+            choices=["p95", "p99", "total", "count", "queries"],
+            default="p95",
+            help="Order by p95/p99 latency, total time spent, request count or mean query count",
+        )
+        parser.add_argument("--hours", type=float, default=None, help="Only requests from the last N hours")
+        parser.add_argument("--histogram", action="store_true", help="Also print each endpoint's latency histogram")
+        parser.add_argument("--json", action="store_true", help="Print the raw summary as JSON")
+
+    def handle(self, *args, **options):
+        path = perf_log_path()
+        since = time.time() - options["hours"] * 3600 if options["hours"] else None
+        entries = []
+        for candidate in (path + ".1", path):
+            if not os.path.exists(candidate):
+                continue
+            with open(candidate) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if since is None or entry["ts"] >= since:
+                        entries.append(entry)
+
+        if not entries:
+            self.stdout.write(f"No requests recorded in {path}. Is PERF_MONITORING=1 set?")
+            return
+
+        key = {"p95": "p95_ms", "p99": "p99_ms", "total": "total_ms", "count": "count", "queries": "avg_queries"}
+        rows = sorted(summarize(entries), key=lambda r: -r[key[options["sort"]]])[:options["limit"]]
+
+        if options["json"]:
+            self.stdout.write(json.dumps(rows, indent=2))
+            return
+
+        self.stdout.write(f"{len(entries)} requests from {path}\n")
+        self.stdout.write(
+            f"{'endpoint':<45} {'count':>6} {'p50':>8} {'p95':>8} {'p99':>8} "
+            f"{'queries':>8} {'db ms':>7} {'llm ms':>8} {'KB':>7} {'5xx':>4}"
+        )
+        for r in rows:
+            self.stdout.write(
+                f"{r['endpoint'][:45]:<45} {r['count']:>6} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} "
+                f"{r['avg_queries']:>8.1f} {r['avg_db_ms']:>7.1f} {r['avg_llm_ms']:>8.1f} "
+                f"{r['avg_kb'] if r['avg_kb'] is not None else '-':>7} {r['errors']:>4}"
+            )
+            if options["histogram"]:
+                peak = max(r["histogram"].values())
+                for bucket, count in r["histogram"].items():
+                    if count:
+                        self.stdout.write(f"    {bucket:>10} {count:>6} {'#' * max(1, round(40 * count / peak))}")
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from results import batches
+
+
+class Command(BaseCommand):
+    help = "Poll submitted LLM provider batches and merge finished ones into their results (see results.batches)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Poll once and exit instead of running as a worker")
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=batches.POLL_INTERVAL,
+            help=f"Seconds between polls (default {batches.POLL_INTERVAL})",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            finished = batches.poll()
+            if finished:
+                self.stdout.write(f"{finished} batch(es) finished.")
+            if options["once"]:
+                return
+            close_old_connections()
+            time.sleep(options["interval"])
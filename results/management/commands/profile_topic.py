@@ -0,0 +1,256 @@
+import cProfile
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from interview.models import Answer, Topic
+from results import embeddings, llm, ratelimit, services, stub
+from results.models import Result
+
+SAMPLE_INTERVAL = 0.005  # seconds between stack samples for --profiler sample
+
+STEPS = ["load", "discover", "classify", "sentiment", "summary", "save"]
+CATEGORIES = ["db_read", "db_write", "prompt", "llm_wait", "parse", "merge", "embeddings", "other"]
+
+# Functions timed as a category while the pipeline runs: (module, attribute, category).
+# Time in a category excludes anything nested in another one; the remainder of
+# each step (progress and checkpoint bookkeeping) counts as "other".
+TIMED = [
+    (services, "discover_prompts", "prompt"),
+    (services, "classify_system_prompt", "prompt"),
+    (services, "plan_classify_batches", "prompt"),
+    (services, "classify_user_prompt", "prompt"),
+    (services, "sentiment_prompts", "prompt"),
+    (services, "summary_prompts", "prompt"),
+    (services, "chat_system_prompt", "prompt"),
+    (ratelimit, "acquire", "llm_wait"),
+    (llm, "_call", "llm_wait"),
+    (llm, "parse_json", "parse"),
+    (services, "parse_assignments", "parse"),
+    (services, "_merge_assignments", "merge"),
+    (services, "_finalize_themes", "merge"),
+    (embeddings, "embed_texts", "embeddings"),
+]
+
+
+class StageClock:
+    """Exclusive wall time per (step, category)."""
+
+    def __init__(self):
+        self.totals = defaultdict(float)
+        self.stack = []
+        self.step_name = None
+        self.mark = 0.0
+
+    def _switch(self):
+        now = time.perf_counter()
+        if self.stack:
+            self.totals[(self.step_name, self.stack[-1])] += now - self.mark
+        self.mark = now
+
+    @contextmanager
+    def category(self, name):
+        if self.step_name is None:
+            yield
+            return
+        self._switch()
+        self.stack.append(name)
+        try:
+            yield
+        finally:
+            self._switch()
+            self.stack.pop()
+
+    @contextmanager
+    def step(self, name):
+        self.step_name = name
+        with self.category("other"):
+            yield
+        self.step_name = None
+
+    def timed(self, fn, category):
+        def wrapper(*args, **kwargs):
+            with self.category(category):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    def query(self, execute, sql, params, many, context):
+        category = "db_read" if sql.lstrip()[:6].upper() == "SELECT" else "db_write"
+        with self.category(category):
+            return execute(sql, params, many, context)
+
+
+class StackSampler:
+    """Samples the main thread's stack every SAMPLE_INTERVAL; writes folded stacks for flamegraph tools."""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.thread_id = threading.get_ident()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        while not self.stop_event.wait(SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                path = frame.f_code.co_filename
+                if path.startswith(root):
+                    path = os.path.relpath(path, root)
+                else:
+                    path = os.path.basename(path)
+                stack.append(f"{path}:{frame.f_code.co_name}")
+                frame = frame.f_back
+            self.counts[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+
+    def write(self, path):
+        with open(path, "w") as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class Command(BaseCommand):
+    help = "Run the analysis pipeline for one topic under a profiler and break its time down per stage"
+
+    def add_arguments(self, parser):
+        parser.add_argument("topic_id", type=int)
+        parser.add_argument(
+            "--profiler",
+            choices=["sample", "cprofile", "pyinstrument"],
+            default="sample",
+            help="sample: folded stacks for flamegraph.pl/speedscope; cprofile: .prof for snakeviz; "
+                 "pyinstrument: speedscope JSON (needs pyinstrument installed)",
+        )
+        parser.add_argument("--output", help="Profile file to write (default: temp dir)")
+        parser.add_argument("--stub", action="store_true", help="Use the offline stub provider instead of the configured one")
+        parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiplier on the stub's simulated latency")
+        parser.add_argument("--save", action="store_true", help="Keep the results; by default the save step is rolled back")
+
+    def handle(self, *args, **options):
+        try:
+            topic = Topic.objects.get(pk=options["topic_id"])
+        except Topic.DoesNotExist:
+            raise CommandError(f"Topic {options['topic_id']} does not exist")
+
+        if options["stub"]:
+            llm.PROVIDER = "stub"
+            stub.LATENCY_SCALE = options["latency_scale"]
+
+        profiler = options["profiler"]
+        extension = {"sample": "folded", "cprofile": "prof", "pyinstrument": "speedscope.json"}[profiler]
+        output = options["output"] or os.path.join(tempfile.gettempdir(), f"profile_topic_{topic.id}.{extension}")
+
+        if profiler == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+                from pyinstrument.renderers import SpeedscopeRenderer
+            except ImportError:
+                raise CommandError("pyinstrument is not installed (pip install pyinstrument)")
+            active = Profiler(interval=0.001)
+        elif profiler == "cprofile":
+            active = cProfile.Profile()
+        else:
+            active = StackSampler()
+
+        self.stdout.write(f"Profiling topic {topic.id} '{topic.name[:60]}' with {llm.current_provider()}/{llm.provider_model()}...")
+        clock = StageClock()
+        walls = {}
+        with ExitStack() as stack:
+            for module, attr, category in TIMED:
+                original = getattr(module, attr)
+                setattr(module, attr, clock.timed(original, category))
+                stack.callback(setattr, module, attr, original)
+            stack.enter_context(connection.execute_wrapper(clock.query))
+
+            active.enable() if profiler == "cprofile" else active.start()
+            try:
+                self._run_steps(topic, clock, walls, options["save"])
+            finally:
+                active.disable() if profiler == "cprofile" else active.stop()
+
+        if profiler == "pyinstrument":
+            with open(output, "w") as f:
+                f.write(active.output(renderer=SpeedscopeRenderer()))
+        elif profiler == "cprofile":
+            active.dump_stats(output)
+        else:
+            active.write(output)
+
+        self._report(clock, walls)
+        viewer = {
+            "sample": "flamegraph.pl or https://www.speedscope.app",
+            "cprofile": "snakeviz, or flameprof for a flamegraph",
+            "pyinstrument": "https://www.speedscope.app",
+        }[profiler]
+        self.stdout.write(f"\nProfile written to {output} (open with {viewer})")
+
+    def _run_steps(self, topic, clock, walls, save):
+        @contextmanager
+        def step(name):
+            start = time.perf_counter()
+            with clock.step(name):
+                yield
+            walls[name] = time.perf_counter() - start
+
+        with step("load"):
+            answer_count = Answer.objects.filter(topic=topic).count()
+            result = Result.objects.filter(topic=topic).first()
+        if answer_count == 0:
+            raise CommandError(f"Topic {topic.id} has no answers")
+
+        with step("discover"):
+            proposed = services.discover_themes_only(topic)
+        with step("classify"):
+            themes = services.run_classification_with_themes(topic, proposed)
+        sentiment = {}
+        if topic.analyze_sentiment:
+            with step("sentiment"):
+                sentiment = services.run_sentiment_analysis(topic)
+        with step("summary"):
+            summary = services.generate_summary(topic)
+
+        with step("save"), transaction.atomic():
+            result = result or Result(topic=topic)
+            result.proposed_themes = proposed
+            result.themes = themes
+            result.sentiment = sentiment
+            result.summary = summary
+            result.answer_count = answer_count
+            result.analyzed_at = timezone.now()
+            result.checkpoint = {}
+            result.progress = {}
+            result.status = 'completed'
+            result.save()
+            if not save:
+                transaction.set_rollback(True)
+
+    def _report(self, clock, walls):
+        total = sum(walls.values())
+        self.stdout.write(f"\n{'step':<10} {'wall s':>8} " + " ".join(f"{c:>10}" for c in CATEGORIES))
+        for name in STEPS:
+            if name not in walls:
+                continue
+            cells = " ".join(f"{clock.totals.get((name, c), 0.0):>10.3f}" for c in CATEGORIES)
+            self.stdout.write(f"{name:<10} {walls[name]:>8.3f} {cells}")
+        totals = " ".join(f"{sum(v for (s, c), v in clock.totals.items() if c == cat):>10.3f}" for cat in CATEGORIES)
+        self.stdout.write(f"{'total':<10} {total:>8.3f} {totals}")
+        if total:
+            shares = {cat: sum(v for (s, c), v in clock.totals.items() if c == cat) / total for cat in CATEGORIES}
+            top = sorted(shares.items(), key=lambda kv: -kv[1])[:3]
+            self.stdout.write("Most time: " + ", ".join(f"{cat} {share:.0%}" for cat, share in top))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from results import jobs
+
+
+class Command(BaseCommand):
+    help = "Mark analysis jobs whose worker stopped sending heartbeats as failed"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ttl",
+            type=int,
+            default=None,
+            help=f"Seconds without a heartbeat before a job counts as dead (default {jobs.HEARTBEAT_TTL})",
+        )
+
+    def handle(self, *args, **options):
+        if options["ttl"] is not None:
+            jobs.HEARTBEAT_TTL = options["ttl"]
+        reaped = jobs.reap_stale_jobs()
+        self.stdout.write(f"Reaped {reaped} stale job(s).")
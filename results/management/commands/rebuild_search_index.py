@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from results.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Recreate the answer full-text index and its sync triggers, and reindex all answers"
+
+    def handle(self, *args, **options):
+        if rebuild_index():
+            self.stdout.write(self.style.SUCCESS("Full-text index rebuilt."))
+        else:
+            self.stdout.write("This database has no full-text index; search uses substring matching.")
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.11 on 2026-10-19 10:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('results', '0009_result_analyzed_at_nullable'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='result',
+            name='checkpoint',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.11 on 2026-10-19 10:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview', '0017_topic_classifier'),
+        ('results', '0010_result_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnswerEmbedding',
+            fields=[
+                ('answer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='embedding', serialize=False, to='interview.answer')),
+                ('model', models.CharField(max_length=100)),
+                ('vector', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('topic', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='interview.topic')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['topic', 'model'], name='results_ans_topic_i_91beb0_idx')],
+            },
+        ),
+    ]
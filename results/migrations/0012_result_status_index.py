@@ -0,0 +1,17 @@
+# Generated by Django 5.2.11 on 2026-10-19 10:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('results', '0011_answerembedding'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['status'], name='analysis_an_status_cdcbdd_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.11 on 2026-10-19 10:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('results', '0012_result_status_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='result',
+            name='progress',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.11 on 2026-10-19 10:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('results', '0013_result_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='result',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='result',
+            name='owner',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+    ]
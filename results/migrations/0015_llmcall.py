@@ -0,0 +1,37 @@
+# Generated by Django 5.2.11 on 2026-10-19 10:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview', '0020_interview_completed_sessions'),
+        ('results', '0014_result_heartbeat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LLMCall',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('provider', models.CharField(max_length=30)),
+                ('model', models.CharField(max_length=100)),
+                ('task', models.CharField(blank=True, default='', max_length=30)),
+                ('latency_ms', models.PositiveIntegerField()),
+                ('queue_ms', models.PositiveIntegerField(default=0)),
+                ('input_tokens', models.PositiveIntegerField(default=0)),
+                ('output_tokens', models.PositiveIntegerField(default=0)),
+                ('cached_tokens', models.PositiveIntegerField(default=0)),
+                ('cost_usd', models.FloatField(default=0)),
+                ('retries', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('interview', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='interview.interview')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['interview', 'created_at'], name='results_llm_intervi_cb49f7_idx')],
+            },
+        ),
+    ]
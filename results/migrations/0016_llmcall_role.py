@@ -0,0 +1,23 @@
+# Generated by Django 5.2.11 on 2026-10-19 11:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('results', '0015_llmcall'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='llmcall',
+            name='discarded',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='llmcall',
+            name='role',
+            field=models.CharField(blank=True, default='', max_length=10),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.11 on 2026-10-19 11:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview', '0021_interview_llm_routes'),
+        ('results', '0016_llmcall_role'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LLMBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('provider', models.CharField(max_length=30)),
+                ('model', models.CharField(max_length=100)),
+                ('external_id', models.CharField(blank=True, default='', max_length=200)),
+                ('status', models.CharField(default='submitted', max_length=20)),
+                ('requests', models.JSONField(default=dict)),
+                ('outputs', models.JSONField(blank=True, default=dict)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('error', models.TextField(blank=True, default='')),
+                ('interview', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='interview.interview')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status'], name='results_llm_status_04d9f2_idx')],
+            },
+        ),
+    ]
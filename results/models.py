@@ -1,6 +1,7 @@
 from django.db import models
 
-from interview.models import Topic
+from interview.models import Answer, Interview, Topic
+from results import events
 
 
 class Result(models.Model):
@@ -16,13 +17,98 @@ class Result(models.Model):
     # Sentiment results
     sentiment = models.JSONField(default=dict)  # {average: 0.65, answers: [{id, score}, ...]}
 
+    # Completed Pass 2 batches, so a failed run can resume:
+    # {themes_key, assignments: {answer_id: [[theme_number, excerpt], ...]}}
+    checkpoint = models.JSONField(default=dict, blank=True)
+
+    # Live progress of a running job, streamed to the dashboard:
+    # {stage, started_at, updated_at, batches_done, batches_total, answers_done,
+    #  answers_total, input_tokens, output_tokens, eta_seconds}
+    progress = models.JSONField(default=dict, blank=True)
+
     # Metadata
     analyzed_at = models.DateTimeField(null=True, blank=True)
     answer_count = models.IntegerField(default=0)
     status = models.CharField(max_length=20, default='pending')  # pending, running, discovering, editing, classifying, completed, failed
 
+    # Worker running the job (host:pid) and its last sign of life; see results.jobs
+    owner = models.CharField(max_length=100, blank=True, default='')
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+
     class Meta:
         db_table = 'analysis_analysisresult'
+        indexes = [models.Index(fields=['status'])]
 
     def __str__(self):
         return f"Result for: {self.topic}"
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        events.publish(f"topic-{self.topic_id}")
+
+
+class AnswerEmbedding(models.Model):
+    """Embedding of one answer's text, stored as raw float32 bytes."""
+    answer = models.OneToOneField(Answer, on_delete=models.CASCADE, primary_key=True, related_name='embedding')
+    topic = models.ForeignKey(Topic, on_delete=models.CASCADE, related_name='+')  # denormalized for per-topic index builds
+    model = models.CharField(max_length=100)
+    vector = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['topic', 'model'])]
+
+    def __str__(self):
+        return f"Embedding for answer {self.answer_id}"
+
+
+class LLMCall(models.Model):
+    """One results.llm.generate() call, including its retries."""
+    created_at = models.DateTimeField(auto_now_add=True)
+    interview = models.ForeignKey(Interview, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    provider = models.CharField(max_length=30)
+    model = models.CharField(max_length=100)
+    task = models.CharField(max_length=30, blank=True, default='')  # analyzer, interviewer, classify, chat, ...
+
+    latency_ms = models.PositiveIntegerField()       # wall time of the call, retries included
+    queue_ms = models.PositiveIntegerField(default=0)  # of which waiting on the rate limiter
+    input_tokens = models.PositiveIntegerField(default=0)
+    output_tokens = models.PositiveIntegerField(default=0)
+    cached_tokens = models.PositiveIntegerField(default=0)  # input tokens served from the provider's prompt cache
+    cost_usd = models.FloatField(default=0)
+    retries = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True, default='')  # final error if the call failed
+    # "primary"/"hedge" when a hedge was sent for the request, "failover" when
+    # the call went to the route's fallback instead of the primary, "batch" for
+    # a request answered through a provider batch (results.batches).
+    role = models.CharField(max_length=10, blank=True, default='')
+    discarded = models.BooleanField(default=False)  # answered, but the other call of a hedged pair won
+
+    class Meta:
+        indexes = [models.Index(fields=['interview', 'created_at'])]
+
+    def __str__(self):
+        return f"{self.provider}/{self.model} {self.task or 'call'} {self.latency_ms}ms"
+
+
+class LLMBatch(models.Model):
+    """A provider batch job with an interview's classification and sentiment requests; see results.batches."""
+    created_at = models.DateTimeField(auto_now_add=True)
+    interview = models.ForeignKey(Interview, on_delete=models.CASCADE, related_name='+')
+    provider = models.CharField(max_length=30)
+    model = models.CharField(max_length=100)
+    external_id = models.CharField(max_length=200, blank=True, default='')  # the provider's batch id
+    status = models.CharField(max_length=20, default='submitted')  # submitted, completed or failed, merging, merged
+
+    # {custom_id: {topic_id, kind: "classify"|"sentiment", answer_ids}} for every request in the batch
+    requests = models.JSONField(default=dict)
+    # {custom_id: {text, usage} | {error}} once the provider has finished the batch
+    outputs = models.JSONField(default=dict, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+
+    class Meta:
+        indexes = [models.Index(fields=['status'])]
+
+    def __str__(self):
+        return f"{self.provider}/{self.model} batch {self.external_id or self.pk} ({self.status})"
@@ -0,0 +1,236 @@
+"""
+LLM provider backends and the registry that configures them.
+
+A provider is a named configuration: the backend that talks to it, the model,
+and backend options such as "base_url" or "api_key". PROVIDERS holds the
+built-in ones; settings.LLM_PROVIDERS overrides their options or adds new
+providers. Any OpenAI-compatible server (llama.cpp, vLLM, Ollama, ...) is
+just the "openai" backend with a base_url:
+
+    LLM_PROVIDERS = {
+        "local": {"backend": "openai", "base_url": "http://localhost:8000/v1", "model": "qwen2.5-7b-instruct"},
+    }
+
+A provider may also carry "token_budget", "rate_limit" and "price" entries,
+used when results.llm's TOKEN_BUDGETS / RATE_LIMITS / PRICES have none for it.
+
+New backends are functions registered with @backend("name"). They take
+(config, system_prompt, user_prompt, json_mode, history, task) and return
+(text, usage), usage being {input_tokens, output_tokens, cached_tokens} with
+input_tokens including the cached ones. json_mode is False, True, or a
+{"name", "schema"} dict the response must follow, which backends pass to
+their provider's structured-output mode. Retries are handled by
+results.llm.generate().
+"""
+
+import json
+
+REQUEST_TIMEOUT = 180.0  # seconds
+
+# When True, every provider is answered by the stub backend impersonating its
+# model (results.stub.MODEL_SPEEDS), so routing setups can be compared offline.
+SIMULATE = False
+
+PROVIDERS = {
+    "openai": {"backend": "openai", "model": "gpt-4o", "api_key_setting": "OPENAI_API_KEY"},
+    "gemini": {"backend": "gemini", "model": "gemini-3-flash-preview", "api_key_setting": "GEMINI_API_KEY"},
+    "anthropic": {"backend": "anthropic", "model": "claude-sonnet-4-6", "api_key_setting": "ANTHROPIC_API_KEY"},
+    "stub": {"backend": "stub", "model": "stub"},
+}
+
+_backends = {}
+
+
+def backend(name):
+    """Register the decorated function as the backend called name."""
+    def register(fn):
+        _backends[name] = fn
+        return fn
+    return register
+
+
+def provider_names():
+    from django.conf import settings
+    return sorted(set(PROVIDERS) | set(getattr(settings, "LLM_PROVIDERS", {}) or {}))
+
+
+def provider_config(name):
+    """The merged configuration for provider name. Raises ValueError for unknown providers or backends."""
+    from django.conf import settings
+
+    overrides = (getattr(settings, "LLM_PROVIDERS", {}) or {}).get(name)
+    if name not in PROVIDERS and overrides is None:
+        raise ValueError(f"Unknown LLM provider: {name!r} (configured: {', '.join(provider_names())})")
+    config = {**PROVIDERS.get(name, {}), **(overrides or {}), "name": name}
+    if config.get("backend") not in _backends:
+        raise ValueError(f"LLM provider {name!r} has unknown backend {config.get('backend')!r}")
+    if not config.get("model"):
+        raise ValueError(f"LLM provider {name!r} has no model configured")
+    return config
+
+
+def call(provider, model, system_prompt, user_prompt, json_mode, history, task=None):
+    """Make a single request to provider with model. Returns (text, usage)."""
+    config = provider_config(provider)
+    if model:
+        config["model"] = model
+    fn = _backends["stub" if SIMULATE else config["backend"]]
+    return fn(config, system_prompt, user_prompt, json_mode, history, task)
+
+
+def _api_key(config):
+    from django.conf import settings
+
+    return config.get("api_key") or getattr(settings, config.get("api_key_setting", ""), "")
+
+
+@backend("stub")
+def _stub(config, system_prompt, user_prompt, json_mode, history, task):
+    from results import stub
+    return stub.respond(
+        system_prompt, user_prompt, json_mode=json_mode, history=history, task=task, model=config["model"],
+    )
+
+
+def openai_client(config):
+    from openai import OpenAI
+
+    # Local OpenAI-compatible servers usually ignore the key, but the client requires one.
+    api_key = _api_key(config) or ("unused" if config.get("base_url") else "")
+    return OpenAI(
+        api_key=api_key,
+        base_url=config.get("base_url") or None,
+        max_retries=0,
+        timeout=config.get("timeout", REQUEST_TIMEOUT),
+    )
+
+
+def openai_request(config, system_prompt, user_prompt, json_mode, history):
+    """Chat Completions request body, as sent interactively and in batch files."""
+    messages = [{"role": "system", "content": system_prompt}]
+    for msg in history:
+        messages.append({"role": msg["role"], "content": msg["content"]})
+    messages.append({"role": "user", "content": user_prompt})
+    body = {"model": config["model"], "messages": messages}
+    if isinstance(json_mode, dict):
+        body["response_format"] = {
+            "type": "json_schema",
+            "json_schema": {"name": json_mode["name"], "schema": json_mode["schema"], "strict": True},
+        }
+    elif json_mode:
+        body["response_format"] = {"type": "json_object"}
+    return body
+
+
+@backend("openai")
+def _openai(config, system_prompt, user_prompt, json_mode, history, task):
+    client = openai_client(config)
+    response = client.chat.completions.create(**openai_request(config, system_prompt, user_prompt, json_mode, history))
+    usage = response.usage
+    details = getattr(usage, "prompt_tokens_details", None)
+    return response.choices[0].message.content, {
+        "input_tokens": usage.prompt_tokens if usage else 0,
+        "output_tokens": usage.completion_tokens if usage else 0,
+        "cached_tokens": (getattr(details, "cached_tokens", 0) or 0) if details else 0,
+    }
+
+
+@backend("gemini")
+def _gemini(config, system_prompt, user_prompt, json_mode, history, task):
+    from google import genai
+    from google.genai import types
+
+    http_options = {"timeout": int(config.get("timeout", REQUEST_TIMEOUT) * 1000)}
+    if config.get("base_url"):
+        http_options["base_url"] = config["base_url"]
+    client = genai.Client(api_key=_api_key(config), http_options=types.HttpOptions(**http_options))
+    if history:
+        contents = []
+        for msg in history:
+            role = "user" if msg["role"] == "user" else "model"
+            contents.append(types.Content(role=role, parts=[types.Part(text=msg["content"])]))
+        contents.append(types.Content(role="user", parts=[types.Part(text=user_prompt)]))
+    else:
+        contents = user_prompt
+    response = client.models.generate_content(
+        model=config["model"],
+        contents=contents,
+        config=types.GenerateContentConfig(
+            system_instruction=system_prompt,
+            response_mime_type="application/json" if json_mode else "text/plain",
+            response_json_schema=json_mode["schema"] if isinstance(json_mode, dict) else None,
+        ),
+    )
+    usage = response.usage_metadata
+    return response.text, {
+        "input_tokens": (usage.prompt_token_count or 0) if usage else 0,
+        "output_tokens": (usage.candidates_token_count or 0) if usage else 0,
+        "cached_tokens": (usage.cached_content_token_count or 0) if usage else 0,
+    }
+
+
+def anthropic_client(config):
+    import anthropic
+
+    return anthropic.Anthropic(
+        api_key=_api_key(config),
+        base_url=config.get("base_url") or None,
+        max_retries=0,
+        timeout=config.get("timeout", REQUEST_TIMEOUT),
+    )
+
+
+def anthropic_request(config, system_prompt, user_prompt, json_mode, history):
+    """
+    Messages request params, as sent interactively and in message batches. A
+    schema is enforced by forcing a call to a tool taking it as input; see
+    anthropic_text().
+    """
+    sys = system_prompt
+    if json_mode is True:
+        sys += "\n\nRespond only with valid JSON. No other text."
+    messages = []
+    for msg in history:
+        messages.append({"role": msg["role"], "content": msg["content"]})
+    messages.append({"role": "user", "content": user_prompt})
+    params = {
+        "model": config["model"],
+        "max_tokens": config.get("max_tokens", 8192),
+        "system": sys,
+        "messages": messages,
+    }
+    if isinstance(json_mode, dict):
+        params["tools"] = [{
+            "name": json_mode["name"],
+            "description": "Record the response.",
+            "input_schema": json_mode["schema"],
+        }]
+        params["tool_choice"] = {"type": "tool", "name": json_mode["name"]}
+    return params
+
+
+@backend("anthropic")
+def _anthropic(config, system_prompt, user_prompt, json_mode, history, task):
+    client = anthropic_client(config)
+    response = client.messages.create(**anthropic_request(config, system_prompt, user_prompt, json_mode, history))
+    return anthropic_text(response), anthropic_usage(response.usage)
+
+
+def anthropic_text(message):
+    """A Messages response's text, or the input of its tool call when the request carried a schema."""
+    from results.llm import _strip_fences
+
+    for block in message.content:
+        if block.type == "tool_use":
+            return json.dumps(block.input)
+    return _strip_fences(message.content[0].text)
+
+
+def anthropic_usage(usage):
+    cached = getattr(usage, "cache_read_input_tokens", 0) or 0
+    written = getattr(usage, "cache_creation_input_tokens", 0) or 0
+    return {
+        "input_tokens": usage.input_tokens + cached + written,
+        "output_tokens": usage.output_tokens,
+        "cached_tokens": cached,
+    }
@@ -0,0 +1,180 @@
+"""
+Cross-process token-bucket rate limiting for LLM calls.
+
+Each (provider, model) pair has a request bucket (RPM) and a token bucket
+(TPM). Bucket state lives in a small JSON file per key under
+settings.LLM_RATE_LIMIT_DIR, guarded by an exclusive file lock, so every
+gunicorn worker and management command on the host draws from the same budget.
+
+Interactive calls (live interview turns, chat) may drain the buckets to zero.
+Background calls (analysis passes) leave BACKGROUND_RESERVE of each bucket
+untouched, or wait for a full bucket when they are too large to, and also
+stand aside while an interactive call is waiting.
+
+Queue wait times are recorded in the same state file; see wait_metrics().
+"""
+
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to a process-local lock
+    fcntl = None
+
+BACKGROUND_RESERVE = 0.2
+WAITER_TTL = 30.0  # seconds an interactive waiter blocks background calls without refreshing
+WAIT_BUCKETS = [0.1, 0.5, 1, 2, 5, 10, 30, 60]
+
+_local_lock = threading.Lock()
+
+
+def _state_dir():
+    from django.conf import settings
+    path = getattr(settings, "LLM_RATE_LIMIT_DIR", None) or os.path.join(tempfile.gettempdir(), "fora-llm-ratelimit")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _state_path(provider, model):
+    key = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{provider}-{model}")
+    return os.path.join(_state_dir(), f"{key}.json")
+
+
+@contextmanager
+def _locked_state(provider, model):
+    """Yield the mutable state dict for a key, holding the lock; written back on exit."""
+    with _locked_file(_state_path(provider, model)) as state:
+        yield state
+
+
+@contextmanager
+def _locked_file(path):
+    """Yield the JSON dict stored at path under an exclusive cross-process lock; written back on exit."""
+    with _local_lock, open(path, "a+") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            f.seek(0)
+            try:
+                state = json.loads(f.read() or "{}")
+            except json.JSONDecodeError:
+                state = {}
+            yield state
+            f.seek(0)
+            f.truncate()
+            f.write(json.dumps(state))
+            f.flush()
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _refill(state, limits, now):
+    rpm, tpm = limits["rpm"], limits["tpm"]
+    if "updated" not in state:
+        state.update(requests=float(rpm), tokens=float(tpm), updated=now)
+        return
+    elapsed = max(0.0, now - state["updated"])
+    state["requests"] = min(float(rpm), state["requests"] + elapsed * rpm / 60)
+    state["tokens"] = min(float(tpm), state["tokens"] + elapsed * tpm / 60)
+    state["updated"] = now
+
+
+def _record_wait(state, priority, waited):
+    stats = state.setdefault("waits", {}).setdefault(
+        priority, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0, "buckets": {}}
+    )
+    stats["count"] += 1
+    stats["total_seconds"] += waited
+    stats["max_seconds"] = max(stats["max_seconds"], waited)
+    bound = next((b for b in WAIT_BUCKETS if waited <= b), "inf")
+    stats["buckets"][str(bound)] = stats["buckets"].get(str(bound), 0) + 1
+
+
+def acquire(provider, model, tokens, limits, interactive=False):
+    """
+    Block until one request and `tokens` tokens are available for provider/model.
+
+    limits: {"rpm": int, "tpm": int}, or None to skip limiting.
+    Returns the number of seconds spent waiting in the queue.
+    """
+    if not limits:
+        return 0.0
+
+    priority = "interactive" if interactive else "background"
+    waiter_id = f"{os.getpid()}-{threading.get_ident()}"
+    start = time.time()
+    while True:
+        with _locked_state(provider, model) as state:
+            now = time.time()
+            _refill(state, limits, now)
+            waiters = {k: v for k, v in state.get("interactive_waiters", {}).items() if v > now}
+
+            reserve = 0.0 if interactive else BACKGROUND_RESERVE
+            charge = min(tokens, limits["tpm"])
+            # A request too large to leave the reserve untouched is admitted
+            # once the bucket is full, rather than never.
+            need_requests = min(1 + reserve * limits["rpm"], limits["rpm"])
+            need_tokens = min(charge + reserve * limits["tpm"], limits["tpm"])
+            yielding = not interactive and waiters
+            if not yielding and state["requests"] >= need_requests and state["tokens"] >= need_tokens:
+                state["requests"] -= 1
+                state["tokens"] -= charge
+                waiters.pop(waiter_id, None)
+                state["interactive_waiters"] = waiters
+                waited = now - start
+                _record_wait(state, priority, waited)
+                return waited
+
+            if interactive:
+                waiters[waiter_id] = now + WAITER_TTL
+            state["interactive_waiters"] = waiters
+            deficit = max(
+                (need_requests - state["requests"]) * 60 / limits["rpm"],
+                (need_tokens - state["tokens"]) * 60 / limits["tpm"],
+                0.0,
+            )
+        time.sleep(min(max(deficit, 0.05), 1.0))
+
+
+def throttle(provider, model, limits):
+    """Empty the request bucket after a provider 429 so every process backs off."""
+    if not limits:
+        return
+    with _locked_state(provider, model) as state:
+        _refill(state, limits, time.time())
+        state["requests"] = 0.0
+
+
+def wait_metrics():
+    """
+    Return queue wait metrics for every provider/model seen on this host:
+    {"<provider>-<model>": {"interactive"|"background": {count, total_seconds,
+    max_seconds, mean_seconds, buckets}}}.
+    """
+    metrics = {}
+    directory = _state_dir()
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(directory, name)) as f:
+            try:
+                state = json.loads(f.read() or "{}")
+            except json.JSONDecodeError:
+                continue
+        waits = state.get("waits", {})
+        for stats in waits.values():
+            stats["mean_seconds"] = stats["total_seconds"] / stats["count"] if stats["count"] else 0.0
+        metrics[name[:-len(".json")]] = {
+            **waits,
+            "requests_available": math.floor(state.get("requests", 0)),
+            "tokens_available": math.floor(state.get("tokens", 0)),
+        }
+    return metrics
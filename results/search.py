@@ -0,0 +1,167 @@
+"""
+Ranked full-text search over answers.
+
+Backed by the FTS5 table interview_answer_fts on SQLite and the GIN
+to_tsvector('simple', text) index on PostgreSQL (see interview migration
+0018). Other databases fall back to an unranked substring match.
+"""
+
+import json
+import re
+from collections import Counter
+
+from django.db import connection
+from django.db.models import Q
+
+from interview.models import Answer
+from results.models import Result
+
+MAX_PAGE_SIZE = 200
+RRF_K = 60
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+SQLITE_INDEX = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS interview_answer_fts USING fts5(
+        text, content='interview_answer', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS interview_answer_fts_ai AFTER INSERT ON interview_answer BEGIN
+        INSERT INTO interview_answer_fts(rowid, text) VALUES (new.id, new.text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS interview_answer_fts_ad AFTER DELETE ON interview_answer BEGIN
+        INSERT INTO interview_answer_fts(interview_answer_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS interview_answer_fts_au AFTER UPDATE OF text ON interview_answer BEGIN
+        INSERT INTO interview_answer_fts(interview_answer_fts, rowid, text) VALUES ('delete', old.id, old.text);
+        INSERT INTO interview_answer_fts(rowid, text) VALUES (new.id, new.text);
+    END""",
+    "INSERT INTO interview_answer_fts(interview_answer_fts) VALUES ('rebuild')",
+]
+
+POSTGRES_INDEX = [
+    "CREATE INDEX IF NOT EXISTS interview_answer_text_fts ON interview_answer USING gin (to_tsvector('simple', text))",
+]
+
+
+def rebuild_index():
+    """(Re)create the full-text index and its sync triggers, then reindex every answer."""
+    statements = {'sqlite': SQLITE_INDEX, 'postgresql': POSTGRES_INDEX}.get(connection.vendor, [])
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+    return bool(statements)
+
+
+def theme_answer_ids(topic_id, theme_name):
+    """Answer ids assigned to a theme in a topic's stored Result, or None if there is no such theme."""
+    result = Result.objects.filter(topic_id=topic_id).only('themes').first()
+    for theme in (result.themes if result else []):
+        if theme.get('name') == theme_name:
+            return theme.get('answer_ids', [])
+    return None
+
+
+def search_answers(query, interview_id=None, topic_id=None, answer_ids=None, page=1, page_size=50, match_any=False):
+    """
+    Keyword search over answer text, best match first.
+
+    Scope by interview_id, topic_id and/or an explicit answer_ids list (e.g. a
+    theme's answers). By default every term must match; match_any=True ranks
+    answers containing any of them (for natural-language questions).
+    Returns {"results": [{id, topic_id, text, rank}], "page", "page_size",
+    "has_more"}. rank is higher-is-better.
+    """
+    page = max(int(page), 1)
+    page_size = min(max(int(page_size), 1), MAX_PAGE_SIZE)
+    terms = _TERM.findall(query or "")
+    if not terms or answer_ids == []:
+        return {"results": [], "page": page, "page_size": page_size, "has_more": False}
+
+    filters, params = [], []
+    if interview_id is not None:
+        filters.append("t.interview_id = %s")
+        params.append(interview_id)
+    if topic_id is not None:
+        filters.append("a.topic_id = %s")
+        params.append(topic_id)
+
+    if connection.vendor == 'sqlite':
+        if answer_ids is not None:
+            filters.append("a.id IN (SELECT value FROM json_each(%s))")
+            params.append(json.dumps(list(answer_ids)))
+        # Quote every term so user input can't inject FTS5 syntax; prefix-match each.
+        match = (" OR " if match_any else " ").join(f'"{term}"*' for term in terms)
+        sql = f"""
+            SELECT a.id, a.topic_id, a.text, -bm25(interview_answer_fts) AS rank
+            FROM interview_answer_fts
+            JOIN interview_answer a ON a.id = interview_answer_fts.rowid
+            JOIN interview_topic t ON t.id = a.topic_id
+            WHERE interview_answer_fts MATCH %s {''.join(' AND ' + f for f in filters)}
+            ORDER BY bm25(interview_answer_fts)
+            LIMIT %s OFFSET %s"""
+        params = [match, *params]
+    elif connection.vendor == 'postgresql':
+        if answer_ids is not None:
+            filters.append("a.id = ANY(%s)")
+            params.append(list(answer_ids))
+        sql = f"""
+            SELECT a.id, a.topic_id, a.text, ts_rank_cd(to_tsvector('simple', a.text), q) AS rank
+            FROM interview_answer a
+            JOIN interview_topic t ON t.id = a.topic_id,
+                 to_tsquery('simple', %s) q
+            WHERE to_tsvector('simple', a.text) @@ q {''.join(' AND ' + f for f in filters)}
+            ORDER BY rank DESC, a.id
+            LIMIT %s OFFSET %s"""
+        params = [(" | " if match_any else " & ").join(terms), *params]
+    else:
+        return _fallback_search(terms, interview_id, topic_id, answer_ids, page, page_size, match_any)
+
+    params += [page_size + 1, (page - 1) * page_size]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    return {
+        "results": [
+            {"id": aid, "topic_id": tid, "text": text, "rank": round(float(rank), 4)}
+            for aid, tid, text, rank in rows[:page_size]
+        ],
+        "page": page,
+        "page_size": page_size,
+        "has_more": len(rows) > page_size,
+    }
+
+
+def _fallback_search(terms, interview_id, topic_id, answer_ids, page, page_size, match_any):
+    qs = Answer.objects.all()
+    if interview_id is not None:
+        qs = qs.filter(topic__interview_id=interview_id)
+    if topic_id is not None:
+        qs = qs.filter(topic_id=topic_id)
+    if answer_ids is not None:
+        qs = qs.filter(id__in=answer_ids)
+    if match_any:
+        any_term = Q()
+        for term in terms:
+            any_term |= Q(text__icontains=term)
+        qs = qs.filter(any_term)
+    else:
+        for term in terms:
+            qs = qs.filter(text__icontains=term)
+    offset = (page - 1) * page_size
+    rows = list(qs.order_by('id').values('id', 'topic_id', 'text')[offset:offset + page_size + 1])
+    return {
+        "results": [{**row, "rank": 0.0} for row in rows[:page_size]],
+        "page": page,
+        "page_size": page_size,
+        "has_more": len(rows) > page_size,
+    }
+
+
+def reciprocal_rank_fusion(*rankings):
+    """Merge several best-first rankings of ids into one, best first."""
+    fused = Counter()
+    for ranking in rankings:
+        for rank, item in enumerate(ranking):
+            fused[item] += 1 / (RRF_K + rank + 1)
+    return [item for item, _ in fused.most_common()]
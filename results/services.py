@@ -1,18 +1,88 @@
+import hashlib
 import json
+import re
+from datetime import datetime
+from time import monotonic
+
+from django.db.models import Count, Sum
+from django.db.models.functions import Length
+from django.utils import timezone
 
 from interview.models import Answer, Topic
-from results.llm import generate
+from results import events
+from results.models import AnswerEmbedding, Result
+from results.llm import LLMResponseError, generate, generate_json, token_budget
+from results.search import reciprocal_rank_fusion, search_answers
+from results.tokens import CHARS_PER_TOKEN, estimate_classify_output, estimate_tokens, pack_batches
 
 
+# "adaptive" packs answers up to the provider/model token budget;
+# "fixed" uses BATCH_SIZE answers per request.
+BATCHING = "adaptive"
 BATCH_SIZE = 50
+MAX_BATCH_SIZE = 200
 MAX_THEMES = 12
 
+# Result.checkpoint is written at most this often while classifying. Each
+# write stores every assignment so far, so writing after every batch would be
+# quadratic in the topic's size; a crash loses at most this much work.
+CHECKPOINT_INTERVAL = 30  # seconds
+
+# Cosine-similarity thresholds for the embedding classifier (Topic.classifier
+# == "embedding"). An answer whose best theme scores >= EMBEDDING_ACCEPT is
+# assigned to every theme above it; one scoring < EMBEDDING_REJECT gets no
+# theme; anything in between goes to the LLM. Calibrate for the embedding
+# model with `python -m benchmarks.classifier`.
+EMBEDDING_ACCEPT = 0.55
+EMBEDDING_REJECT = 0.25
+
+# Chat sends every answer while they fit in CHAT_FULL_CONTEXT_TOKENS; beyond
+# that it retrieves up to CHAT_RETRIEVAL_TOKENS worth of relevant answers.
+CHAT_FULL_CONTEXT_TOKENS = 20000
+CHAT_RETRIEVAL_TOKENS = 8000
+CHAT_RETRIEVAL_CANDIDATES = 200
+
+# Response schema for classification, enforced through the provider's
+# structured-output mode. Each match is [theme_number, start, end], the
+# excerpt given as character offsets into the answer (see parse_assignments).
+CLASSIFY_SCHEMA = {
+    "name": "classification",
+    "schema": {
+        "type": "object",
+        "properties": {
+            "assignments": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "integer"},
+                        "m": {"type": "array", "items": {"type": "array", "items": {"type": "integer"}}},
+                    },
+                    "required": ["id", "m"],
+                    "additionalProperties": False,
+                },
+            },
+        },
+        "required": ["assignments"],
+        "additionalProperties": False,
+    },
+}
+
 
 def _discover_themes(answers, question_text, custom_prompt=None):
     """
     Pass 1: Send ALL answers to discover themes. No sampling.
     Returns list of theme dicts: [{name, description, answer_ids: [], excerpts: {}}]
     """
+    system_prompt, user_prompt = discover_prompts(answers, question_text, custom_prompt)
+    raw = generate_json(system_prompt, user_prompt, task="discover")
+    themes = raw.get("themes", [])
+    print(f"  [themes] discovered {len(themes)} themes: {[t['name'] for t in themes]}")
+    return [{"name": t["name"], "description": t["description"], "answer_ids": [], "excerpts": {}} for t in themes]
+
+
+def discover_prompts(answers, question_text, custom_prompt=None):
+    """(system_prompt, user_prompt) asking for the themes in answers."""
     answers_text = "\n".join([f"[ID: {a['id']}] {a['text']}" for a in answers])
 
     custom_instructions = f"\nADDITIONAL INSTRUCTIONS FROM RESEARCHER:\n{custom_prompt.strip()}" if custom_prompt and custom_prompt.strip() else ""
@@ -39,71 +109,265 @@ Respond in JSON format:
 }}"""
 
     user_prompt = f"Analyze these interview answers for the question \"{question_text}\" and identify the main underlying themes:\n\n{answers_text}"
-
-    raw = json.loads(generate(system_prompt, user_prompt, json_mode=True))
-    themes = raw.get("themes", [])
-    print(f"  [themes] discovered {len(themes)} themes: {[t['name'] for t in themes]}")
-    return [{"name": t["name"], "description": t["description"], "answer_ids": [], "excerpts": {}} for t in themes]
+    return system_prompt, user_prompt
 
 
-def _classify_answers(answers, themes):
-    """
-    Pass 2: Classify all answers into discovered themes in batches of BATCH_SIZE.
-    Modifies themes in-place: appends to answer_ids and fills excerpts dict.
-    """
-    if not themes:
-        return
-
+def classify_system_prompt(themes):
+    """Build the Pass 2 system prompt listing the numbered themes."""
     theme_ref = "\n".join([
         f"{i + 1}. {t['name']}: {t['description']}"
         for i, t in enumerate(themes)
     ])
 
-    system_prompt = f"""You are a qualitative research assistant performing thematic coding.
+    return f"""You are a qualitative research assistant performing thematic coding.
 
 THEMES:
 {theme_ref}
 
-For each answer, identify which theme numbers apply (can be multiple, or empty list if none fit).
-For each matched theme, extract a short verbatim excerpt from the answer that relates to it.
+For each answer, identify which theme numbers apply (can be multiple, or none if no theme fits).
+For each matched theme, mark the short phrase of the answer that relates to it by its character
+offsets: start is the index of its first character and end the index just after its last,
+counting from 0 at the start of the answer text (after the "[ID: n] " prefix).
 
-Respond in JSON format:
-{{
-  "assignments": [
-    {{
-      "id": <answer_id as integer>,
-      "themes": [
-        {{"number": <theme_number>, "excerpt": "<verbatim phrase from the answer>"}}
-      ]
-    }}
-  ]
-}}
+Respond in JSON format, one entry per answer with each match as [theme_number, start, end]:
+{{"assignments": [{{"id": 12, "m": [[3, 0, 41], [5, 43, 80]]}}, {{"id": 13, "m": []}}]}}
 
-Include every answer ID in the response even if it matches no themes (use empty themes list).
+Include every answer ID in the response even if it matches no themes (use an empty list).
 Use only theme numbers 1 to {len(themes)}."""
 
-    total_batches = (len(answers) + BATCH_SIZE - 1) // BATCH_SIZE
-    for batch_start in range(0, len(answers), BATCH_SIZE):
-        batch = answers[batch_start:batch_start + BATCH_SIZE]
-        batch_num = batch_start // BATCH_SIZE + 1
-        print(f"  [classify] batch {batch_num}/{total_batches} ({len(batch)} answers)...")
 
-        answers_text = "\n".join([f"[ID: {a['id']}] {a['text']}" for a in batch])
-        result = json.loads(generate(system_prompt, f"Classify these answers:\n\n{answers_text}", json_mode=True))
+def _classify_answers(answers, themes, checkpoint=None, on_batch=None):
+    """
+    Pass 2: Classify all answers into discovered themes in token-budgeted batches.
+    Modifies themes in-place: appends to answer_ids and fills excerpts dict.
+
+    checkpoint: optional {str(answer_id): [[theme_number, excerpt], ...]} of
+    answers classified by an earlier, interrupted run. Those answers are not
+    sent again; newly classified answers are added to it and
+    on_batch(checkpoint, progress=...) is called after every completed batch so
+    the caller can persist it. progress counts batches and answers done so far
+    and the estimated input/output tokens sent.
+    """
+    if not themes:
+        return
+
+    checkpoint = {} if checkpoint is None else checkpoint
+    pending = [a for a in answers if str(a["id"]) not in checkpoint]
+    if len(pending) < len(answers):
+        print(f"  [classify] resuming — {len(answers) - len(pending)}/{len(answers)} answers already classified")
+
+    system_prompt = classify_system_prompt(themes)
+    batches = plan_classify_batches(pending, system_prompt)
+    total_batches = len(batches)
+    truncated_batches = 0
+    progress = {
+        "batches_done": 0,
+        "batches_total": total_batches,
+        "answers_done": len(answers) - len(pending),
+        "answers_total": len(answers),
+        "input_tokens": 0,
+        "output_tokens": 0,
+    }
+    for batch_num, planned in enumerate(batches, 1):
+        batch = planned["items"]
+        print(
+            f"  [classify] batch {batch_num}/{total_batches} ({len(batch)} answers, "
+            f"~{planned['input_tokens']} in / ~{planned['output_tokens']} out tokens)..."
+        )
+
+        assignments = _classify_batch(system_prompt, batch)
+
+        assigned_in_batch = sum(1 for matches in assignments.values() if matches)
+        missing = sum(1 for a in batch if str(a["id"]) not in assignments)
+        if missing:
+            truncated_batches += 1
+        print(f"  [classify] batch {batch_num}/{total_batches} done — {assigned_in_batch}/{len(batch)} answers matched a theme, {missing} missing from response")
+
+        for a in batch:
+            checkpoint[str(a["id"])] = assignments.get(str(a["id"]), [])
+        progress["batches_done"] = batch_num
+        progress["answers_done"] += len(batch)
+        progress["input_tokens"] += planned["input_tokens"]
+        progress["output_tokens"] += planned["output_tokens"]
+        if on_batch:
+            on_batch(checkpoint, progress=dict(progress))
+
+    if total_batches:
+        print(f"  [classify] truncation rate {truncated_batches}/{total_batches} batches ({truncated_batches / total_batches:.0%})")
+
+    _merge_assignments(answers, themes, checkpoint)
+
+
+def _merge_assignments(answers, themes, assignments):
+    """Add each answer in assignments ({str(answer_id): [[theme_number, excerpt], ...]}) to its themes, in place."""
+    for a in answers:
+        for theme_num, excerpt in assignments.get(str(a["id"]), []):
+            if isinstance(theme_num, int) and 1 <= theme_num <= len(themes):
+                theme = themes[theme_num - 1]
+                if a["id"] not in theme["answer_ids"]:
+                    theme["answer_ids"].append(a["id"])
+                theme["excerpts"][str(a["id"])] = excerpt
+
+
+def _classify_batch(system_prompt, batch):
+    """
+    Classify one batch. Returns {str(answer_id): [[theme_number, excerpt], ...]}
+    for the answers the model returned.
+
+    If the response cannot be parsed even after repair and a re-ask, the batch
+    is split in half and each half classified separately.
+    """
+    try:
+        result = generate_json(system_prompt, classify_user_prompt(batch), task="classify", schema=CLASSIFY_SCHEMA)
+    except LLMResponseError:
+        if len(batch) == 1:
+            raise
+        mid = len(batch) // 2
+        print(f"  [classify] unparseable response for {len(batch)} answers — splitting into {mid} + {len(batch) - mid}")
+        return {**_classify_batch(system_prompt, batch[:mid]), **_classify_batch(system_prompt, batch[mid:])}
+
+    return parse_assignments(result, {str(a["id"]): a["text"] for a in batch})
 
-        assigned_in_batch = sum(1 for a in result.get("assignments", []) if a.get("themes"))
-        print(f"  [classify] batch {batch_num}/{total_batches} done — {assigned_in_batch}/{len(batch)} answers matched a theme")
 
-        for assignment in result.get("assignments", []):
-            answer_id = assignment.get("id")
-            for match in assignment.get("themes", []):
-                theme_num = match.get("number")
-                excerpt = match.get("excerpt", "")
-                if theme_num and 1 <= theme_num <= len(themes):
-                    theme = themes[theme_num - 1]
-                    if answer_id not in theme["answer_ids"]:
-                        theme["answer_ids"].append(answer_id)
-                    theme["excerpts"][str(answer_id)] = excerpt
+def classify_user_prompt(batch):
+    answers_text = "\n".join([f"[ID: {a['id']}] {a['text']}" for a in batch])
+    return f"Classify these answers:\n\n{answers_text}"
+
+
+def parse_assignments(result, texts):
+    """
+    {str(answer_id): [[theme_number, excerpt], ...]} from a parsed classify
+    response. texts maps str(answer_id) to the answer text; each excerpt is cut
+    from it at the returned offsets (see _excerpt). Answers not in texts and
+    malformed matches are dropped.
+    """
+    parsed = {}
+    for assignment in result.get("assignments", []):
+        if not isinstance(assignment, dict) or str(assignment.get("id")) not in texts:
+            continue
+        text = texts[str(assignment["id"])]
+        parsed[str(assignment["id"])] = [
+            [match[0], _excerpt(text, match[1], match[2])]
+            for match in assignment.get("m") or []
+            if isinstance(match, list) and len(match) == 3 and all(isinstance(v, int) for v in match)
+        ]
+    return parsed
+
+
+def _excerpt(text, start, end):
+    """
+    The part of text between character offsets start and end, widened to whole
+    words. Offsets that do not describe a span of the answer fall back to its
+    first sentence.
+    """
+    start, end = max(0, start), min(len(text), end)
+    if end <= start:
+        sentences = _sentences(text)
+        return sentences[0] if sentences else text.strip()
+    while start > 0 and not text[start - 1].isspace():
+        start -= 1
+    while end < len(text) and not text[end].isspace():
+        end += 1
+    return text[start:end].strip()
+
+
+def _classify_answers_embedding(answers, themes, checkpoint=None, on_batch=None, accept=None, reject=None):
+    """
+    Pass 2 via embeddings: assign confident matches by cosine similarity between
+    answer and theme embeddings, then classify only the uncertain answers with
+    the LLM. Same contract as _classify_answers.
+    """
+    if not themes:
+        return
+
+    checkpoint = {} if checkpoint is None else checkpoint
+    pending = [a for a in answers if str(a["id"]) not in checkpoint]
+    if pending:
+        decided = _embedding_assignments(pending, themes, accept=accept, reject=reject)
+        print(f"  [embed] {len(decided)}/{len(pending)} answers decided by embeddings, {len(pending) - len(decided)} sent to the LLM")
+        checkpoint.update(decided)
+        if on_batch:
+            on_batch(checkpoint, progress={"answers_done": len(checkpoint), "answers_total": len(answers)})
+
+    _classify_answers(answers, themes, checkpoint=checkpoint, on_batch=on_batch)
+
+
+def _embedding_assignments(answers, themes, accept=None, reject=None):
+    """
+    Score answers against themes by embedding similarity.
+
+    Returns {str(answer_id): [[theme_number, excerpt], ...]} for the answers
+    that are confidently matched (>= accept) or confidently unmatched (< reject).
+    The excerpt is the answer's sentence closest to the theme.
+    """
+    import numpy as np
+
+    from results.embeddings import cosine_similarity, embed_texts
+
+    accept = EMBEDDING_ACCEPT if accept is None else accept
+    reject = EMBEDDING_REJECT if reject is None else reject
+
+    theme_vecs = embed_texts([f"{t['name']}: {t['description']}" for t in themes])
+    sims = cosine_similarity(embed_texts([a["text"] for a in answers]), theme_vecs)
+    best = sims.max(axis=1)
+
+    decided = {str(answers[i]["id"]): [] for i in np.flatnonzero(best < reject)}
+    confident = np.flatnonzero(best >= accept)
+
+    sentences = {i: _sentences(answers[i]["text"]) for i in confident}
+    flat = [sent for i in confident if len(sentences[i]) > 1 for sent in sentences[i]]
+    sentence_sims = cosine_similarity(embed_texts(flat), theme_vecs) if flat else None
+
+    offset = 0
+    for i in confident:
+        matched = np.flatnonzero(sims[i] >= accept)
+        if len(sentences[i]) > 1:
+            block = sentence_sims[offset:offset + len(sentences[i])]
+            offset += len(sentences[i])
+            excerpts = [sentences[i][int(block[:, j].argmax())] for j in matched]
+        else:
+            excerpts = [answers[i]["text"].strip()] * len(matched)
+        decided[str(answers[i]["id"])] = [[int(j) + 1, excerpt] for j, excerpt in zip(matched, excerpts)]
+    return decided
+
+
+def _sentences(text):
+    parts = re.split(r"(?<=[.!?])\s+|\n+", text.strip())
+    return [p.strip() for p in parts if p.strip()]
+
+
+def plan_classify_batches(answers, system_prompt, strategy=None):
+    """
+    Split answers into classification batches.
+
+    "adaptive" packs answers until the estimated input or output tokens reach
+    the budget for the configured provider and model; "fixed" takes BATCH_SIZE
+    answers per batch. Returns [{items, input_tokens, output_tokens}] with
+    token estimates for every batch.
+    """
+    strategy = strategy or BATCHING
+    overhead = estimate_tokens(system_prompt) + estimate_tokens("Classify these answers:\n\n")
+    items = []
+    for a in answers:
+        answer_tokens = estimate_tokens(a["text"])
+        line_tokens = estimate_tokens(f"[ID: {a['id']}] ") + answer_tokens + 1
+        items.append((a, line_tokens, estimate_classify_output(answer_tokens)))
+
+    if strategy == "fixed":
+        return [
+            {
+                "items": [a for a, _, _ in chunk],
+                "input_tokens": overhead + sum(i for _, i, _ in chunk),
+                "output_tokens": sum(o for _, _, o in chunk),
+            }
+            for chunk in (items[i:i + BATCH_SIZE] for i in range(0, len(items), BATCH_SIZE))
+        ]
+
+    budget = token_budget(task="classify")
+    batches = pack_batches(items, max(budget["input"] - overhead, 1), budget["output"], max_items=MAX_BATCH_SIZE)
+    for batch in batches:
+        batch["input_tokens"] += overhead
+    return batches
 
 
 def discover_themes_only(topic, custom_prompt=None):
@@ -119,11 +383,57 @@ def discover_themes_only(topic, custom_prompt=None):
     return [{"name": t["name"], "description": t["description"]} for t in themes]
 
 
-def run_classification_with_themes(topic, themes):
+def themes_key(themes):
+    """Stable fingerprint of a [{name, description}] list, used to validate checkpoints."""
+    canonical = json.dumps([[t["name"], t["description"]] for t in themes], ensure_ascii=False)
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+
+def resumable_themes(result):
+    """
+    Return result.proposed_themes if result holds a classification checkpoint
+    for exactly those themes, so a rerun can skip discovery; otherwise None.
+    """
+    checkpoint = result.checkpoint or {}
+    if result.proposed_themes and checkpoint.get("themes_key") == themes_key(result.proposed_themes):
+        return result.proposed_themes
+    return None
+
+
+def record_progress(result, stage, **fields):
+    """
+    Store a progress snapshot for a running job on result.progress.
+
+    A new stage starts a fresh snapshot; fields (batches_done, batches_total,
+    answers_done, ...) are merged into the current one and an ETA is
+    extrapolated from the batches completed so far.
+    """
+    now = timezone.now()
+    progress = result.progress if (result.progress or {}).get("stage") == stage else {
+        "stage": stage,
+        "started_at": now.isoformat(),
+    }
+    progress.update(fields, updated_at=now.isoformat())
+    done, total = progress.get("batches_done"), progress.get("batches_total")
+    if done and total:
+        elapsed = (now - datetime.fromisoformat(progress["started_at"])).total_seconds()
+        progress["eta_seconds"] = round(elapsed / done * (total - done))
+    result.progress = progress
+    Result.objects.filter(pk=result.pk).update(progress=progress)
+    events.publish(f"topic-{result.topic_id}")
+
+
+def run_classification_with_themes(topic, themes, result=None):
     """
     Pass 2 only: classify answers against the provided themes.
     themes: [{name, description}] (user-edited list)
     Returns full themes with answer_ids and excerpts.
+
+    If result is given, completed batches are checkpointed on it every
+    CHECKPOINT_INTERVAL seconds and when classification fails, and a
+    checkpoint left by an earlier run with the same themes is resumed instead
+    of classifying those answers again. Progress is recorded on
+    result.progress as batches complete.
     """
     answers = list(Answer.objects.filter(topic=topic).values('id', 'text'))
     if not answers or not themes:
@@ -135,10 +445,43 @@ def run_classification_with_themes(topic, themes):
         for t in themes
     ]
 
-    total_batches = (len(answers) + BATCH_SIZE - 1) // BATCH_SIZE
-    print(f"\n[classify with themes] '{topic.name}' — {len(answers)} answers, {len(full_themes)} themes, {total_batches} batches")
-    _classify_answers(answers, full_themes)
-
+    print(f"\n[classify with themes] '{topic.name}' — {len(answers)} answers, {len(full_themes)} themes")
+    checkpoint = None
+    on_batch = None
+    if result is not None:
+        key = themes_key(themes)
+        if (result.checkpoint or {}).get("themes_key") != key:
+            result.checkpoint = {"themes_key": key, "assignments": {}}
+        checkpoint = result.checkpoint["assignments"]
+        record_progress(result, "classifying", answers_done=len(checkpoint), answers_total=len(answers))
+
+        saved = {"at": monotonic(), "pending": False}
+
+        def save_checkpoint():
+            Result.objects.filter(pk=result.pk).update(checkpoint=result.checkpoint)
+            saved.update(at=monotonic(), pending=False)
+
+        def on_batch(_, progress=None):
+            saved["pending"] = True
+            if monotonic() - saved["at"] >= CHECKPOINT_INTERVAL:
+                save_checkpoint()
+            if progress:
+                record_progress(result, "classifying", **progress)
+
+    classify = _classify_answers_embedding if topic.classifier == "embedding" else _classify_answers
+    try:
+        classify(answers, full_themes, checkpoint=checkpoint, on_batch=on_batch)
+    except Exception:
+        # Keep the batches that did finish for the retry.
+        if on_batch and saved["pending"]:
+            save_checkpoint()
+        raise
+
+    return _finalize_themes(answers, full_themes)
+
+
+def _finalize_themes(answers, full_themes):
+    """Drop themes without answers, cap at MAX_THEMES and add an "Other" theme for unassigned answers."""
     # Filter themes with no answers and cap at MAX_THEMES
     before = len(full_themes)
     full_themes = [t for t in full_themes if len(t["answer_ids"]) >= 1]
@@ -176,6 +519,12 @@ def run_sentiment_analysis(topic):
     if not answers:
         return {"average": None, "answers": []}
 
+    system_prompt, user_prompt = sentiment_prompts(answers)
+    return sentiment_result(generate_json(system_prompt, user_prompt, task="sentiment"))
+
+
+def sentiment_prompts(answers):
+    """(system_prompt, user_prompt) scoring the sentiment of answers."""
     answers_text = "\n".join([f"[ID: {a['id']}] {a['text']}" for a in answers])
 
     system_prompt = """You are an expert at sentiment analysis.
@@ -194,7 +543,11 @@ Respond in JSON format:
 
 Include every answer ID provided. Be consistent in your scoring."""
 
-    result = json.loads(generate(system_prompt, f"Score the sentiment of these interview answers:\n\n{answers_text}", json_mode=True))
+    return system_prompt, f"Score the sentiment of these interview answers:\n\n{answers_text}"
+
+
+def sentiment_result(result):
+    """{"average", "answers"} from a parsed sentiment response."""
     answer_scores = result.get("answers", [])
 
     avg = round(sum(a["score"] for a in answer_scores) / len(answer_scores), 1) if answer_scores else None
@@ -212,6 +565,12 @@ def generate_summary(topic):
     if not answers:
         return ""
 
+    system_prompt, user_prompt = summary_prompts(topic.name, answers)
+    return generate(system_prompt, user_prompt, task="summary")
+
+
+def summary_prompts(question_text, answers):
+    """(system_prompt, user_prompt) summarizing the answers to question_text."""
     answers_text = "\n".join([f"- {a['text']}" for a in answers])
 
     system_prompt = """You are an expert at summarizing survey responses.
@@ -219,40 +578,118 @@ Write a concise summary (2-4 sentences) that captures the main points and overal
 Focus on the most common themes and any notable patterns or outliers.
 Write in a neutral, professional tone. Do not use bullet points."""
 
-    return generate(system_prompt, f"Summarize these responses to the question \"{topic.name}\":\n\n{answers_text}")
+    return system_prompt, f"Summarize these responses to the question \"{question_text}\":\n\n{answers_text}"
 
 
 def chat_with_all_answers(user_message, chat_history=None, interview=None):
     """
-    Chat about all interview answers using GPT-4o.
-    The AI has access to all interviews and their answers as context.
+    Chat about all interview answers.
+
+    Small interviews send every answer as context. Once the answers exceed
+    CHAT_FULL_CONTEXT_TOKENS, the context is each topic's stored summary and
+    theme counts plus only the answers most relevant to the question
+    (full-text rank fused with embedding similarity), capped at
+    CHAT_RETRIEVAL_TOKENS, so the prompt size no longer grows with the number
+    of answers.
     """
     if interview is not None:
-        topics = Topic.objects.filter(interview=interview).order_by('order')
+        topics = list(Topic.objects.filter(interview=interview).select_related('result').order_by('order'))
     else:
-        topics = Topic.objects.all().order_by('order')
+        topics = list(Topic.objects.all().select_related('result').order_by('order'))
 
-    context_parts = []
-    total_answers = 0
+    answers = Answer.objects.filter(topic__in=topics)
+    stats = answers.aggregate(count=Count('id'), chars=Sum(Length('text')))
+    if not stats["count"]:
+        return "There are no interview responses yet."
 
-    for topic in topics:
-        answers = list(Answer.objects.filter(topic=topic).values('text'))
-        if answers:
-            answers_text = "\n".join([f"  - {a['text']}" for a in answers])
-            context_parts.append(f"**{topic.name}** ({len(answers)} responses):\n{answers_text}")
-            total_answers += len(answers)
+    if stats["chars"] / CHARS_PER_TOKEN <= CHAT_FULL_CONTEXT_TOKENS:
+        by_topic = {}
+        for topic_id, text in answers.order_by('id').values_list('topic_id', 'text'):
+            by_topic.setdefault(topic_id, []).append(text)
+        context_parts = []
+        for topic in topics:
+            texts = by_topic.get(topic.id)
+            if texts:
+                answers_text = "\n".join([f"  - {t}" for t in texts])
+                context_parts.append(f"**{topic.name}** ({len(texts)} responses):\n{answers_text}")
+        intro = "Here is the complete survey data:"
+    else:
+        query = user_message
+        previous = [m["content"] for m in (chat_history or []) if m.get("role") == "user"]
+        if previous:
+            query = f"{previous[-1]}\n{user_message}"
+        context_parts = _retrieval_context(query, topics, answers, interview)
+        intro = (
+            f"The survey has {stats['count']} responses — too many to show in full. "
+            "Here is an overview of every topic and the responses most relevant to the question:"
+        )
+
+    return generate(chat_system_prompt(intro, context_parts), user_message, history=chat_history, task="chat")
 
-    if total_answers == 0:
-        return "There are no interview responses yet."
 
+def chat_system_prompt(intro, context_parts):
+    """System prompt for chat_with_all_answers around the per-topic context."""
     full_context = "\n\n".join(context_parts)
 
-    system_prompt = f"""You are a helpful assistant that analyzes survey responses.
+    return f"""You are a helpful assistant that analyzes survey responses.
 
-Here is the complete survey data:
+{intro}
 
 {full_context}
 
 Answer questions based on the responses above. Be specific and reference actual responses when relevant. Be concise but comprehensive."""
 
-    return generate(system_prompt, user_message, history=chat_history)
+
+def _retrieval_context(query, topics, answers, interview=None):
+    """Per-topic overview plus the answers most relevant to query, within CHAT_RETRIEVAL_TOKENS."""
+    counts = dict(answers.order_by().values_list('topic_id').annotate(n=Count('id')))
+    lexical = [
+        r["id"] for r in search_answers(
+            query,
+            interview_id=interview.id if interview is not None else None,
+            page_size=CHAT_RETRIEVAL_CANDIDATES,
+            match_any=True,
+        )["results"]
+    ]
+    topic_ids = [t.id for t in topics]
+    semantic = []
+    # Embedding the query may load a local model or call an API, so only do it
+    # when some of these answers have been embedded.
+    if AnswerEmbedding.objects.filter(topic_id__in=topic_ids).exists():
+        try:
+            from results.vectors import search_answers as similar_answers
+            semantic = [aid for aid, _ in similar_answers(query, topic_ids, k=CHAT_RETRIEVAL_CANDIDATES)]
+        except Exception as e:
+            print(f"  [chat] embedding retrieval unavailable ({e}), using keyword ranking only")
+
+    candidates = reciprocal_rank_fusion(semantic, lexical)[:CHAT_RETRIEVAL_CANDIDATES]
+    texts = {aid: (topic_id, text) for aid, topic_id, text in answers.filter(id__in=candidates).values_list('id', 'topic_id', 'text')}
+    picked = {}
+    budget = CHAT_RETRIEVAL_TOKENS
+    for aid in candidates:
+        if aid not in texts:
+            continue
+        topic_id, text = texts[aid]
+        cost = estimate_tokens(text) + 4
+        if cost > budget:
+            continue  # a shorter, lower-ranked answer may still fit
+        budget -= cost
+        picked.setdefault(topic_id, []).append(text)
+    print(f"  [chat] retrieved {sum(len(v) for v in picked.values())} of {sum(counts.values())} answers")
+
+    parts = []
+    for topic in topics:
+        if not counts.get(topic.id):
+            continue
+        lines = [f"**{topic.name}** ({counts[topic.id]} responses)"]
+        result = getattr(topic, 'result', None)
+        if result and result.summary:
+            lines.append(f"Summary: {result.summary}")
+        if result and result.themes:
+            themes = ", ".join(f"{t['name']} ({len(t.get('answer_ids', []))})" for t in result.themes)
+            lines.append(f"Themes (number of responses): {themes}")
+        if picked.get(topic.id):
+            lines.append("Relevant responses:")
+            lines.extend(f"  - {text}" for text in picked[topic.id])
+        parts.append("\n".join(lines))
+    return parts
@@ -8,12 +8,19 @@ function resultsApp() {
         // Phase-specific state
         proposedThemes: [],   // user-editable themes for Phase 2
         allAnswers: [],
+        answersNextAfter: null,  // keyset cursor for the next page of answers
+        answerQuery: '',
+        searchResults: null,  // null when not searching; otherwise ranked matches
+        searchPage: 1,
+        searchHasMore: false,
         editorOpen: false,    // transient: theme editor open (never persisted)
         runningIds: {},       // {topic_id: true} while full pipeline runs (Phase 1)
         discoveringIds: {},   // {topic_id: true} while re-discovering (Phase 2)
         classifyingIds: {},   // {topic_id: true} while classifying (Phase 2)
         rediscoverOpen: false,
         rediscoverPrompt: '',
+        progress: {},         // {topic_id: {stage, batches_done, batches_total, eta_seconds, ...}} from the server
+        progressSource: null, // EventSource while any analysis is running
 
         // Chat
         chatMessages: [],
@@ -25,7 +32,7 @@ function resultsApp() {
             if (this.selectedIndex === null) return false;
             const s = this.results[this.selectedIndex]?.status;
             const id = this.results[this.selectedIndex]?.topic_id;
-            return !s || ['pending', 'failed', 'running'].includes(s) || !!this.runningIds[id];
+            return !s || ['pending', 'failed', 'running', 'batched'].includes(s) || !!this.runningIds[id];
         },
         isEditor() {
             if (this.selectedIndex === null) return false;
@@ -52,6 +59,9 @@ function resultsApp() {
                     const status = this.results[idx]?.status;
                     this.loadAnswers(this.results[idx]?.topic_id);
                 }
+                if (this.results.some(r => ['running', 'discovering', 'classifying', 'batched'].includes(r.status))) {
+                    this.watchProgress();  // e.g. started from another tab
+                }
             } catch (error) {
                 console.error('Failed to load results:', error);
             } finally {
@@ -59,22 +69,92 @@ function resultsApp() {
             }
         },
 
-        async loadAnswers(interviewId) {
+        async loadAnswers(topicId, after = null) {
             try {
-                const response = await fetch(`/results/api/answers/${interviewId}/`);
+                const params = after ? `?after=${after}` : '';
+                const response = await fetch(`/results/api/answers/${topicId}/${params}`);
                 const data = await response.json();
-                this.allAnswers = data.answers || [];
+                if (this.results[this.selectedIndex]?.topic_id !== topicId) return;  // selection changed
+                const page = data.answers || [];
+                this.allAnswers = after ? [...this.allAnswers, ...page] : page;
+                this.answersNextAfter = data.next_after ?? null;
             } catch (error) {
                 console.error('Failed to load answers:', error);
             }
         },
 
+        loadMoreAnswers() {
+            const topicId = this.results[this.selectedIndex]?.topic_id;
+            if (topicId && this.answersNextAfter) this.loadAnswers(topicId, this.answersNextAfter);
+        },
+
+        // ─── Answer search ─────────────────────────────
+        visibleAnswers() {
+            return this.searchResults ?? this.allAnswers;
+        },
+
+        async searchAnswers(page = 1) {
+            const query = this.answerQuery.trim();
+            if (!query) {
+                this.searchResults = null;
+                this.searchHasMore = false;
+                return;
+            }
+            const topicId = this.results[this.selectedIndex]?.topic_id;
+            const params = new URLSearchParams({ q: query, topic: topicId, page });
+            try {
+                const response = await fetch(`/results/${INTERVIEW_ID}/api/search/?${params}`);
+                const data = await response.json();
+                if (query !== this.answerQuery.trim()) return;  // a newer search is in flight
+                const found = data.results || [];
+                this.searchResults = page === 1 ? found : [...(this.searchResults || []), ...found];
+                this.searchPage = page;
+                this.searchHasMore = !!data.has_more;
+            } catch (error) {
+                console.error('Search failed:', error);
+            }
+        },
+
+        // ─── Progress of running analyses ──────────────
+        watchProgress() {
+            if (this.progressSource || !window.EventSource) return;
+            this.progressSource = new EventSource(`/results/${INTERVIEW_ID}/api/progress/stream/`);
+            this.progressSource.onmessage = (event) => {
+                const jobs = JSON.parse(event.data).jobs || [];
+                this.progress = Object.fromEntries(jobs.map(j => [j.topic_id, j.progress || {}]));
+                const local = Object.keys({ ...this.runningIds, ...this.discoveringIds, ...this.classifyingIds });
+                if (jobs.length === 0 && local.length === 0) {
+                    this.progressSource.close();
+                    this.progressSource = null;
+                }
+            };
+        },
+
+        progressLabel(topicId) {
+            const p = this.progress[topicId];
+            if (!p || !p.stage) return '';
+            const stages = { discovering: 'Discovering themes', classifying: 'Classifying', sentiment: 'Scoring sentiment', summary: 'Summarising', batched: 'Waiting for batch results' };
+            let label = stages[p.stage] || 'Analysing';
+            if (p.stage === 'classifying' && p.answers_total) {
+                label += ` ${p.answers_done}/${p.answers_total} answers`;
+                if (p.batches_total) label += ` · batch ${p.batches_done}/${p.batches_total}`;
+                if (p.eta_seconds != null && p.batches_done < p.batches_total) {
+                    label += ` · ~${p.eta_seconds < 60 ? p.eta_seconds + 's' : Math.ceil(p.eta_seconds / 60) + 'm'} left`;
+                }
+            }
+            return label + '…';
+        },
+
         // ─── Interview selection ───────────────────────
         selectInterview(index) {
             this.selectedIndex = index;
             this.chatOpen = false;
             this.proposedThemes = [];
             this.allAnswers = [];
+            this.answersNextAfter = null;
+            this.answerQuery = '';
+            this.searchResults = null;
+            this.searchHasMore = false;
             this.editorOpen = false;
             this.rediscoverOpen = false;
             this.loadAnswers(this.results[index]?.topic_id);
@@ -87,6 +167,7 @@ function resultsApp() {
             const id = result.topic_id;
             this.runningIds = { ...this.runningIds, [id]: true };
             this.results[index] = { ...this.results[index], status: 'running' };
+            this.watchProgress();
             try {
                 const response = await fetch(`/results/api/run/${id}/`, {
                     method: 'POST',
@@ -118,6 +199,7 @@ function resultsApp() {
             this.discoveringIds = { ...this.discoveringIds, [id]: true };
             // Optimistically set status to 'discovering'
             this.results[index] = { ...this.results[index], status: 'discovering' };
+            this.watchProgress();
 
             try {
                 const response = await fetch(`/results/api/discover/${id}/`, {
@@ -184,6 +266,7 @@ function resultsApp() {
             const id = result.topic_id;
             this.classifyingIds = { ...this.classifyingIds, [id]: true };
             this.results[index] = { ...this.results[index], status: 'classifying' };
+            this.watchProgress();
 
             try {
                 const response = await fetch(`/results/api/classify/${id}/`, {
@@ -0,0 +1,141 @@
+"""
+Offline stand-in for an LLM provider (settings.LLM_PROVIDER = "stub").
+
+Responses are synthetic but shaped like the real ones for each task tag, so
+the interview and analysis code paths run end to end without a network:
+analyzer coverage JSON, discovered themes, classify assignments, sentiment
+scores and plain text for the interviewer, opening, summary and chat.
+
+Latency is simulated as BASE_LATENCY plus prompt and completion tokens at
+INPUT_TOKENS_PER_SECOND / OUTPUT_TOKENS_PER_SECOND, with +/- JITTER, all
+multiplied by LATENCY_SCALE (0 disables the delay). TAIL_RATE and
+FAILURE_RATE add random latency spikes and errors, for exercising hedging and
+failover. The same prompt always produces the same response, so runs are
+reproducible.
+"""
+
+import hashlib
+import json
+import random
+import re
+import time
+from collections import Counter
+
+from results.tokens import estimate_tokens
+
+BASE_LATENCY = 0.3              # seconds per request before any tokens
+INPUT_TOKENS_PER_SECOND = 20000
+OUTPUT_TOKENS_PER_SECOND = 150
+JITTER = 0.2                    # +/- fraction of the computed latency
+LATENCY_SCALE = 1.0             # multiplier on the whole delay, e.g. 0.01 for quick CI runs
+# Provider trouble, drawn independently of the prompt: the share of calls that
+# take TAIL_FACTOR times longer, and the share that fail with ConnectionError.
+TAIL_RATE = 0.0
+TAIL_FACTOR = 10.0
+FAILURE_RATE = 0.0
+
+# Rough per-model speeds (base latency in seconds, output tokens per second)
+# used when the stub impersonates another provider's model; see
+# results.providers.SIMULATE. Ballpark figures for comparing routing setups,
+# not measurements; unlisted models use BASE_LATENCY / OUTPUT_TOKENS_PER_SECOND.
+MODEL_SPEEDS = {
+    "gpt-4o": (0.5, 90),
+    "gpt-4o-mini": (0.35, 130),
+    "gemini-3-flash-preview": (0.45, 200),
+    "claude-sonnet-4-6": (0.7, 70),
+    "claude-haiku-4-5": (0.35, 160),
+}
+THEMES = 6                      # themes returned by "discover"
+COVERAGE_RATE = 0.6             # chance the analyzer marks a topic covered per turn
+
+_ID_LINE = re.compile(r"^\[ID: (\d+)\] ?(.*)$", re.MULTILINE)
+_EXCERPT = re.compile(r"\s*(?:\S+\s+){0,7}\S+")  # an answer's first eight words
+_WORD = re.compile(r"[^\W\d_]{5,}", re.UNICODE)
+_STOPWORDS = {"about", "their", "there", "these", "those", "which", "would", "could", "should", "because", "really"}
+
+
+def respond(system_prompt, user_prompt, json_mode=False, history=None, task=None, model=None):
+    """Return (text, usage) like a results.providers backend, after a simulated delay."""
+    history = history or []
+    seed = hashlib.sha1(json.dumps([system_prompt, user_prompt, history, task]).encode()).digest()
+    rng = random.Random(seed)
+
+    builder = _BUILDERS.get(task)
+    if builder is None:
+        text = json.dumps({}) if json_mode else _sentences(rng, 2)
+    else:
+        text = builder(rng, system_prompt, user_prompt)
+
+    input_tokens = estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+    input_tokens += sum(estimate_tokens(msg["content"]) for msg in history)
+    output_tokens = estimate_tokens(text)
+    base_latency, output_rate = MODEL_SPEEDS.get(model, (BASE_LATENCY, OUTPUT_TOKENS_PER_SECOND))
+    delay = base_latency + input_tokens / INPUT_TOKENS_PER_SECOND + output_tokens / output_rate
+    delay *= 1 + rng.uniform(-JITTER, JITTER)
+    if FAILURE_RATE and random.random() < FAILURE_RATE:
+        time.sleep(base_latency * LATENCY_SCALE)
+        raise ConnectionError(f"stub: simulated {model or 'stub'} outage")
+    if TAIL_RATE and random.random() < TAIL_RATE:
+        delay *= TAIL_FACTOR
+    time.sleep(max(0.0, delay * LATENCY_SCALE))
+    return text, {"input_tokens": input_tokens, "output_tokens": output_tokens, "cached_tokens": 0}
+
+
+def _answers(user_prompt):
+    return [(int(aid), text) for aid, text in _ID_LINE.findall(user_prompt)]
+
+
+def _analyzer(rng, system_prompt, user_prompt):
+    last = user_prompt.rsplit("User: ", 1)[-1].strip()
+    return json.dumps({
+        topic_id: {"covered": True, "text": last} if rng.random() < COVERAGE_RATE else {"covered": False, "text": None}
+        for topic_id in re.findall(r"^- ID (\d+):", system_prompt, re.MULTILINE)
+    })
+
+
+def _discover(rng, system_prompt, user_prompt):
+    words = Counter(
+        w.lower() for _, text in _answers(user_prompt) for w in _WORD.findall(text) if w.lower() not in _STOPWORDS
+    )
+    names = [w.capitalize() for w, _ in words.most_common(THEMES)]
+    names += [f"Theme {i + 1}" for i in range(len(names), THEMES)]
+    return json.dumps({
+        "themes": [{"name": name, "description": f"Answers that mention {name.lower()}."} for name in names]
+    })
+
+
+def _classify(rng, system_prompt, user_prompt):
+    match = re.search(r"theme numbers 1 to (\d+)", system_prompt)
+    theme_count = int(match.group(1)) if match else 1
+    assignments = []
+    for aid, text in _answers(user_prompt):
+        numbers = rng.sample(range(1, theme_count + 1), k=min(theme_count, rng.choice([0, 1, 1, 1, 2])))
+        excerpt = _EXCERPT.match(text)
+        end = excerpt.end() if excerpt else len(text)
+        assignments.append({"id": aid, "m": [[n, 0, end] for n in numbers]})
+    return json.dumps({"assignments": assignments})
+
+
+def _sentiment(rng, system_prompt, user_prompt):
+    return json.dumps({"answers": [{"id": aid, "score": rng.randint(1, 10)} for aid, _ in _answers(user_prompt)]})
+
+
+def _sentences(rng, count):
+    words = ("the team", "our process", "meetings", "priorities", "workload", "communication", "tools", "feedback")
+    return " ".join(
+        f"{rng.choice(('Most', 'Some', 'Several', 'A few'))} respondents mention {rng.choice(words)} "
+        f"and {rng.choice(words)}."
+        for _ in range(count)
+    )
+
+
+_BUILDERS = {
+    "analyzer": _analyzer,
+    "discover": _discover,
+    "classify": _classify,
+    "sentiment": _sentiment,
+    "interviewer": lambda rng, s, u: "Thanks. How are you feeling about the next topic?",
+    "opening": lambda rng, s, u: "How have things been going at work this month?",
+    "summary": lambda rng, s, u: _sentences(rng, 4),
+    "chat": lambda rng, s, u: _sentences(rng, 3),
+}
@@ -0,0 +1,75 @@
+"""
+Token estimation and token-aware batching.
+
+Uses tiktoken when it is installed; otherwise falls back to a character-based
+estimate that is deliberately a little pessimistic for Dutch and English text.
+"""
+
+import math
+
+CHARS_PER_TOKEN = 3.5
+
+# Output tokens per answer in a classification response, and per matched
+# theme, excerpts being character offsets: {"id": 123, "m": [[1, 0, 42]]}
+CLASSIFY_OUTPUT_BASE = 10
+CLASSIFY_OUTPUT_PER_MATCH = 8
+# Assume a couple of matched themes per answer.
+CLASSIFY_EXPECTED_MATCHES = 2
+
+_encoding = None
+
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("o200k_base")
+        except Exception:
+            _encoding = False
+    return _encoding
+
+
+def estimate_tokens(text):
+    """Estimate the number of tokens in text using a local tokenizer."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding:
+        return len(encoding.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def estimate_classify_output(answer_tokens):
+    """Estimate the output tokens the classifier needs for one answer."""
+    # Offsets past 999 characters take a second token each.
+    long_answer = answer_tokens * CHARS_PER_TOKEN > 999
+    return CLASSIFY_OUTPUT_BASE + CLASSIFY_EXPECTED_MATCHES * (CLASSIFY_OUTPUT_PER_MATCH + 2 * long_answer)
+
+
+def pack_batches(items, input_budget, output_budget, max_items=None):
+    """
+    Greedily pack items into batches that fit both token budgets.
+
+    items: [(item, input_tokens, output_tokens)]
+    Returns a list of batches; each batch is a dict
+    {items, input_tokens, output_tokens}. An item that exceeds a budget on
+    its own still gets a batch of its own.
+    """
+    batches = []
+    current = {"items": [], "input_tokens": 0, "output_tokens": 0}
+    for item, in_tokens, out_tokens in items:
+        full = (
+            current["input_tokens"] + in_tokens > input_budget
+            or current["output_tokens"] + out_tokens > output_budget
+            or (max_items and len(current["items"]) >= max_items)
+        )
+        if current["items"] and full:
+            batches.append(current)
+            current = {"items": [], "input_tokens": 0, "output_tokens": 0}
+        current["items"].append(item)
+        current["input_tokens"] += in_tokens
+        current["output_tokens"] += out_tokens
+    if current["items"]:
+        batches.append(current)
+    return batches
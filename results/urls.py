@@ -9,6 +9,9 @@ urlpatterns = [
     path('<uuid:interview_id>/api/chat/', views.chat_api, name='results_chat'),
     path('<uuid:interview_id>/api/close/', views.close_interview_api, name='close_interview'),
     path('<uuid:interview_id>/api/interview-sessions/', views.sessions_api, name='sessions'),
+    path('<uuid:interview_id>/api/interview-sessions/stream/', views.sessions_stream, name='sessions_stream'),
+    path('<uuid:interview_id>/api/progress/stream/', views.progress_stream, name='progress_stream'),
+    path('<uuid:interview_id>/api/search/', views.search_answers_api, name='search_answers'),
     path('api/run/<int:topic_id>/', views.run_single_api, name='run_single_result'),
     path('api/discover/<int:topic_id>/', views.discover_themes_api, name='discover_themes'),
     path('api/classify/<int:topic_id>/', views.classify_with_themes_api, name='classify_with_themes'),
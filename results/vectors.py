@@ -0,0 +1,217 @@
+"""
+Persistent answer embeddings and brute-force similarity search.
+
+Embeddings are stored per answer in AnswerEmbedding. For search, each topic's
+vectors are exported once to a .npy matrix under settings.EMBEDDING_INDEX_DIR
+and memory-mapped, so a query is a single matrix-vector product over the
+topic. The file is rebuilt when the topic's embeddings change.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+from django.db import connection
+from django.db.models import Count, Max, Q
+
+from interview.models import Answer
+from results.embeddings import embed_texts, embedding_model
+from results.models import AnswerEmbedding
+
+EMBED_BATCH_SIZE = 256
+
+_matrices = {}
+_matrices_lock = threading.Lock()
+
+
+def embed_answers(answers):
+    """
+    Compute and store embeddings for answers that have none for the current
+    model. answers: a queryset of Answer. Returns the number embedded.
+    """
+    model = embedding_model()
+    pending = answers.filter(~Q(embedding__model=model)).order_by('id').values_list('id', 'topic_id', 'text')
+    embedded = 0
+    batch = []
+    for row in pending.iterator(chunk_size=EMBED_BATCH_SIZE):
+        batch.append(row)
+        if len(batch) >= EMBED_BATCH_SIZE:
+            embedded += _store(batch, model)
+            batch = []
+    if batch:
+        embedded += _store(batch, model)
+    return embedded
+
+
+def _store(rows, model):
+    vectors = embed_texts([text for _, _, text in rows])
+    AnswerEmbedding.objects.bulk_create(
+        [
+            AnswerEmbedding(answer_id=answer_id, topic_id=topic_id, model=model, vector=vec.tobytes())
+            for (answer_id, topic_id, _), vec in zip(rows, vectors)
+        ],
+        update_conflicts=True,
+        unique_fields=['answer'],
+        update_fields=['topic', 'model', 'vector', 'updated_at'],
+    )
+    return len(rows)
+
+
+def embed_answers_in_background(answer_ids):
+    """Embed newly created answers on a daemon thread so the request isn't held up."""
+    from django.conf import settings
+
+    if not answer_ids or not getattr(settings, "EMBED_NEW_ANSWERS", False):
+        return
+
+    def run():
+        try:
+            embed_answers(Answer.objects.filter(id__in=answer_ids))
+        except Exception as e:
+            print(f"[embeddings] could not embed answers {answer_ids}: {e}")
+        finally:
+            connection.close()
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def _index_dir():
+    from django.conf import settings
+    path = getattr(settings, "EMBEDDING_INDEX_DIR", None) or os.path.join(tempfile.gettempdir(), "fora-embeddings")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def topic_matrix(topic_id):
+    """
+    Return (answer_ids, matrix) for a topic's embeddings under the current
+    model: an int64 array of answer ids and a read-only memory-mapped
+    (n, d) float32 matrix of unit vectors, row-aligned with the ids.
+    """
+    model = embedding_model()
+    rows = AnswerEmbedding.objects.filter(topic_id=topic_id, model=model)
+    stats = rows.aggregate(count=Count('answer_id'), updated=Max('updated_at'))
+    version = {"count": stats["count"], "updated": stats["updated"].isoformat() if stats["updated"] else None}
+
+    base = os.path.join(_index_dir(), f"topic-{topic_id}-{model.replace('/', '_')}")
+    with _matrices_lock:
+        cached = _matrices.get(base)
+        if cached and cached[0] == version:
+            return cached[1], cached[2]
+
+        meta = _read_meta(base)
+        if _meta_version(meta) != version:
+            meta = _build_matrix(rows, base, version)
+        try:
+            ids, matrix = _load(base, meta)
+        except FileNotFoundError:
+            # Another process published a newer export and removed this one
+            # between reading the meta file and loading the files it names.
+            meta = _read_meta(base)
+            if _meta_version(meta) != version:
+                meta = _build_matrix(rows, base, version)
+            ids, matrix = _load(base, meta)
+        _matrices[base] = (version, ids, matrix)
+        return ids, matrix
+
+
+def _read_meta(base):
+    try:
+        with open(base + ".json") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _meta_version(meta):
+    return {k: v for k, v in meta.items() if k != "generation"} if meta else None
+
+
+def _load(base, meta):
+    prefix = f"{base}.{meta['generation']}"
+    ids = np.load(prefix + ".ids.npy")
+    if not len(ids):
+        return ids, np.zeros((0, 0), dtype=np.float32)
+    # The matrix may have spare rows if embeddings were deleted during the export.
+    return ids, np.load(prefix + ".npy", mmap_mode="r")[:len(ids)]
+
+
+def _build_matrix(rows, base, version):
+    """
+    Export the topic's vectors as a new generation of ids/matrix files and
+    publish it by replacing the meta file that names it, last. Concurrent
+    builders write files of their own, and readers always get an ids array
+    and matrix from the same export. Returns the new meta.
+    """
+    generation = f"{os.getpid()}-{threading.get_ident()}-{time.time_ns()}"
+    prefix = f"{base}.{generation}"
+    ordered = rows.order_by('answer_id').values_list('answer_id', 'vector')
+    count = version["count"]
+    ids = np.zeros(count, dtype=np.int64)
+    matrix = None
+    written = 0
+    for answer_id, vector in ordered.iterator(chunk_size=2000):
+        if written >= count:
+            break
+        vec = np.frombuffer(vector, dtype=np.float32)
+        if matrix is None:
+            matrix = np.lib.format.open_memmap(prefix + ".npy", mode="w+", dtype=np.float32, shape=(count, len(vec)))
+        ids[written] = answer_id
+        matrix[written] = vec
+        written += 1
+    if matrix is not None:
+        matrix.flush()
+        del matrix
+    np.save(prefix + ".ids.npy", ids[:written])
+
+    previous = _read_meta(base)
+    meta = {**version, "generation": generation}
+    tmp = f"{prefix}.json.tmp"
+    with open(tmp, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp, base + ".json")
+    if previous and previous.get("generation"):
+        for suffix in (".npy", ".ids.npy"):
+            try:
+                os.remove(f"{base}.{previous['generation']}{suffix}")
+            except FileNotFoundError:
+                pass
+    return meta
+
+
+def top_k(topic_ids, query_vector, k=10):
+    """
+    Brute-force cosine top-k over the given topics' answers.
+    Returns [(answer_id, score)] sorted by descending score.
+    """
+    query_vector = np.asarray(query_vector, dtype=np.float32)
+    best_ids, best_scores = [], []
+    for topic_id in topic_ids:
+        ids, matrix = topic_matrix(topic_id)
+        if not len(ids):
+            continue
+        ids, scores = matrix_top_k(ids, matrix, query_vector, k)
+        best_ids.append(ids)
+        best_scores.append(scores)
+    if not best_ids:
+        return []
+    ids = np.concatenate(best_ids)
+    scores = np.concatenate(best_scores)
+    order = np.argsort(-scores)[:k]
+    return [(int(ids[i]), float(scores[i])) for i in order]
+
+
+def matrix_top_k(ids, matrix, query_vector, k):
+    """Unsorted top-k (ids, scores) of one matrix against a query vector."""
+    scores = matrix @ query_vector
+    n = min(k, len(scores))
+    idx = np.argpartition(-scores, n - 1)[:n]
+    return ids[idx], scores[idx]
+
+
+def search_answers(text, topic_ids, k=10):
+    """Embed text and return the k most similar answers in topic_ids as [(answer_id, score)]."""
+    return top_k(topic_ids, embed_texts([text])[0], k=k)
@@ -1,16 +1,24 @@
 import json
 import traceback
+from datetime import datetime, time
+from time import monotonic, sleep
 
-from django.http import JsonResponse
+from django.conf import settings
+from django.db import connection
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views.decorators.http import require_http_methods
 
 
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 
-from interview.models import Topic, Answer, Interview, InterviewSession
+from interview.models import Topic, Answer, Interview
+from . import batches, events, llm
+from .jobs import ACTIVE_STATUSES, is_stale, keep_alive, stale_filter, start_job
 from .models import Result
-from .services import run_sentiment_analysis, generate_summary, chat_with_all_answers, discover_themes_only, run_classification_with_themes
+from .search import search_answers, theme_answer_ids
+from .services import run_sentiment_analysis, generate_summary, chat_with_all_answers, discover_themes_only, run_classification_with_themes, resumable_themes, record_progress
 
 
 def results_redirect_view(request):
@@ -28,10 +36,6 @@ def dashboard_view(request, interview_id):
     if interview.is_open:
         return render(request, 'results/tracking.html', {'interview': interview})
 
-    # Clear any results stuck in transient statuses from a previous server session
-    Result.objects.filter(status__in=['running', 'discovering', 'classifying']).update(status='failed')
-    Result.objects.filter(status='editing').update(status='completed')
-
     topics = Topic.objects.filter(interview=interview)
     total_answers = Answer.objects.filter(topic__interview=interview).count()
     analyzed_count = Result.objects.filter(topic__interview=interview, status='completed').count()
@@ -46,15 +50,25 @@ def dashboard_view(request, interview_id):
 
 
 def _run_topic_pipeline(topic, result, answer_count):
-    """Run the full analysis pipeline for a topic. Mutates and saves result."""
-    proposed = discover_themes_only(topic)
-    result.proposed_themes = proposed
-    result.save()
+    """
+    Run the full analysis pipeline for a topic. Mutates and saves result.
+
+    If a previous run failed part-way through classification, its proposed
+    themes and completed batches are reused instead of starting over.
+    """
+    proposed = resumable_themes(result)
+    if proposed is None:
+        record_progress(result, 'discovering')
+        proposed = discover_themes_only(topic)
+        result.proposed_themes = proposed
+        result.save()
 
-    themes = run_classification_with_themes(topic, proposed)
+    themes = run_classification_with_themes(topic, proposed, result=result)
     sentiment = {}
     if topic.analyze_sentiment:
+        record_progress(result, 'sentiment')
         sentiment = run_sentiment_analysis(topic)
+    record_progress(result, 'summary')
     summary = generate_summary(topic)
 
     result.themes = themes
@@ -62,8 +76,11 @@ def _run_topic_pipeline(topic, result, answer_count):
     result.summary = summary
     result.answer_count = answer_count
     result.analyzed_at = timezone.now()
+    result.checkpoint = {}
+    result.progress = {}
     result.status = 'completed'
     result.save()
+    return themes
 
 
 @require_http_methods(["POST"])
@@ -73,15 +90,20 @@ def close_interview_api(request, interview_id):
     interview.is_open = False
     interview.save(update_fields=['is_open'])
 
+    if settings.LLM_BATCH_MODE:
+        with llm.attribute(interview.id, interview.llm_routes):
+            if batches.submit_interview(interview) is not None:
+                return JsonResponse({'success': True, 'batched': True})
+
     for topic in Topic.objects.filter(interview=interview):
         answer_count = Answer.objects.filter(topic=topic).count()
         if answer_count == 0:
             continue
         result, _ = Result.objects.get_or_create(topic=topic)
-        result.status = 'running'
-        result.save()
+        start_job(result, 'running')
         try:
-            _run_topic_pipeline(topic, result, answer_count)
+            with keep_alive(result), llm.attribute(interview.id, interview.llm_routes):
+                _run_topic_pipeline(topic, result, answer_count)
         except Exception as e:
             print(f"[error] close-analyse topic {topic.id}: {e}")
             traceback.print_exc()
@@ -94,8 +116,79 @@ def close_interview_api(request, interview_id):
 @require_http_methods(["GET"])
 def sessions_api(request, interview_id):
     interview = get_object_or_404(Interview, uuid=interview_id)
-    completed = InterviewSession.objects.filter(interview=interview).count()
-    return JsonResponse({'completed': completed})
+    return JsonResponse({'completed': interview.completed_sessions})
+
+
+STREAM_SECONDS = 45    # end each event stream after this, freeing its web thread; EventSource reconnects
+STREAM_INTERVAL = 1    # seconds between checks for a published change (see results.events)
+STREAM_RECHECK = 30    # query anyway after this long, for changes nothing published (other hosts, stale jobs)
+STREAM_HEARTBEAT = 15  # comment line so proxies don't drop an idle stream
+
+
+def _event_stream(poll, channels):
+    """
+    Server-Sent Events response that calls poll() whenever one of channels is
+    published to (results.events), or STREAM_RECHECK seconds after it last
+    did, and sends its (JSON-serializable) return value whenever it changes.
+    poll() returning None ends the stream. The database connection is closed
+    after each poll so an idle stream doesn't hold one. Each open stream still
+    occupies a gunicorn thread (see Procfile), so streams end after
+    STREAM_SECONDS and the browser's EventSource reconnects after `retry` ms.
+    """
+    def stream():
+        yield f"retry: {STREAM_INTERVAL * 1000}\n\n"
+        last = seen = None
+        last_poll = last_sent = started = monotonic()
+        while monotonic() - started < STREAM_SECONDS:
+            current = events.version(*channels)
+            if current != seen or monotonic() - last_poll >= STREAM_RECHECK:
+                seen, last_poll = current, monotonic()
+                try:
+                    data = poll()
+                finally:
+                    connection.close()
+                if data is None:
+                    return
+                if data != last:
+                    last = data
+                    last_sent = monotonic()
+                    yield f"data: {json.dumps(data)}\n\n"
+            if monotonic() - last_sent >= STREAM_HEARTBEAT:
+                last_sent = monotonic()
+                yield ": keepalive\n\n"
+            sleep(STREAM_INTERVAL)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # don't let nginx buffer the stream
+    return response
+
+
+@require_http_methods(["GET"])
+def sessions_stream(request, interview_id):
+    """Stream {"completed": n} whenever the interview's session counter changes."""
+    interview = get_object_or_404(Interview, uuid=interview_id)
+
+    def poll():
+        completed = Interview.objects.filter(pk=interview.pk).values_list('completed_sessions', flat=True).first()
+        return None if completed is None else {'completed': completed}
+
+    return _event_stream(poll, [f"interview-{interview.pk}"])
+
+
+@require_http_methods(["GET"])
+def progress_stream(request, interview_id):
+    """Stream {"jobs": [{topic_id, status, progress}]} for the interview's running analyses."""
+    interview = get_object_or_404(Interview, uuid=interview_id)
+    topic_ids = list(Topic.objects.filter(interview=interview).values_list('pk', flat=True))
+
+    def poll():
+        jobs = Result.objects.filter(
+            topic__interview=interview, status__in=ACTIVE_STATUSES + ['batched'],
+        ).exclude(stale_filter())
+        return {'jobs': list(jobs.order_by('topic_id').values('topic_id', 'status', 'progress'))}
+
+    return _event_stream(poll, [f"topic-{pk}" for pk in topic_ids])
 
 
 @require_http_methods(["POST"])
@@ -111,27 +204,11 @@ def run_single_api(request, topic_id):
         return JsonResponse({'error': 'No answers to analyze'}, status=400)
 
     result, _ = Result.objects.get_or_create(topic=topic)
-    result.status = 'running'
-    result.save()
+    start_job(result, 'running')
 
     try:
-        proposed = discover_themes_only(topic)
-        result.proposed_themes = proposed
-        result.save()
-
-        themes = run_classification_with_themes(topic, proposed)
-        sentiment = {}
-        if topic.analyze_sentiment:
-            sentiment = run_sentiment_analysis(topic)
-        summary = generate_summary(topic)
-
-        result.themes = themes
-        result.sentiment = sentiment
-        result.summary = summary
-        result.answer_count = answer_count
-        result.analyzed_at = timezone.now()
-        result.status = 'completed'
-        result.save()
+        with keep_alive(result), llm.attribute(topic.interview_id):
+            themes = _run_topic_pipeline(topic, result, answer_count)
 
         return JsonResponse({
             'success': True,
@@ -153,16 +230,147 @@ def run_single_api(request, topic_id):
 
 
 
+ANSWERS_PAGE_SIZE = 200
+ANSWERS_MAX_PAGE_SIZE = 1000
+
+
 @require_http_methods(["GET"])
 def get_answers_api(request, topic_id):
-    """Return all answers for a topic (for the quote wall)."""
+    """
+    Return one page of a topic's answers (for the quote wall), ordered by id.
+
+    Query params (all optional):
+      after      — return answers with id > after (keyset pagination)
+      limit      — page size (default ANSWERS_PAGE_SIZE, max ANSWERS_MAX_PAGE_SIZE)
+      theme      — theme name from the topic's Result
+      min_sentiment, max_sentiment — inclusive sentiment score range
+      since, until — ISO dates/datetimes bounding created_at
+
+    Responds with {"answers": [{id, text, created_at}], "next_after": id|null},
+    streamed row by row so memory stays flat regardless of page size.
+    """
     try:
         topic = Topic.objects.get(id=topic_id)
     except Topic.DoesNotExist:
         return JsonResponse({'error': 'Topic not found'}, status=404)
 
-    answers = list(Answer.objects.filter(topic=topic).values('id', 'text'))
-    return JsonResponse({'answers': answers})
+    params = request.GET
+    try:
+        after = int(params.get('after', 0))
+        limit = min(max(int(params.get('limit', ANSWERS_PAGE_SIZE)), 1), ANSWERS_MAX_PAGE_SIZE)
+        min_sentiment = float(params['min_sentiment']) if params.get('min_sentiment') else None
+        max_sentiment = float(params['max_sentiment']) if params.get('max_sentiment') else None
+        since = _parse_date_param(params.get('since'))
+        until = _parse_date_param(params.get('until'), end_of_day=True)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid filter value'}, status=400)
+
+    qs = Answer.objects.filter(topic=topic, id__gt=after)
+    if since:
+        qs = qs.filter(created_at__gte=since)
+    if until:
+        qs = qs.filter(created_at__lte=until)
+
+    # Theme and sentiment live in the Result's JSON; narrow to their answer ids.
+    candidate_ids = None
+    if params.get('theme') or min_sentiment is not None or max_sentiment is not None:
+        result = Result.objects.filter(topic=topic).only('themes', 'sentiment').first()
+        if params.get('theme'):
+            theme = next((t for t in (result.themes if result else []) if t.get('name') == params['theme']), None)
+            if theme is None:
+                return JsonResponse({'error': 'Theme not found'}, status=404)
+            candidate_ids = set(theme.get('answer_ids', []))
+        if min_sentiment is not None or max_sentiment is not None:
+            scored = {
+                a['id'] for a in ((result.sentiment or {}).get('answers', []) if result else [])
+                if (min_sentiment is None or a.get('score', 0) >= min_sentiment)
+                and (max_sentiment is None or a.get('score', 0) <= max_sentiment)
+            }
+            candidate_ids = scored if candidate_ids is None else candidate_ids & scored
+
+    if candidate_ids is None:
+        rows = qs.order_by('id').values_list('id', 'text', 'created_at')[:limit + 1].iterator()
+    else:
+        rows = _rows_for_ids(qs, sorted(i for i in candidate_ids if isinstance(i, int) and i > after), limit + 1)
+
+    return StreamingHttpResponse(_stream_answer_page(rows, limit), content_type='application/json')
+
+
+def _parse_date_param(value, end_of_day=False):
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        parsed = datetime.combine(day, time.max if end_of_day else time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _rows_for_ids(qs, ids, wanted):
+    """Yield (id, text, created_at) for ids (sorted) that also match qs, up to wanted rows."""
+    yielded = 0
+    for start in range(0, len(ids), ANSWERS_PAGE_SIZE):
+        chunk = ids[start:start + ANSWERS_PAGE_SIZE]
+        for row in qs.filter(id__in=chunk).order_by('id').values_list('id', 'text', 'created_at'):
+            yield row
+            yielded += 1
+            if yielded >= wanted:
+                return
+
+
+def _stream_answer_page(rows, limit):
+    yield '{"answers": ['
+    last_id = None
+    has_more = False
+    for i, (answer_id, text, created_at) in enumerate(rows):
+        if i == limit:
+            has_more = True
+            break
+        prefix = ',' if i else ''
+        yield prefix + json.dumps({'id': answer_id, 'text': text, 'created_at': created_at.isoformat()})
+        last_id = answer_id
+    yield '], "next_after": %s}' % (json.dumps(last_id) if has_more else 'null')
+
+
+@require_http_methods(["GET"])
+def search_answers_api(request, interview_id):
+    """
+    Ranked keyword search over an interview's answers.
+    Query params: q (required), topic, theme (name; requires topic), page, page_size.
+    """
+    interview = get_object_or_404(Interview, uuid=interview_id)
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return JsonResponse({'error': 'q is required'}, status=400)
+
+    try:
+        topic_id = int(request.GET['topic']) if request.GET.get('topic') else None
+        page = int(request.GET.get('page', 1))
+        page_size = int(request.GET.get('page_size', 50))
+    except ValueError:
+        return JsonResponse({'error': 'topic, page and page_size must be integers'}, status=400)
+
+    answer_ids = None
+    theme = request.GET.get('theme')
+    if theme:
+        if topic_id is None:
+            return JsonResponse({'error': 'theme requires topic'}, status=400)
+        answer_ids = theme_answer_ids(topic_id, theme)
+        if answer_ids is None:
+            return JsonResponse({'error': 'Theme not found'}, status=404)
+
+    return JsonResponse(search_answers(
+        query,
+        interview_id=interview.id,
+        topic_id=topic_id,
+        answer_ids=answer_ids,
+        page=page,
+        page_size=page_size,
+    ))
 
 
 @require_http_methods(["POST"])
@@ -184,12 +392,14 @@ def discover_themes_api(request, topic_id):
     custom_prompt = body.get('custom_prompt', '') or ''
 
     result, _ = Result.objects.get_or_create(topic=topic)
-    result.status = 'discovering'
-    result.save()
+    start_job(result, 'discovering')
 
     try:
-        themes = discover_themes_only(topic, custom_prompt=custom_prompt or None)
+        record_progress(result, 'discovering')
+        with keep_alive(result), llm.attribute(topic.interview_id):
+            themes = discover_themes_only(topic, custom_prompt=custom_prompt or None)
         result.proposed_themes = themes
+        result.progress = {}
         result.status = 'editing'
         result.save()
 
@@ -231,16 +441,18 @@ def classify_with_themes_api(request, topic_id):
 
     answer_count = Answer.objects.filter(topic=topic).count()
     result, _ = Result.objects.get_or_create(topic=topic)
-    result.status = 'classifying'
-    result.save()
+    start_job(result, 'classifying')
 
     try:
-        full_themes = run_classification_with_themes(topic, themes_input)
+        with keep_alive(result), llm.attribute(topic.interview_id):
+            full_themes = run_classification_with_themes(topic, themes_input, result=result)
 
-        sentiment = {}
-        if topic.analyze_sentiment:
-            sentiment = run_sentiment_analysis(topic)
-        summary = generate_summary(topic)
+            sentiment = {}
+            if topic.analyze_sentiment:
+                record_progress(result, 'sentiment')
+                sentiment = run_sentiment_analysis(topic)
+            record_progress(result, 'summary')
+            summary = generate_summary(topic)
 
         result.themes = full_themes
         result.proposed_themes = themes_input  # save the final user-edited set
@@ -248,6 +460,8 @@ def classify_with_themes_api(request, topic_id):
         result.summary = summary
         result.answer_count = answer_count
         result.analyzed_at = timezone.now()
+        result.checkpoint = {}
+        result.progress = {}
         result.status = 'completed'
         result.save()
 
@@ -278,15 +492,17 @@ def get_all_results_api(request, interview_id):
     topics = qs.select_related('result').prefetch_related('answer_set').order_by('order')
 
     all_results = []
+    now = timezone.now()
     for topic in topics:
         result = getattr(topic, 'result', None)
         answers = {str(a.id): a.text for a in topic.answer_set.all()}
+        status = _display_status(result, now)
 
-        if not result or result.status not in ('completed', 'classifying'):
+        if status not in ('completed', 'classifying'):
             all_results.append({
                 'topic_id': topic.id,
                 'topic_text': topic.name,
-                'status': result.status if result else 'pending',
+                'status': status,
                 'answer_count': len(answers),
                 'themes': [],
                 'proposed_themes': result.proposed_themes if result else [],
@@ -312,7 +528,7 @@ def get_all_results_api(request, interview_id):
         all_results.append({
             'topic_id': topic.id,
             'topic_text': topic.name,
-            'status': result.status,
+            'status': status,
             'analyzed_at': result.analyzed_at.isoformat() if result.analyzed_at else None,
             'answer_count': result.answer_count,
             'summary': result.summary,
@@ -324,6 +540,21 @@ def get_all_results_api(request, interview_id):
     return JsonResponse({'results': all_results})
 
 
+def _display_status(result, now=None):
+    """
+    Status to show for a topic. The theme editor is client-side state, so a
+    Result left in 'editing' shows as completed; a job whose worker stopped
+    sending heartbeats shows as failed until the reaper records that.
+    """
+    if result is None:
+        return 'pending'
+    if result.status == 'editing':
+        return 'completed'
+    if is_stale(result, now):
+        return 'failed'
+    return result.status
+
+
 @require_http_methods(["POST"])
 def chat_api(request, interview_id):
     """Chat with all survey answers."""
@@ -336,7 +567,8 @@ def chat_api(request, interview_id):
             return JsonResponse({'error': 'message is required'}, status=400)
 
         interview = get_object_or_404(Interview, uuid=interview_id)
-        response_text = chat_with_all_answers(message, chat_history, interview=interview)
+        with llm.attribute(interview.id, interview.llm_routes):
+            response_text = chat_with_all_answers(message, chat_history, interview=interview)
 
         return JsonResponse({
             'success': True,